@@ -9,7 +9,10 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import Base
-from app.models import User, ShareholderProfile, ShareIssuance, AuditEvent
+from app.models import (
+    User, ShareholderProfile, ShareIssuance, ShareholderHolding, CompanyTotals,
+    CapTableCheckpoint, CheckpointHolding, AuditEvent
+)
 from app.config import settings
 
 # this is the Alembic Config object, which provides
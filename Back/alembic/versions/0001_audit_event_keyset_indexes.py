@@ -0,0 +1,39 @@
+"""Add composite indexes for keyset pagination of audit events
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-16 23:28:29.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_audit_events_created_at_id", ["created_at", "id"]),
+    ("ix_audit_events_action_created_at_id", ["action", "created_at", "id"]),
+    ("ix_audit_events_user_id_created_at_id", ["user_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already have these indexes
+    if op.get_bind().dialect.name == "postgresql":
+        # Build without locking out audit writes on large tables
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "audit_events", columns, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, "audit_events", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="audit_events", if_exists=True)
@@ -0,0 +1,40 @@
+"""Add indexes for keyset pagination and filtering of share issuances
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 23:37:39.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_share_issuances_issuance_date", ["issuance_date"]),
+    ("ix_share_issuances_shareholder_id_issuance_date_id", ["shareholder_id", "issuance_date", "id"]),
+    ("ix_share_issuances_issuance_date_id", ["issuance_date", "id"]),
+    ("ix_share_issuances_number_of_shares_id", ["number_of_shares", "id"]),
+    ("ix_share_issuances_total_value_id", ["total_value", "id"]),
+)
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already have these indexes
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "share_issuances", columns, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, "share_issuances", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="share_issuances", if_exists=True)
@@ -0,0 +1,33 @@
+"""Add certificate pre-render status to share issuances
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 23:53:10.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+certificate_status = sa.Enum("PENDING", "READY", "FAILED", name="certificatestatus")
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already have the column
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("share_issuances")}
+    if "certificate_status" in columns:
+        return
+    # Existing issuances keep NULL: nothing was scheduled for them
+    certificate_status.create(op.get_bind(), checkfirst=True)
+    op.add_column("share_issuances", sa.Column("certificate_status", certificate_status, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("share_issuances", "certificate_status")
+    certificate_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,29 @@
+"""Add per-issuance certificate theme
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 23:56:44.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already have the column
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("share_issuances")}
+    if "certificate_theme" in columns:
+        return
+    # Existing issuances keep NULL and use the configured default theme
+    op.add_column("share_issuances", sa.Column("certificate_theme", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("share_issuances", "certificate_theme")
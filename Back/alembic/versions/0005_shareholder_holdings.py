@@ -0,0 +1,47 @@
+"""Add shareholder holdings and company totals summary tables
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:55:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already exist
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "shareholder_holdings" not in tables:
+        op.create_table(
+            "shareholder_holdings",
+            sa.Column("shareholder_id", sa.Integer(), sa.ForeignKey("shareholder_profiles.id"), primary_key=True),
+            sa.Column("total_shares", sa.Integer(), nullable=False),
+            sa.Column("total_value", sa.Float(), nullable=False),
+            sa.Column("issuance_count", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    if "company_totals" not in tables:
+        # Left empty: startup rebuilds the summary from issuances when no totals row exists
+        op.create_table(
+            "company_totals",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("total_shareholders", sa.Integer(), nullable=False),
+            sa.Column("total_shares", sa.Integer(), nullable=False),
+            sa.Column("total_value", sa.Float(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("company_totals")
+    op.drop_table("shareholder_holdings")
@@ -0,0 +1,50 @@
+"""Add cap table checkpoint tables
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables created by setup_db.py or startup already exist
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "cap_table_checkpoints" not in tables:
+        # Left empty: the checkpointer takes the latest boundary once the app starts
+        op.create_table(
+            "cap_table_checkpoints",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("as_of", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_cap_table_checkpoints_id", "cap_table_checkpoints", ["id"])
+        # Unique so workers racing for the same boundary store it only once
+        op.create_index("ix_cap_table_checkpoints_as_of", "cap_table_checkpoints", ["as_of"], unique=True)
+    if "cap_table_checkpoint_holdings" not in tables:
+        op.create_table(
+            "cap_table_checkpoint_holdings",
+            sa.Column(
+                "checkpoint_id", sa.Integer(),
+                sa.ForeignKey("cap_table_checkpoints.id", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("shareholder_id", sa.Integer(), sa.ForeignKey("shareholder_profiles.id"), primary_key=True),
+            sa.Column("total_shares", sa.Integer(), nullable=False),
+            sa.Column("total_value", sa.Float(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("cap_table_checkpoint_holdings")
+    op.drop_index("ix_cap_table_checkpoints_as_of", table_name="cap_table_checkpoints")
+    op.drop_index("ix_cap_table_checkpoints_id", table_name="cap_table_checkpoints")
+    op.drop_table("cap_table_checkpoints")
@@ -0,0 +1,202 @@
+import asyncio
+import gzip
+import heapq
+import itertools
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+from app.config import settings
+from app.streaming import ndjson_line
+
+MANIFEST_NAME = "manifest.json"
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant of the UTC month containing moment"""
+    moment = as_utc(moment)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def next_month(start: datetime) -> datetime:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Treat naive timestamps as UTC, matching how audit events are written"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _sort_key(row: Mapping):
+    return row["created_at"], row["id"]
+
+
+class AuditArchive:
+    """Monthly audit partitions archived as gzip NDJSON segments on local disk.
+
+    Each month has a directory (YYYY-MM) of numbered part files and a
+    manifest listing them with their row count, id range and time range.
+    A part is written under a temporary name and only trusted once the
+    manifest lists it. Its rows are then purged from the database and the
+    part is marked purged, so an interrupted run finishes the purge before
+    archiving anything else. Rows that arrive for a month after it was
+    archived go into the next part on the following run.
+    """
+
+    # How long the newest archived timestamp is trusted before the manifests are read again,
+    # to pick up parts written by an archiver running in another process
+    NEWEST_RECHECK_SECONDS = 60.0
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        # (directory, newest archived timestamp, monotonic time it was read)
+        self._newest: Optional[Tuple[Path, Optional[datetime], float]] = None
+
+    def _month_dir(self, month: datetime) -> Path:
+        return self.directory / f"{month.year:04d}-{month.month:02d}"
+
+    def manifest(self, month: datetime) -> dict:
+        path = self._month_dir(month) / MANIFEST_NAME
+        if not path.exists():
+            return {"month": f"{month.year:04d}-{month.month:02d}", "parts": []}
+        return json.loads(path.read_text())
+
+    def months(self) -> List[datetime]:
+        """Archived months, oldest first"""
+        if not self.directory.is_dir():
+            return []
+        months = []
+        for entry in self.directory.iterdir():
+            if (entry / MANIFEST_NAME).exists():
+                year, month = entry.name.split("-")
+                months.append(datetime(int(year), int(month), 1, tzinfo=timezone.utc))
+        return sorted(months)
+
+    def mark_purged(self, month: datetime, name: str) -> None:
+        manifest = self.manifest(month)
+        for part in manifest["parts"]:
+            if part["file"] == name:
+                part["purged"] = True
+        self._write_manifest(self._month_dir(month), manifest)
+
+    def newest_archived_at(self) -> Optional[datetime]:
+        """Timestamp of the newest archived event, if anything is archived"""
+        months = self.months()
+        newest = None
+        if months:
+            parts = self.manifest(months[-1])["parts"]
+            newest = max(datetime.fromisoformat(part["last_at"]) for part in parts)
+        self._newest = (self.directory, newest, time.monotonic())
+        return newest
+
+    async def newest_archived_at_async(self) -> Optional[datetime]:
+        """newest_archived_at() from memory, reading the manifests on a thread only when the copy is old"""
+        cached = self._newest
+        if cached is not None and cached[0] == self.directory and time.monotonic() - cached[2] < self.NEWEST_RECHECK_SECONDS:
+            return cached[1]
+        return await asyncio.to_thread(self.newest_archived_at)
+
+    async def write_part_async(self, month: datetime, batches: AsyncIterator[Iterable[Mapping]]) -> Optional[dict]:
+        """Write rows for one month as a new compressed part and record it in the manifest"""
+        month_dir = self._month_dir(month)
+        month_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifest(month)
+        name = f"part-{len(manifest['parts']) + 1:04d}.ndjson.gz"
+        temporary = month_dir / (name + ".tmp")
+
+        part = {
+            "file": name, "count": 0, "min_id": None, "max_id": None, "first_at": None, "last_at": None, "purged": False
+        }
+        with gzip.open(temporary, "wt", encoding="utf-8") as segment:
+            async for batch in batches:
+                for row in batch:
+                    created_at = as_utc(row["created_at"]).isoformat(timespec="microseconds")
+                    segment.write(ndjson_line({**row, "created_at": created_at}))
+                    part["count"] += 1
+                    part["min_id"] = row["id"] if part["min_id"] is None else min(part["min_id"], row["id"])
+                    part["max_id"] = row["id"] if part["max_id"] is None else max(part["max_id"], row["id"])
+                    part["first_at"] = min(part["first_at"] or created_at, created_at)
+                    part["last_at"] = max(part["last_at"] or created_at, created_at)
+            segment.flush()
+            os.fsync(segment.fileno())
+
+        if not part["count"]:
+            temporary.unlink()
+            return None
+        os.replace(temporary, month_dir / name)
+        manifest["parts"].append(part)
+        self._write_manifest(month_dir, manifest)
+        cached = self._newest
+        if cached is not None and cached[0] == self.directory:
+            last_at = datetime.fromisoformat(part["last_at"])
+            self._newest = (self.directory, max(cached[1], last_at) if cached[1] else last_at, cached[2])
+        return part
+
+    @staticmethod
+    def _write_manifest(month_dir: Path, manifest: dict) -> None:
+        temporary = month_dir / (MANIFEST_NAME + ".tmp")
+        temporary.write_text(json.dumps(manifest, indent=2))
+        os.replace(temporary, month_dir / MANIFEST_NAME)
+
+    def _iter_part(self, month: datetime, name: str) -> Iterator[dict]:
+        with gzip.open(self._month_dir(month) / name, "rt", encoding="utf-8") as segment:
+            for line in segment:
+                row = json.loads(line)
+                row["created_at"] = as_utc(datetime.fromisoformat(row["created_at"]))
+                yield row
+
+    def iter_month(self, month: datetime) -> Iterator[dict]:
+        """Rows archived for a month, ordered by (created_at, id)"""
+        parts = [self._iter_part(month, part["file"]) for part in self.manifest(month)["parts"]]
+        return heapq.merge(*parts, key=_sort_key)
+
+    def _months_between(self, since: Optional[datetime], until: Optional[datetime]) -> List[datetime]:
+        return [
+            month for month in self.months()
+            if (since is None or next_month(month) > since) and (until is None or month < until)
+        ]
+
+    def latest(
+        self,
+        limit: int,
+        match: Callable[[dict], bool],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[dict]:
+        """Up to limit matching rows, newest first, holding at most limit rows in memory"""
+        rows: List[dict] = []
+        for month in reversed(self._months_between(since, until)):
+            rows = heapq.nlargest(limit, itertools.chain(rows, filter(match, self.iter_month(month))), key=_sort_key)
+            # Months do not overlap, so older ones cannot beat a full page
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def batches(
+        self,
+        match: Callable[[dict], bool],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[dict]]:
+        """Matching rows, oldest first, in batches"""
+        batch = []
+        for month in self._months_between(since, until):
+            for row in self.iter_month(month):
+                if not match(row):
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+audit_archive = AuditArchive(settings.audit_archive_dir)
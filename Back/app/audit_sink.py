@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import insert
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import AuditEvent, AuditAction
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSink:
+    """Write-behind buffer for audit events.
+
+    Events are queued in memory and inserted in batches by a background
+    task, either when batch_size events are waiting or every
+    flush_interval seconds. stop() drains the buffer, so a clean shutdown
+    loses nothing; events still buffered when the process dies are lost,
+    which is why callers can ask AuditService for a durable write instead.
+    Failed batches are retried on the next flush, keeping at most
+    max_buffer events.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int, enabled: bool = True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.enabled = enabled
+        self.session_factory = AsyncSessionLocal
+        self._buffer: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.flush_time_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop"""
+        if not self.enabled or self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                logger.error(f"Dropping {len(self._buffer)} audit events that could not be written on shutdown")
+                self.dropped += len(self._buffer)
+                self._buffer.clear()
+
+    def enqueue(
+        self,
+        user_id: int,
+        action: AuditAction,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """Buffer an event, stamped with the time it happened"""
+        self._buffer.append({
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self._trim()
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _trim(self) -> None:
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning(f"Audit buffer full; dropped {overflow} oldest events")
+
+    async def flush(self) -> bool:
+        """Insert buffered events in batches; return False if a batch failed"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                started = time.perf_counter()
+                try:
+                    async with self.session_factory() as db:
+                        await db.execute(insert(AuditEvent), batch)
+                        await db.commit()
+                except Exception as e:
+                    # Put the batch back in front so ordering survives the retry
+                    self._buffer[:0] = batch
+                    self._trim()
+                    self.failures += 1
+                    logger.error(f"Failed to write {len(batch)} audit events: {e}")
+                    return False
+                self.written += len(batch)
+                self.batches += 1
+                self.flush_time_max = max(self.flush_time_max, time.perf_counter() - started)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # Shielded so stop() cannot cancel a batch halfway through its insert
+            await asyncio.shield(self.flush())
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "flush_time_max_ms": round(self.flush_time_max * 1000, 3),
+        }
+
+
+audit_sink = AuditSink(
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    max_buffer=settings.audit_max_buffer,
+    enabled=settings.audit_write_behind
+)
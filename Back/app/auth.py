@@ -1,14 +1,23 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select, event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.database import get_db
-from app.models import User, UserRole
-from app.schemas import TokenData
+from app.database import get_async_db
+from app.models import User, UserRole, ShareholderProfile
+from app.schemas import TokenData, Principal
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -27,6 +36,136 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashExecutor:
+    """Dedicated, fixed-size thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so running it here keeps logins
+    from stalling the event loop. Tracks queue depth and hash latency.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _timed(self, submitted: float, fn, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_time_total += started - submitted
+            self.wait_time_max = max(self.wait_time_max, started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.hash_time_total += elapsed
+                self.hash_time_max = max(self.hash_time_max, elapsed)
+
+    async def run(self, fn, *args):
+        """Run a hashing function on the pool and await its result"""
+        executor = self._get_executor()
+        with self._lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._timed, time.perf_counter(), fn, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / self.completed, 3) if self.completed else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "hash_time_avg_ms": round(self.hash_time_total * 1000 / self.completed, 3) if self.completed else 0.0,
+                "hash_time_max_ms": round(self.hash_time_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hash_executor = PasswordHashExecutor(settings.password_hash_workers)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await password_hash_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await password_hash_executor.run(get_password_hash, password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords (runs inside the hashing process pool)"""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+# Process pool for bulk hashing; bcrypt is CPU-bound, so batches are spread across cores
+_hashing_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def hashing_process_count() -> int:
+    return settings.password_hash_processes or os.cpu_count() or 1
+
+
+def get_hashing_process_pool() -> ProcessPoolExecutor:
+    """Get the shared password hashing process pool, starting it on first use"""
+    global _hashing_process_pool
+    if _hashing_process_pool is None:
+        _hashing_process_pool = ProcessPoolExecutor(
+            max_workers=hashing_process_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hashing_process_pool
+
+
+def shutdown_hashing_process_pool() -> None:
+    """Stop the password hashing process pool if it was started"""
+    global _hashing_process_pool
+    if _hashing_process_pool is not None:
+        _hashing_process_pool.shutdown(wait=True)
+        _hashing_process_pool = None
+
+
+async def hash_passwords_parallel(passwords: List[str]) -> List[str]:
+    """Hash passwords across all hashing processes, preserving input order"""
+    if not passwords:
+        return []
+    workers = hashing_process_count()
+    batch_size = -(-len(passwords) // workers)
+    pool = get_hashing_process_pool()
+    loop = asyncio.get_running_loop()
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(pool, hash_passwords, passwords[start:start + batch_size])
+        for start in range(0, len(passwords), batch_size)
+    ))
+    return [hashed for batch in batches for hashed in batch]
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate a user with email and password"""
     user = db.query(User).filter(User.email == email).first()
@@ -37,6 +176,17 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate a user with email and password"""
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -49,35 +199,161 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get the current authenticated user"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> TokenData:
+    """Decode a JWT access token into its token data"""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
+            raise _credentials_exception()
+        return TokenData(email=email)
     except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+
+
+class PrincipalCache:
+    """TTL and size bounded cache of principals keyed by token subject.
+
+    Entries are dropped once a transaction that wrote the user or their
+    shareholder profile through the ORM in this process commits; other
+    workers see the change once the TTL expires.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, subject: str, principal: Principal) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (principal, time.monotonic())
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for subject in [subject for subject, (principal, _) in self._entries.items() if principal.id == user_id]:
+                del self._entries[subject]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(settings.principal_cache_ttl_seconds, settings.principal_cache_max_size)
+# Session.info key holding the ids of users written in the current transaction
+_STALE_PRINCIPALS = "stale_principals"
+
+
+def _mark_principal_stale(target, user_id: int) -> None:
+    """Remember a written user until their session commits.
+
+    Mapper events fire at flush, before commit; dropping the entry then
+    would let a concurrent request cache the pre-commit principal again.
+    """
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate_user(user_id)
+        return
+    session.info.setdefault(_STALE_PRINCIPALS, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_principal(mapper, connection, target):
+    _mark_principal_stale(target, target.id)
+
+
+@event.listens_for(ShareholderProfile, "after_insert")
+@event.listens_for(ShareholderProfile, "after_update")
+@event.listens_for(ShareholderProfile, "after_delete")
+def _invalidate_profile_principal(mapper, connection, target):
+    _mark_principal_stale(target, target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    for user_id in session.info.pop(_STALE_PRINCIPALS, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_principals(session):
+    session.info.pop(_STALE_PRINCIPALS, None)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Get the current authenticated principal, from cache when possible"""
+    token_data = _decode_token(token)
+    principal = principal_cache.get(token_data.email)
+    if principal is not None:
+        return principal
+    
+    result = await db.execute(
+        select(User, ShareholderProfile.id).outerjoin(ShareholderProfile).where(User.email == token_data.email)
+    )
+    row = result.first()
+    if row is None:
+        raise _credentials_exception()
+    user, shareholder_profile_id = row
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        is_active=user.is_active,
+        shareholder_profile_id=shareholder_profile_id
+    )
+    principal_cache.put(token_data.email, principal)
+    return principal
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user_async)) -> Principal:
     """Get the current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-async def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_admin_user(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Get the current admin user"""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -87,7 +363,7 @@ async def get_current_admin_user(current_user: User = Depends(get_current_active
     return current_user
 
 
-async def get_current_shareholder_user(current_user: User = Depends(get_current_active_user)) -> User:
+async def get_current_shareholder_user(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Get the current shareholder user"""
     if current_user.role != UserRole.SHAREHOLDER:
         raise HTTPException(
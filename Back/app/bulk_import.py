@@ -0,0 +1,94 @@
+import csv
+import json
+from typing import IO, Dict, Iterable, Iterator, Optional, Tuple
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str], explicit: Optional[str] = None) -> str:
+    """Work out whether an upload is CSV or JSON lines"""
+    if explicit:
+        if explicit not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported import format: {explicit}")
+        return explicit
+    name = (filename or "").lower()
+    kind = (content_type or "").lower()
+    if name.endswith((".jsonl", ".ndjson")) or "ndjson" in kind or "jsonl" in kind or "json" in kind:
+        return "jsonl"
+    if name.endswith(".csv") or "csv" in kind:
+        return "csv"
+    raise ValueError("Could not detect import format; pass format=csv or format=jsonl")
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line number, record, parse error) for each data line of the input.
+
+    Lines are consumed lazily, so an open file can be streamed without
+    loading it into memory. Blank cells and empty strings become None.
+    Lines DecodedLines could not decode are reported as errors.
+    """
+    invalid = getattr(lines, "invalid", {})
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        previous_line = reader.line_num
+        for record in reader:
+            line_number, first_line, previous_line = reader.line_num, previous_line + 1, reader.line_num
+            # A quoted field may span several physical lines
+            error = next((invalid[n] for n in range(first_line, line_number + 1) if n in invalid), None)
+            if error:
+                yield line_number, None, error
+                continue
+            if None in record:
+                yield line_number, None, "Too many columns"
+                continue
+            yield line_number, {key.strip(): _blank_to_none(value) for key, value in record.items() if key}, None
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if line_number in invalid:
+            yield line_number, None, invalid[line_number]
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, {key: _blank_to_none(value) for key, value in record.items()}, None
+
+
+class DecodedLines:
+    """Lines of an uploaded binary file, decoded as they are read.
+
+    Lines that are not valid UTF-8 are decoded with replacement characters
+    so line numbering stays intact; their errors are kept in `invalid`, by
+    line number, for iter_records to report against the row.
+    """
+
+    def __init__(self, binary_file: IO[bytes]):
+        self.binary_file = binary_file
+        self.invalid: Dict[int, str] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        for line_number, raw_line in enumerate(self.binary_file, start=1):
+            try:
+                yield raw_line.decode("utf-8-sig")
+            except UnicodeDecodeError as e:
+                self.invalid[line_number] = f"Not valid UTF-8 at byte {e.start + 1}; save the file as UTF-8"
+                yield raw_line.decode("utf-8-sig", errors="replace")
+
+
+def text_lines(binary_file: IO[bytes]) -> DecodedLines:
+    """Decode an uploaded binary file line by line"""
+    return DecodedLines(binary_file)
+
+
+def _blank_to_none(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.config import settings
+
+
+class _CacheEntry:
+    __slots__ = ("value", "version", "computed_at")
+
+    def __init__(self, value: Any, version: int, computed_at: float):
+        self.value = value
+        self.version = version
+        self.computed_at = computed_at
+
+
+class VersionedCache:
+    """In-process cache invalidated by bumping a version counter.
+
+    Writers call bump() after committing; entries computed under an older
+    version (or older than the TTL) are stale. A stale entry may still be
+    served for up to stale_while_revalidate seconds while a single caller
+    recomputes it; concurrent misses on the same key share one recompute.
+
+    The version is local to the process, so with several workers the TTL
+    bounds how long another worker's writes can go unseen. At most
+    max_entries keys are kept, least recently used first out, so keys
+    built from request parameters cannot grow the process without bound.
+    """
+
+    def __init__(self, ttl: float, stale_while_revalidate: float = 0.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self._version = 0
+        self._bumped_at = 0.0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.recompute_time_total = 0.0
+        self.recompute_time_max = 0.0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        """Invalidate every entry computed before this call"""
+        self._version += 1
+        self._bumped_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        self._entries.clear()
+        self._locks.clear()
+        self.hits = self.stale_hits = self.misses = 0
+        self.recompute_time_total = self.recompute_time_max = 0.0
+
+    def _stale_since(self, entry: _CacheEntry) -> Optional[float]:
+        """Return when the entry went stale, or None if it is still fresh"""
+        stale_since = None
+        if entry.version != self._version:
+            stale_since = self._bumped_at
+        expires_at = entry.computed_at + self.ttl
+        if time.monotonic() >= expires_at:
+            stale_since = expires_at if stale_since is None else min(stale_since, expires_at)
+        return stale_since
+
+    def _evict(self) -> None:
+        """Drop expired and least recently used entries, and the idle locks of keys no longer cached"""
+        horizon = time.monotonic() - self.ttl - self.stale_while_revalidate
+        for key in [key for key, entry in self._entries.items() if entry.computed_at < horizon]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        for key in [key for key, lock in self._locks.items() if key not in self._entries and not lock.locked()]:
+            del self._locks[key]
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, recomputing it when stale"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stale_since = self._stale_since(entry)
+            if stale_since is None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            if lock.locked() and time.monotonic() - stale_since <= self.stale_while_revalidate:
+                self.stale_hits += 1
+                return entry.value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the entry while we waited
+            entry = self._entries.get(key)
+            if entry is not None and self._stale_since(entry) is None:
+                self.hits += 1
+                return entry.value
+
+            self.misses += 1
+            version = self._version
+            started = time.perf_counter()
+            value = await compute()
+            elapsed = time.perf_counter() - started
+            self.recompute_time_total += elapsed
+            self.recompute_time_max = max(self.recompute_time_max, elapsed)
+
+            self._entries[key] = _CacheEntry(value, version, time.monotonic())
+            self._entries.move_to_end(key)
+            self._evict()
+            return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "recompute_time_total_ms": round(self.recompute_time_total * 1000, 3),
+            "recompute_time_avg_ms": round(self.recompute_time_total * 1000 / self.misses, 3) if self.misses else 0.0,
+            "recompute_time_max_ms": round(self.recompute_time_max * 1000, 3),
+        }
+
+
+# Cache for DashboardService results, invalidated by issuance and shareholder writes
+dashboard_cache = VersionedCache(
+    ttl=settings.dashboard_cache_ttl_seconds,
+    stale_while_revalidate=settings.dashboard_cache_stale_seconds,
+    max_entries=settings.dashboard_cache_max_entries
+)
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import CapTableCheckpoint
+from app.services import CapTableHistoryService
+
+logger = logging.getLogger(__name__)
+
+
+class CapTableCheckpointer:
+    """Background task that takes cap table checkpoints off the request path.
+
+    On start and shortly after every checkpoint boundary it stores a
+    checkpoint at the latest boundary, unless one already exists. Workers
+    racing for the same boundary are resolved by the unique as_of index,
+    so every worker can run one.
+    """
+
+    # Wait past each boundary so issuances committed just before it are included
+    SETTLE_SECONDS = 30.0
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.session_factory = AsyncSessionLocal
+        self._task: Optional[asyncio.Task] = None
+        self.taken = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the checkpoint task on the running event loop"""
+        if not self.enabled or self.running or CapTableHistoryService.current_checkpoint_boundary() is None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def checkpoint(self) -> Optional[CapTableCheckpoint]:
+        """Take the checkpoint for the latest boundary if it is missing"""
+        async with self.session_factory() as db:
+            checkpoint = await CapTableHistoryService.maybe_checkpoint_async(db)
+        if checkpoint is not None:
+            self.taken += 1
+            logger.info(f"Cap table checkpoint taken as of {checkpoint.as_of}")
+        return checkpoint
+
+    @staticmethod
+    def seconds_until_next(now: Optional[datetime] = None) -> float:
+        now = now or datetime.utcnow()
+        boundary = CapTableHistoryService.current_checkpoint_boundary(now)
+        following = boundary + timedelta(hours=settings.cap_table_checkpoint_interval_hours)
+        return (following - now).total_seconds() + CapTableCheckpointer.SETTLE_SECONDS
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Shielded so stop() cannot cancel a checkpoint halfway through its writes
+                await asyncio.shield(self.checkpoint())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Cap table checkpoint failed: {e}")
+            await asyncio.sleep(self.seconds_until_next())
+
+
+cap_table_checkpointer = CapTableCheckpointer()
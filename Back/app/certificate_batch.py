@@ -0,0 +1,177 @@
+import asyncio
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from app.certificate_cache import certificate_cache
+from app.config import settings
+
+ZIP_MEDIA_TYPE = "application/zip"
+
+# Certificate fields copied out of the ORM rows; workers only ever see these plain values
+ISSUANCE_FIELDS = (
+    "id", "certificate_number", "number_of_shares", "price_per_share", "total_value", "issuance_date", "created_at",
+    "certificate_theme"
+)
+SHAREHOLDER_FIELDS = ("id", "first_name", "last_name")
+
+CertificateJob = Tuple[dict, dict]
+
+
+def certificate_job(issuance, shareholder) -> CertificateJob:
+    """Picklable copy of what a worker needs to render one certificate"""
+    return (
+        {field: getattr(issuance, field) for field in ISSUANCE_FIELDS},
+        {field: getattr(shareholder, field) for field in SHAREHOLDER_FIELDS}
+    )
+
+
+def certificate_filename(job: CertificateJob) -> str:
+    return f"certificate_{job[0]['certificate_number']}.pdf"
+
+
+# One generator per backend in each worker process, reused for every render it runs
+_generators: Dict[str, object] = {}
+
+
+def _get_generator(backend: Optional[str] = None):
+    backend = backend or settings.certificate_backend
+    if backend not in _generators:
+        from app.pdf_generator import PDFCertificateGenerator
+        _generators[backend] = PDFCertificateGenerator(backend)
+    return _generators[backend]
+
+
+def render_certificate(job: CertificateJob, backend: Optional[str] = None) -> bytes:
+    """Render one certificate (runs inside the certificate process pool)"""
+    issuance, shareholder = job
+    return _get_generator(backend).generate_certificate_pdf(SimpleNamespace(**issuance), SimpleNamespace(**shareholder))
+
+
+def render_merged_certificates(jobs: List[CertificateJob], backend: Optional[str] = None) -> bytes:
+    """Write every certificate's pages as one PDF (runs inside the pool)"""
+    return _get_generator(backend).generate_merged_pdf(
+        (SimpleNamespace(**issuance), SimpleNamespace(**shareholder)) for issuance, shareholder in jobs
+    )
+
+
+def cache_key(job: CertificateJob, backend: Optional[str] = None) -> str:
+    issuance, shareholder = job
+    return _get_generator(backend).cache_key(SimpleNamespace(**issuance), SimpleNamespace(**shareholder))
+
+
+# Process pool for batch rendering; WeasyPrint layout is CPU-bound, so certificates are spread across cores
+_certificate_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def certificate_process_count() -> int:
+    return settings.certificate_processes or os.cpu_count() or 1
+
+
+def get_certificate_process_pool() -> ProcessPoolExecutor:
+    """Get the shared certificate rendering process pool, starting it on first use"""
+    global _certificate_process_pool
+    if _certificate_process_pool is None:
+        _certificate_process_pool = ProcessPoolExecutor(
+            max_workers=certificate_process_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _certificate_process_pool
+
+
+def shutdown_certificate_process_pool() -> None:
+    """Stop the certificate rendering process pool if it was started"""
+    global _certificate_process_pool
+    if _certificate_process_pool is not None:
+        _certificate_process_pool.shutdown(wait=True)
+        _certificate_process_pool = None
+
+
+async def render_certificates(
+    batches: AsyncIterator[Iterable[Tuple]],
+    backend: Optional[str] = None
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """Render (issuance, shareholder) rows across the process pool as (filename, pdf), in input order.
+
+    Cached certificates are served from the disk cache. At most two
+    renders per worker are in flight, so memory stays flat however many
+    certificates match.
+    """
+    # Resolved here so the workers render with the backend the cache keys name
+    backend = backend or settings.certificate_backend
+    pool = get_certificate_process_pool()
+    loop = asyncio.get_running_loop()
+    window = certificate_process_count() * 2
+    pending = deque()
+
+    async def finish(entry) -> Tuple[str, bytes]:
+        filename, key, pdf = entry
+        if isinstance(pdf, asyncio.Future):
+            pdf = await pdf
+            await certificate_cache.put_async(key, pdf)
+        return filename, pdf
+
+    async for batch in batches:
+        for issuance, shareholder in batch:
+            job = certificate_job(issuance, shareholder)
+            key = cache_key(job, backend)
+            pdf = await certificate_cache.get_async(key)
+            if pdf is None:
+                pdf = loop.run_in_executor(pool, render_certificate, job, backend)
+            pending.append((certificate_filename(job), key, pdf))
+            while len(pending) >= window:
+                yield await finish(pending.popleft())
+    while pending:
+        yield await finish(pending.popleft())
+
+
+class _ChunkWriter:
+    """Write-only, unseekable sink that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def zip_chunks(documents: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """Stream (filename, pdf) pairs as a ZIP archive, one chunk per document"""
+    sink = _ChunkWriter()
+    # PDF content streams are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for filename, pdf in documents:
+            archive.writestr(filename, pdf)
+            yield sink.drain()
+    yield sink.drain()
+
+
+async def collect_jobs(batches: AsyncIterator[Iterable[Tuple]], limit: int) -> List[CertificateJob]:
+    """Copy up to limit + 1 rows into jobs, so callers can tell when a batch is too large"""
+    jobs = []
+    async for batch in batches:
+        for issuance, shareholder in batch:
+            jobs.append(certificate_job(issuance, shareholder))
+            if len(jobs) > limit:
+                return jobs
+    return jobs
+
+
+async def render_merged(jobs: List[CertificateJob], backend: Optional[str] = None) -> bytes:
+    """Render jobs into one multi-page PDF on a pool worker"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_certificate_process_pool(), render_merged_certificates, jobs, backend or settings.certificate_backend
+    )
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+from app.config import settings
+
+
+class CertificateCache:
+    """Disk cache of rendered certificate PDFs with size-bounded LRU eviction.
+
+    Keys are built by the certificate generator from the issuance id, the
+    backend and a fingerprint of everything printed on the certificate and
+    the template version, so edits and template changes simply miss while
+    each backend keeps its own render. Each entry is one
+    file named after its key. The directory is scanned once into an
+    in-memory index of entry sizes in recency order (oldest mtime first);
+    after that, reads and writes keep the index current, and when the total
+    grows past max_bytes the least recently used files go first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @directory.setter
+    def directory(self, directory) -> None:
+        with self._lock:
+            self._directory = Path(directory)
+            # key -> size in bytes, least recently used first
+            self._index: Optional["OrderedDict[str, int]"] = None
+            # key without its fingerprint (issuance id and backend) -> stored renders
+            self._versions: Dict[str, Set[str]] = {}
+            self._size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    @staticmethod
+    def _version_group(key: str) -> str:
+        """Everything before the trailing fingerprint; renders in one group replace each other"""
+        return key.rsplit("-", 1)[0]
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Scan the directory once; later calls use the in-memory index"""
+        if self._index is None:
+            entries = []
+            if self.directory.is_dir():
+                for entry in os.scandir(self.directory):
+                    if not entry.name.endswith(".pdf"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, entry.name[:-len(".pdf")], stat.st_size))
+            self._index = OrderedDict()
+            for _, key, size in sorted(entries):
+                self._add(key, size)
+        return self._index
+
+    def _add(self, key: str, size: int) -> None:
+        self._size += size - self._index.pop(key, 0)
+        self._index[key] = size
+        self._versions.setdefault(self._version_group(key), set()).add(key)
+
+    def _forget(self, key: str) -> None:
+        self._size -= self._index.pop(key, 0)
+        versions = self._versions.get(self._version_group(key))
+        if versions is not None:
+            versions.discard(key)
+            if not versions:
+                del self._versions[self._version_group(key)]
+
+    def contains(self, key: str) -> bool:
+        """Whether a render is stored, without counting a lookup"""
+        return self.enabled and self._path(key).exists()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                if self._index is not None:
+                    self._forget(key)
+            return None
+        with self._lock:
+            self.hits += 1
+            if self._index is not None:
+                if key in self._index:
+                    self._index.move_to_end(key)
+                else:
+                    # Written by another process sharing the directory
+                    self._add(key, len(data))
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        with self._lock:
+            self._load_index()
+            os.replace(temporary, path)
+            self._add(key, len(data))
+            self._discard_other_versions(key)
+            self._evict()
+
+    def _discard_other_versions(self, key: str) -> None:
+        """Drop renders of the same issuance and backend made from older data or templates"""
+        for other in list(self._versions.get(self._version_group(key), ())):
+            if other != key:
+                self._remove(other)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+        self._forget(key)
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        """get() on a thread, so reading the file does not block the event loop"""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, data: bytes) -> None:
+        """put() on a thread, so writing, renaming and evicting files does not block the event loop"""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self.put, key, data)
+
+    async def get_or_render_async(self, key: str, render: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, bool]:
+        """Return (pdf, cached), rendering and storing the PDF on a miss"""
+        data = await self.get_async(key)
+        if data is not None:
+            return data, True
+        data = await render()
+        await self.put_async(key, data)
+        return data, False
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._load_index()),
+                "bytes": self._size if self.enabled else 0,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+certificate_cache = CertificateCache(settings.certificate_cache_dir, settings.certificate_cache_max_mb * 1024 * 1024)
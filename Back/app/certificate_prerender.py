@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+from sqlalchemy import select, update
+from app.certificate_batch import certificate_job, cache_key
+from app.certificate_cache import certificate_cache
+from app.certificate_render_pool import certificate_render_pool
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import CertificateStatus, ShareIssuance, ShareholderProfile
+
+logger = logging.getLogger(__name__)
+
+
+class CertificatePrerenderer:
+    """Background renderer that warms the certificate cache for new issuances.
+
+    Issuance ids are queued when an issuance is created and rendered by a
+    fixed number of worker tasks on the certificate render pool, only while
+    one of its workers is idle, so a burst of issuances never delays
+    certificate downloads by more than the render already running. A
+    failed render is retried with exponential backoff before the issuance
+    is marked failed. The queue is bounded; issuances that do not fit, or
+    are still queued at shutdown, stay pending and are queued again on
+    the next startup. Each status change moves the shareholder's listing
+    version; the company-wide version moves once when the queue drains.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retries: int, retry_delay: float, enabled: bool = True):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.enabled = enabled
+        self.session_factory = AsyncSessionLocal
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Statuses changed since the company version last moved
+        self._totals_stale = False
+        self._busy = 0
+        self.rendered = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+        self.render_time_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        # Without the cache there is nowhere to keep a pre-rendered certificate
+        if not self.enabled or not certificate_cache.enabled or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers; anything not yet rendered stays pending"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queue = None
+        self._busy = 0
+        try:
+            await self._bump_totals_version()
+        except Exception as e:
+            logger.error(f"Could not move the company version after pre-rendering: {e}")
+
+    def enqueue(self, issuance_id: int) -> bool:
+        """Queue an issuance for rendering; False if the workers are not running or the queue is full"""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(issuance_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Certificate pre-render queue full; issuance {issuance_id} stays pending")
+            return False
+        return True
+
+    async def resume_pending(self) -> int:
+        """Queue issuances left pending by a previous run, oldest first"""
+        if not self.running:
+            return 0
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(ShareIssuance.id)
+                .where(ShareIssuance.certificate_status == CertificateStatus.PENDING)
+                .order_by(ShareIssuance.id)
+                .limit(self.max_queue - self._queue.qsize())
+            )
+            issuance_ids = result.scalars().all()
+        return sum(self.enqueue(issuance_id) for issuance_id in issuance_ids)
+
+    async def _render_async(self, job) -> bytes:
+        return await certificate_render_pool.render_when_idle(job)
+
+    async def _set_status(self, issuance_id: int, shareholder_id: int, status: CertificateStatus) -> None:
+        from app.services import HoldingsService
+        async with self.session_factory() as db:
+            # Leave updated_at alone; the issuance itself did not change
+            await db.execute(
+                update(ShareIssuance)
+                .where(ShareIssuance.id == issuance_id)
+                .values(certificate_status=status, updated_at=ShareIssuance.updated_at)
+            )
+            # Listings show the status, so their ETags must move with it
+            await HoldingsService.bump_holding_version_async(db, shareholder_id)
+            await db.commit()
+        self._totals_stale = True
+
+    async def _bump_totals_version(self) -> None:
+        """Move the company version once for every status changed since the last bump"""
+        from app.services import HoldingsService
+        if not self._totals_stale:
+            return
+        self._totals_stale = False
+        try:
+            async with self.session_factory() as db:
+                await HoldingsService.bump_totals_version_async(db)
+                await db.commit()
+        except BaseException:
+            # Also on cancellation, so stop() still moves the version
+            self._totals_stale = True
+            raise
+
+    async def process(self, issuance_id: int) -> Optional[CertificateStatus]:
+        """Render one issuance's certificate into the cache, retrying failures"""
+        async with self.session_factory() as db:
+            row = (await db.execute(
+                select(ShareIssuance, ShareholderProfile)
+                .join(ShareholderProfile, ShareIssuance.shareholder_id == ShareholderProfile.id)
+                .where(ShareIssuance.id == issuance_id)
+            )).first()
+            if row is None:
+                return None
+            job = certificate_job(*row)
+            shareholder_id = row[0].shareholder_id
+
+        key = cache_key(job)
+        attempt = 0
+        while not certificate_cache.contains(key):
+            started = time.perf_counter()
+            try:
+                pdf = await self._render_async(job)
+            except Exception as e:
+                if attempt >= self.retries:
+                    self.failed += 1
+                    logger.error(f"Giving up on certificate for issuance {issuance_id} after {attempt + 1} attempts: {e}")
+                    await self._set_status(issuance_id, shareholder_id, CertificateStatus.FAILED)
+                    return CertificateStatus.FAILED
+                self.retried += 1
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+                attempt += 1
+                continue
+            await certificate_cache.put_async(key, pdf)
+            self.rendered += 1
+            self.render_time_max = max(self.render_time_max, time.perf_counter() - started)
+            break
+
+        await self._set_status(issuance_id, shareholder_id, CertificateStatus.READY)
+        return CertificateStatus.READY
+
+    async def _run(self) -> None:
+        while True:
+            issuance_id = await self._queue.get()
+            self._busy += 1
+            try:
+                await self.process(issuance_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Certificate pre-render for issuance {issuance_id} failed: {e}")
+            finally:
+                self._busy -= 1
+                self._queue.task_done()
+            # The last worker to finish a drained queue moves the company version
+            if self._queue.empty() and self._busy == 0:
+                try:
+                    await self._bump_totals_version()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Could not move the company version after pre-rendering: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "rendered": self.rendered,
+            "retries": self.retried,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "render_time_max_ms": round(self.render_time_max * 1000, 3),
+        }
+
+
+certificate_prerenderer = CertificatePrerenderer(
+    workers=settings.certificate_prerender_workers,
+    max_queue=settings.certificate_prerender_queue_size,
+    retries=settings.certificate_prerender_retries,
+    retry_delay=settings.certificate_prerender_retry_delay_seconds,
+    enabled=settings.certificate_prerender
+)
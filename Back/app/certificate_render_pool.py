@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from app.certificate_batch import CertificateJob, certificate_job, render_certificate
+from app.config import settings
+
+
+class RenderPoolFull(Exception):
+    """Raised when every render slot and queue place is taken"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Certificate render queue is full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _warm_worker() -> None:
+    """Render a throwaway certificate so fonts, template and stylesheet are loaded before real requests"""
+    issuance = {
+        "id": 0, "certificate_number": "WARM-UP", "number_of_shares": 1, "price_per_share": 1.0,
+        "total_value": 1.0, "issuance_date": datetime(2000, 1, 1), "created_at": None, "certificate_theme": None
+    }
+    render_certificate((issuance, {"id": 0, "first_name": "Warm", "last_name": "Up"}))
+
+
+def _render_timed(job: CertificateJob, backend: Optional[str]) -> Tuple[bytes, float]:
+    started = time.perf_counter()
+    pdf = render_certificate(job, backend)
+    return pdf, time.perf_counter() - started
+
+
+class CertificateRenderPool:
+    """Dedicated worker processes for certificate downloads.
+
+    Renders run off the event loop on `processes` spawned workers, so a
+    burst of downloads cannot stall other requests. At most `processes`
+    renders run at once and `max_queue` more may wait; beyond that render()
+    raises RenderPoolFull with a Retry-After estimate instead of letting
+    latency pile up. A slot stays taken until its worker finishes, even if
+    the download that asked for it was cancelled. Native backend renders
+    are cheap enough to run inline and never count against the limit.
+    start() spawns and warms every worker; a pool that was not started is
+    created on first use without warming.
+    """
+
+    # How often background renders check for an idle worker
+    IDLE_POLL_SECONDS = 0.05
+
+    def __init__(self, processes: int, max_queue: int, warm: bool = True):
+        self.processes = processes
+        self.max_queue = max_queue
+        self.warm = warm
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        # cache key -> render in progress, shared by concurrent requests for the same certificate
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.rendered = 0
+        self.rendered_inline = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.render_time_avg = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Spawn the workers and have each load fonts and templates in the background"""
+        executor = self._get_executor()
+        if self.warm:
+            # Spawn-based pools only start a new process when no idle one can take the task
+            for _ in range(self.processes):
+                executor.submit(_warm_worker)
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, from the average render time"""
+        waiting = max(self._in_flight - self.processes, 0) + 1
+        return max(1, math.ceil(self.render_time_avg * waiting / self.processes))
+
+    async def render(self, issuance, shareholder, backend: Optional[str] = None, key: Optional[str] = None) -> bytes:
+        """Render one certificate on the pool, or raise RenderPoolFull.
+
+        Concurrent renders with the same cache key share the first one's
+        result instead of each taking a slot. Native renders run inline on
+        the event loop: at about a millisecond they cost less than handing
+        the job to a worker, so they never take a slot either.
+        """
+        if (backend or settings.certificate_backend) == "native":
+            self.rendered_inline += 1
+            return render_certificate(certificate_job(issuance, shareholder), backend)
+        if key is not None and key in self._pending:
+            self.coalesced += 1
+            pdf, _ = await asyncio.shield(self._pending[key])
+            return pdf
+        if self._in_flight >= self.processes + self.max_queue:
+            self.rejected += 1
+            raise RenderPoolFull(self.retry_after())
+        future = self._submit(certificate_job(issuance, shareholder), backend, key)
+        # Shielded so a cancelled first caller does not cancel the render others are waiting on
+        pdf, _ = await asyncio.shield(future)
+        return pdf
+
+    async def render_when_idle(self, job: CertificateJob, backend: Optional[str] = None) -> bytes:
+        """Render background work on the pool, only once a worker is idle.
+
+        Downloads may still queue behind busy workers, but background
+        renders never do, so they cannot delay a download by more than the
+        one render already running.
+        """
+        if (backend or settings.certificate_backend) == "native":
+            self.rendered_inline += 1
+            return render_certificate(job, backend)
+        while self._in_flight >= self.processes:
+            await asyncio.sleep(self.IDLE_POLL_SECONDS)
+        pdf, _ = await asyncio.shield(self._submit(job, backend))
+        return pdf
+
+    def _submit(self, job: CertificateJob, backend: Optional[str], key: Optional[str] = None) -> asyncio.Future:
+        """Start a render on a worker; its slot is held until the worker finishes, even if every caller gave up"""
+        self._in_flight += 1
+        future = asyncio.get_running_loop().run_in_executor(self._get_executor(), _render_timed, job, backend)
+        if key is not None:
+            self._pending[key] = future
+        future.add_done_callback(functools.partial(self._finished, key))
+        return future
+
+    def _finished(self, key: Optional[str], future: asyncio.Future) -> None:
+        self._in_flight -= 1
+        if key is not None and self._pending.get(key) is future:
+            del self._pending[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, seconds = future.result()
+        self.rendered += 1
+        # Exponentially weighted, so the estimate follows the current load
+        self.render_time_avg = seconds if self.rendered == 1 else 0.8 * self.render_time_avg + 0.2 * seconds
+
+    def stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "max_queue": self.max_queue,
+            "running": min(self._in_flight, self.processes),
+            "queued": max(self._in_flight - self.processes, 0),
+            "rendered": self.rendered,
+            "rendered_inline": self.rendered_inline,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+            "render_time_avg_ms": round(self.render_time_avg * 1000, 3),
+        }
+
+
+certificate_render_pool = CertificateRenderPool(
+    processes=settings.certificate_render_processes,
+    max_queue=settings.certificate_render_queue_size
+)
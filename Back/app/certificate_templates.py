@@ -0,0 +1,65 @@
+import hashlib
+import html
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+from app.config import settings
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+THEME_DIR = TEMPLATE_DIR / "themes"
+
+
+def available_themes() -> List[str]:
+    """Names of the certificate themes shipped in app/templates/themes"""
+    return sorted(path.stem for path in THEME_DIR.glob("*.css"))
+
+
+def validate_theme(theme: Optional[str]) -> None:
+    """Raise ValueError for a theme that does not exist (None means the default)"""
+    if theme is not None and theme not in available_themes():
+        raise ValueError(f"Unknown certificate theme: {theme}")
+
+
+class CertificateTemplate:
+    """The certificate layout with one theme, compiled once per process.
+
+    The markup is read and compiled on construction and the theme's
+    stylesheet is parsed into a WeasyPrint CSS object on first use, so
+    each render only substitutes values and lays the page out. version
+    changes whenever the markup or stylesheet does, which keeps cached
+    renders from outliving a template edit.
+    """
+
+    def __init__(self, theme: str):
+        validate_theme(theme)
+        self.theme = theme
+        markup = (TEMPLATE_DIR / "certificate.html").read_text(encoding="utf-8")
+        self.css = (THEME_DIR / f"{theme}.css").read_text(encoding="utf-8")
+        self.markup = Template(markup)
+        self.version = hashlib.sha256((markup + self.css).encode()).hexdigest()[:12]
+        self._stylesheet = None
+
+    def stylesheet(self, font_config):
+        """The theme's stylesheet parsed once for this font configuration"""
+        if self._stylesheet is None:
+            from weasyprint import CSS
+            self._stylesheet = CSS(string=self.css, font_config=font_config)
+        return self._stylesheet
+
+    def render_html(self, fields: Dict[str, str], inline_css: bool = False) -> str:
+        """Fill the template with escaped values; inline_css embeds the stylesheet for standalone use"""
+        values = {name: html.escape(str(value)) for name, value in fields.items()}
+        values["inline_style"] = f"\n    <style>\n{self.css}    </style>" if inline_css else ""
+        return self.markup.substitute(values)
+
+
+_templates: Dict[str, CertificateTemplate] = {}
+
+
+def get_template(theme: Optional[str] = None) -> CertificateTemplate:
+    """Get the compiled template for a theme, compiling it on first use in this process"""
+    theme = theme or settings.certificate_default_theme
+    template = _templates.get(theme)
+    if template is None:
+        template = _templates[theme] = CertificateTemplate(theme)
+    return template
@@ -1,27 +1,183 @@
+import threading
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, NullPool, QueuePool, AsyncAdaptedQueuePool
 from app.config import settings
 
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a synchronous database URL onto its asyncio driver"""
+    if database_url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        return "postgresql+asyncpg://" + database_url.split("://", 1)[1]
+    if database_url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + database_url.split("://", 1)[1]
+    return database_url
+
+
+class PoolWaitStats:
+    """Counters for connection checkouts, shared across pool recreation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def begin(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def end(self, started: float, timed_out: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Time every checkout so pool pressure shows up in the stats endpoint"""
+    wait_stats: PoolWaitStats
+
+    def connect(self):
+        started = self.wait_stats.begin()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.wait_stats.end(started, timed_out=True)
+            raise
+        except Exception:
+            self.wait_stats.end(started)
+            raise
+        self.wait_stats.end(started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(database_url: str, is_async: bool = False) -> dict:
+    """Build pool keyword arguments for create_engine from settings"""
+    options = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if "sqlite" in database_url:
+        options["connect_args"] = {"check_same_thread": False}
+
+    pool_class = settings.db_pool_class.lower()
+    # In-memory SQLite only exists on a single connection
+    if database_url.rstrip("/").endswith(("sqlite:", "aiosqlite:")) or ":memory:" in database_url:
+        pool_class = "static"
+
+    if pool_class == "static":
+        options["poolclass"] = StaticPool
+    elif pool_class == "null":
+        options["poolclass"] = NullPool
+    elif pool_class == "queue":
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    else:
+        raise ValueError(f"Unknown database pool class: {settings.db_pool_class}")
+    return options
+
+
+ASYNC_DATABASE_URL = settings.async_database_url or get_async_database_url(settings.database_url)
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
 
-# Create session factory
+# Create async database engine used by the API routes
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL, is_async=True))
+
+for _pool in (engine.pool, async_engine.pool):
+    if isinstance(_pool, _InstrumentedPoolMixin):
+        _pool.wait_stats = PoolWaitStats()
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
 
+def get_pool_stats() -> dict:
+    """Report checkout pressure for the sync and async connection pools"""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        pool_stats = {
+            "pool_class": type(pool).__name__,
+            "size": None,
+            "checked_out": None,
+            "checked_in": None,
+            "overflow": None,
+            "waiting": 0,
+            "checkouts": 0,
+            "timeouts": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_avg_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+        }
+        if isinstance(pool, QueuePool):
+            pool_stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        if isinstance(pool, _InstrumentedPoolMixin):
+            pool_stats.update(pool.wait_stats.snapshot())
+        stats[name] = pool_stats
+    return stats
+
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,33 @@
+import hashlib
+import json
+from fastapi import Request, Response, status
+
+
+def make_etag(*versions) -> str:
+    """Strong ETag from the row versions a response is built from"""
+    payload = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in versions])
+    return f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names etag, so the client's copy is still current"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match compares weakly, so a W/ prefix added by a proxy still matches
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Responses are per user: clients may keep them but must revalidate before reuse
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 telling the client to reuse its copy"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -1,11 +1,17 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from app.database import engine, get_db
+from app.database import engine, async_engine, get_db
+from app.auth import shutdown_hashing_process_pool, password_hash_executor
+from app.audit_sink import audit_sink
+from app.cap_table_checkpointer import cap_table_checkpointer
+from app.certificate_batch import shutdown_certificate_process_pool
+from app.certificate_prerender import certificate_prerenderer
+from app.certificate_render_pool import certificate_render_pool
 from app.models import Base
-from app.routers import auth, shareholders, issuances, dashboard, audit
+from app.routers import auth, shareholders, issuances, dashboard, audit, metrics
 from app.config import settings
-from app.services import AuditService
+from app.services import AuditService, HoldingsService
 from app.models import AuditAction
 import logging
 
@@ -32,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "Retry-After", "X-Certificate-Cache", "ETag"],
 )
 
 # Include routers
@@ -40,6 +47,7 @@ app.include_router(shareholders.router)
 app.include_router(issuances.router)
 app.include_router(dashboard.router)
 app.include_router(audit.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -102,19 +110,46 @@ async def startup_event():
                 tax_id="TAX123456"
             )
             db.add(shareholder_profile)
+            db.flush()
+            HoldingsService.record_new_shareholder(db, shareholder_profile.id)
             db.commit()
             logger.info("Default shareholder user created: shareholder@company.com / shareholder123")
+        
+        # Seed the holdings summary for databases that predate it
+        if HoldingsService.get_company_totals(db) is None:
+            written, _ = HoldingsService.rebuild(db)
+            logger.info(f"Shareholder holdings rebuilt from issuances ({written} rows)")
             
     except Exception as e:
         logger.error(f"Error during startup: {e}")
     finally:
         db.close()
+    
+    audit_sink.start()
+    certificate_render_pool.start()
+    certificate_prerenderer.start()
+    cap_table_checkpointer.start()
+    try:
+        resumed = await certificate_prerenderer.resume_pending()
+        if resumed:
+            logger.info(f"Queued {resumed} pending certificate pre-render(s)")
+    except Exception as e:
+        logger.error(f"Error queueing pending certificate pre-renders: {e}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Cap Table Management System...")
+    # Write out buffered audit events before the engine goes away
+    await audit_sink.stop()
+    await cap_table_checkpointer.stop()
+    shutdown_hashing_process_pool()
+    await certificate_prerenderer.stop()
+    shutdown_certificate_process_pool()
+    certificate_render_pool.shutdown()
+    password_hash_executor.shutdown()
+    await async_engine.dispose()
 
 
 # Error handlers
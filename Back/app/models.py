@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -18,6 +18,12 @@ class AuditAction(str, enum.Enum):
     SHAREHOLDER_UPDATED = "shareholder_updated"
 
 
+class CertificateStatus(str, enum.Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -50,6 +56,7 @@ class ShareholderProfile(Base):
     # Relationships
     user = relationship("User", back_populates="shareholder_profile")
     share_issuances = relationship("ShareIssuance", back_populates="shareholder")
+    holding = relationship("ShareholderHolding", back_populates="shareholder", uselist=False)
 
 
 class ShareIssuance(Base):
@@ -60,16 +67,79 @@ class ShareIssuance(Base):
     number_of_shares = Column(Integer, nullable=False)
     price_per_share = Column(Float, nullable=False)
     total_value = Column(Float, nullable=False)
-    issuance_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    issuance_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     certificate_number = Column(String, unique=True, nullable=False)
+    # Background pre-render state; NULL when no pre-render was scheduled (e.g. bulk imports)
+    certificate_status = Column(Enum(CertificateStatus), nullable=True)
+    # Certificate theme from app/templates/themes; NULL uses the configured default
+    certificate_theme = Column(String, nullable=True)
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Keyset pagination of the issuance listing, overall and per shareholder
+    __table_args__ = (
+        Index("ix_share_issuances_shareholder_id_issuance_date_id", "shareholder_id", "issuance_date", "id"),
+        Index("ix_share_issuances_issuance_date_id", "issuance_date", "id"),
+        Index("ix_share_issuances_number_of_shares_id", "number_of_shares", "id"),
+        Index("ix_share_issuances_total_value_id", "total_value", "id"),
+    )
+
     # Relationships
     shareholder = relationship("ShareholderProfile", back_populates="share_issuances")
 
 
+class ShareholderHolding(Base):
+    """Running per-shareholder totals, maintained alongside share_issuances"""
+    __tablename__ = "shareholder_holdings"
+
+    shareholder_id = Column(Integer, ForeignKey("shareholder_profiles.id"), primary_key=True)
+    total_shares = Column(Integer, nullable=False, default=0)
+    total_value = Column(Float, nullable=False, default=0.0)
+    issuance_count = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    shareholder = relationship("ShareholderProfile", back_populates="holding")
+
+
+class CompanyTotals(Base):
+    """Single-row company-wide totals (id is always 1)"""
+    __tablename__ = "company_totals"
+
+    id = Column(Integer, primary_key=True)
+    total_shareholders = Column(Integer, nullable=False, default=0)
+    total_shares = Column(Integer, nullable=False, default=0)
+    total_value = Column(Float, nullable=False, default=0.0)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class CapTableCheckpoint(Base):
+    """Snapshot of per-shareholder totals covering issuances up to as_of"""
+    __tablename__ = "cap_table_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    as_of = Column(DateTime, unique=True, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    holdings = relationship("CheckpointHolding", back_populates="checkpoint", cascade="all, delete-orphan")
+
+
+class CheckpointHolding(Base):
+    __tablename__ = "cap_table_checkpoint_holdings"
+
+    checkpoint_id = Column(Integer, ForeignKey("cap_table_checkpoints.id", ondelete="CASCADE"), primary_key=True)
+    shareholder_id = Column(Integer, ForeignKey("shareholder_profiles.id"), primary_key=True)
+    total_shares = Column(Integer, nullable=False)
+    total_value = Column(Float, nullable=False)
+
+    # Relationships
+    checkpoint = relationship("CapTableCheckpoint", back_populates="holdings")
+
+
 class AuditEvent(Base):
     __tablename__ = "audit_events"
 
@@ -81,5 +151,12 @@ class AuditEvent(Base):
     user_agent = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Keyset pagination walks (created_at, id) newest first, optionally within one action or user
+    __table_args__ = (
+        Index("ix_audit_events_created_at_id", "created_at", "id"),
+        Index("ix_audit_events_action_created_at_id", "action", "created_at", "id"),
+        Index("ix_audit_events_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="audit_events") 
\ No newline at end of file
@@ -0,0 +1,273 @@
+import math
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# A4 in points
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+
+Color = Tuple[int, int, int]
+
+# Advance widths (1/1000 em) of printable ASCII, 32-126, from the Adobe metrics of the standard fonts
+_WIDTHS = {
+    "Helvetica": (
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ),
+    "Helvetica-Bold": (
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ),
+    "Times-Roman": (
+        250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+        500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,
+        921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,
+        556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,
+        333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,
+        500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+    ),
+    "Times-Bold": (
+        250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+        500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 333, 333, 570, 570, 570, 500,
+        930, 722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944, 722, 778,
+        611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667, 333, 278, 333, 581, 500,
+        333, 500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833, 556, 500,
+        556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444, 394, 220, 394, 520,
+    ),
+}
+# Resource names, in the order the font objects are written
+FONTS = {name: f"F{index}" for index, name in enumerate(_WIDTHS, start=1)}
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    """Width of text in points; characters outside ASCII are measured as an average glyph"""
+    widths = _WIDTHS[font]
+    return sum(widths[ord(char) - 32] if 32 <= ord(char) <= 126 else 556 for char in text) * size / 1000
+
+
+def wrap(text: str, font: str, size: float, width: float) -> List[str]:
+    """Break text into lines no wider than width, at spaces"""
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and text_width(candidate, font, size) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _rgb(color: Color) -> str:
+    return " ".join(f"{channel / 255:.3f}" for channel in color)
+
+
+class PageCanvas:
+    """Drawing operations for one page, in PDF points from the bottom-left corner"""
+
+    def __init__(self):
+        self._ops: List[bytes] = []
+
+    def _op(self, operation: str) -> None:
+        self._ops.append(operation.encode("ascii"))
+
+    def text(
+        self, x: float, y: float, text: str, font: str, size: float, color: Color = (0, 0, 0), align: str = "left"
+    ) -> None:
+        """Draw one line of text with its baseline at y; x is the left, center or right edge per align"""
+        if align != "left":
+            width = text_width(text, font, size)
+            x -= width / 2 if align == "center" else width
+        self._op(f"BT /{FONTS[font]} {size:.2f} Tf {_rgb(color)} rg {x:.2f} {y:.2f} Td ")
+        self._ops.append(_pdf_string(text) + b" Tj ET")
+
+    def rotated_text(self, cx: float, cy: float, text: str, font: str, size: float, color: Color, angle: float) -> None:
+        """Draw text centred on (cx, cy), rotated counter-clockwise by angle degrees"""
+        cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        half = text_width(text, font, size) / 2
+        x, y = cx - half * cos + size * 0.35 * sin, cy - half * sin - size * 0.35 * cos
+        self._op(
+            f"BT /{FONTS[font]} {size:.2f} Tf {_rgb(color)} rg "
+            f"{cos:.4f} {sin:.4f} {-sin:.4f} {cos:.4f} {x:.2f} {y:.2f} Tm "
+        )
+        self._ops.append(_pdf_string(text) + b" Tj ET")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float, color: Color = (0, 0, 0)) -> None:
+        self._op(f"{width:.2f} w {_rgb(color)} RG {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+    def rect(
+        self, x: float, y: float, width: float, height: float,
+        fill: Optional[Color] = None, stroke: Optional[Color] = None, line_width: float = 1
+    ) -> None:
+        """Rectangle with its bottom-left corner at (x, y), filled and/or stroked"""
+        operation = f"{x:.2f} {y:.2f} {width:.2f} {height:.2f} re"
+        if fill is not None:
+            operation = f"{_rgb(fill)} rg " + operation
+        if stroke is not None:
+            operation = f"{line_width:.2f} w {_rgb(stroke)} RG " + operation
+        self._op(operation + (" B" if fill is not None and stroke is not None else " f" if fill is not None else " S"))
+
+    def content(self) -> bytes:
+        return b"\n".join(self._ops)
+
+
+def write_pdf(pages: List[PageCanvas]) -> bytes:
+    """Serialize pages as a PDF using the standard fonts, with compressed content streams"""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    page_tree = add(b"")
+    font_refs = " ".join(
+        f"/{resource} {add(f'<< /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>'.encode())} 0 R"
+        for font, resource in FONTS.items()
+    )
+    page_refs = []
+    for page in pages:
+        stream = zlib.compress(page.content())
+        contents = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_refs.append(add((
+            f"<< /Type /Page /Parent {page_tree} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << {font_refs} >> >> /Contents {contents} 0 R >>"
+        ).encode()))
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {page_tree} 0 R >>".encode()
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[page_tree - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(output)
+
+
+class NativeTheme(NamedTuple):
+    regular: str
+    bold: str
+    accent: Color
+    muted: Color
+    border_width: float
+    watermark: bool
+    panel: Optional[Color]
+
+
+# Fixed-layout counterparts of the stylesheets in app/templates/themes
+NATIVE_THEMES: Dict[str, NativeTheme] = {
+    "classic": NativeTheme("Times-Roman", "Times-Bold", (0x2c, 0x3e, 0x50), (0x66, 0x66, 0x66), 2.25, True, (0xf8, 0xf9, 0xfa)),
+    "minimal": NativeTheme("Helvetica", "Helvetica-Bold", (0x22, 0x22, 0x22), (0x55, 0x55, 0x55), 0.75, False, None),
+}
+
+CERTIFY_TEXT = (
+    "This is to certify that the above-named shareholder is the registered owner of the following shares in "
+    "{company_name}, a company duly incorporated and existing under the laws of the jurisdiction in which it operates."
+)
+ISSUED_TEXT = (
+    "This certificate is issued in accordance with the company's articles of incorporation and bylaws. "
+    "The shares represented by this certificate are fully paid and non-assessable."
+)
+FOOTER_TEXT = (
+    "This certificate is computer-generated and is valid without a physical signature when issued "
+    "through the company's authorized system."
+)
+
+
+def draw_certificate(fields: Dict[str, str], theme: str) -> PageCanvas:
+    """Lay out one share certificate page from the values PDFCertificateGenerator prints"""
+    style = NATIVE_THEMES.get(theme, NATIVE_THEMES["classic"])
+    page = PageCanvas()
+    margin, padding = 56.69, 30
+    left, right = margin + padding, PAGE_WIDTH - margin - padding
+    width, center = right - left, PAGE_WIDTH / 2
+    ink = (0x33, 0x33, 0x33)
+
+    page.rect(margin, margin, PAGE_WIDTH - 2 * margin, PAGE_HEIGHT - 2 * margin, stroke=style.accent, line_width=style.border_width)
+    if style.watermark:
+        page.rotated_text(center, PAGE_HEIGHT / 2, "CERTIFICATE", style.bold, 90, (0xf3, 0xf3, 0xf3), 45)
+
+    y = PAGE_HEIGHT - margin - padding - 21
+    page.text(center, y, fields["company_name"], style.bold, 21, style.accent, align="center")
+    y -= 8
+    for detail in (fields["company_address"], f"Email: {fields['company_email']}", f"Website: {fields['company_website']}"):
+        y -= 14
+        page.text(center, y, detail, style.regular, 10.5, style.muted, align="center")
+    y -= 14
+    page.line(left, y, right, y, 1.5, style.accent)
+
+    y -= 30
+    page.text(right, y, f"Certificate Number: {fields['certificate_number']}", style.regular, 10.5, style.muted, align="right")
+    y -= 40
+    page.text(center, y, "SHARE CERTIFICATE", style.bold, 18, style.accent, align="center")
+    y -= 45
+    page.text(left, y, fields["shareholder_name"], style.bold, 13.5, style.accent)
+    y -= 10
+    for line in wrap(CERTIFY_TEXT.format(company_name=fields["company_name"]), style.regular, 12, width):
+        y -= 18
+        page.text(left, y, line, style.regular, 12, ink)
+
+    rows = (
+        ("Number of Shares:", fields["number_of_shares"]),
+        ("Price per Share:", f"${fields['price_per_share']}"),
+        ("Total Value:", f"${fields['total_value']}"),
+        ("Issuance Date:", fields["issuance_date"]),
+    )
+    y -= 24
+    panel_height = len(rows) * 20 + 20
+    if style.panel is not None:
+        page.rect(left, y - panel_height, width, panel_height, fill=style.panel)
+        page.rect(left, y - panel_height, 3, panel_height, fill=style.accent)
+    else:
+        page.line(left, y, right, y, 0.75, (0xcc, 0xcc, 0xcc))
+        page.line(left, y - panel_height, right, y - panel_height, 0.75, (0xcc, 0xcc, 0xcc))
+    row_y = y - 10
+    for label, value in rows:
+        row_y -= 15
+        page.text(left + 15, row_y, label, style.bold, 12, style.accent)
+        page.text(right - 15, row_y, value, style.regular, 12, ink, align="right")
+        row_y -= 5
+    y -= panel_height + 6
+
+    for line in wrap(ISSUED_TEXT, style.regular, 12, width):
+        y -= 18
+        page.text(left, y, line, style.regular, 12, ink)
+
+    y -= 70
+    box = width * 0.45
+    for x, title in ((left, "Authorized Signature"), (right - box, "Company Seal")):
+        page.line(x, y, x + box, y, 0.75, ink)
+        page.text(x + box / 2, y - 16, title, style.regular, 10.5, style.muted, align="center")
+
+    footer_lines = wrap(FOOTER_TEXT, style.regular, 9, width) + [f"{fields['generated_label']}: {fields['generated_at']}"]
+    y = margin + padding + len(footer_lines) * 13
+    page.line(left, y + 12, right, y + 12, 0.75, (0xdd, 0xdd, 0xdd))
+    for line in footer_lines:
+        page.text(center, y, line, style.regular, 9, style.muted, align="center")
+        y -= 13
+    return page
+
+
+def certificate_pdf(pages: List[Tuple[Dict[str, str], str]]) -> bytes:
+    """Write (fields, theme) certificates as one PDF, one page each"""
+    return write_pdf([draw_certificate(fields, theme) for fields, theme in pages])
@@ -0,0 +1,30 @@
+import base64
+import json
+from typing import Optional
+from fastapi import Request, Response
+
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor holding the sort key of the last row on a page"""
+    payload = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Return the values packed by encode_cursor, or raise ValueError"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def set_next_page(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """Advertise the next page in X-Next-Cursor and a rel="next" Link header"""
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = next_cursor
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
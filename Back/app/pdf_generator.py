@@ -1,245 +1,138 @@
-from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration
+import hashlib
+import json
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 from app.models import ShareIssuance, ShareholderProfile
 from app.config import settings
+from app.certificate_templates import CertificateTemplate, get_template
+from app import native_pdf
+
+# "weasyprint" renders the HTML template; "native" writes the fixed layout in app/native_pdf.py
+BACKENDS = ("weasyprint", "native")
+
+# Font discovery is expensive, so every render in a process shares one configuration
+_font_config = None
+
+
+def shared_font_config():
+    global _font_config
+    if _font_config is None:
+        # Imported on first use so the native backend never loads WeasyPrint
+        from weasyprint.text.fonts import FontConfiguration
+        _font_config = FontConfiguration()
+    return _font_config
 
 
 class PDFCertificateGenerator:
-    def __init__(self):
-        self.font_config = FontConfiguration()
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend or settings.certificate_backend
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown certificate backend: {self.backend}")
         self.company_name = settings.company_name
         self.company_address = settings.company_address
         self.company_email = settings.company_email
         self.company_website = settings.company_website
+        self.deterministic = settings.certificate_deterministic
+
+    def generated_at(self, issuance: ShareIssuance) -> datetime:
+        """Timestamp printed in the footer; fixed per issuance in deterministic mode"""
+        if self.deterministic:
+            return issuance.created_at or issuance.issuance_date
+        return datetime.now()
+
+    def template_for(self, issuance: ShareIssuance) -> CertificateTemplate:
+        """Compiled template for the issuance's theme, or the default theme"""
+        return get_template(getattr(issuance, "certificate_theme", None))
+
+    def cache_key(self, issuance: ShareIssuance, shareholder: ShareholderProfile) -> str:
+        """Key that changes whenever anything printed on the certificate changes"""
+        template = self.template_for(issuance)
+        printed = [
+            self.backend,
+            template.theme,
+            template.version,
+            issuance.certificate_number,
+            issuance.number_of_shares,
+            issuance.price_per_share,
+            issuance.total_value,
+            issuance.issuance_date.isoformat(),
+            self.generated_at(issuance).isoformat(),
+            shareholder.first_name,
+            shareholder.last_name,
+            self.company_name,
+            self.company_address,
+            self.company_email,
+            self.company_website,
+        ]
+        fingerprint = hashlib.sha256(json.dumps(printed).encode()).hexdigest()[:24]
+        # The cache keeps one render per issuance and backend, grouped by everything before the fingerprint
+        return f"{issuance.id}-{self.backend}-{fingerprint}"
+
+    def certificate_fields(
+        self, issuance: ShareIssuance, shareholder: ShareholderProfile, generated_at: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """Values printed on the certificate, formatted for the template"""
+        generated_is_default = generated_at is None
+        generated_at = generated_at or self.generated_at(issuance)
+        return {
+            "company_name": self.company_name,
+            "company_address": self.company_address,
+            "company_email": self.company_email,
+            "company_website": self.company_website,
+            "certificate_number": issuance.certificate_number,
+            "shareholder_name": f"{shareholder.first_name} {shareholder.last_name}",
+            "number_of_shares": f"{issuance.number_of_shares:,}",
+            "price_per_share": f"{issuance.price_per_share:,.2f}",
+            "total_value": f"{issuance.total_value:,.2f}",
+            "issuance_date": issuance.issuance_date.strftime("%B %d, %Y"),
+            # The deterministic timestamp is when the issuance was recorded, not when this copy was rendered
+            "generated_label": "Recorded on" if self.deterministic and generated_is_default else "Generated on",
+            "generated_at": generated_at.strftime("%B %d, %Y at %I:%M %p"),
+        }
 
-    def generate_certificate_html(self, issuance: ShareIssuance, shareholder: ShareholderProfile) -> str:
-        """Generate HTML content for the share certificate"""
-        issuance_date = issuance.issuance_date.strftime("%B %d, %Y")
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Share Certificate</title>
-            <style>
-                @page {{
-                    size: A4;
-                    margin: 2cm;
-                }}
-                body {{
-                    font-family: 'Times New Roman', serif;
-                    line-height: 1.6;
-                    color: #333;
-                    background: linear-gradient(45deg, #f8f9fa 25%, transparent 25%), 
-                                linear-gradient(-45deg, #f8f9fa 25%, transparent 25%), 
-                                linear-gradient(45deg, transparent 75%, #f8f9fa 75%), 
-                                linear-gradient(-45deg, transparent 75%, #f8f9fa 75%);
-                    background-size: 20px 20px;
-                    background-position: 0 0, 0 10px, 10px -10px, -10px 0px;
-                }}
-                .certificate {{
-                    background: white;
-                    padding: 40px;
-                    border: 3px solid #2c3e50;
-                    border-radius: 10px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-                    position: relative;
-                    min-height: 600px;
-                }}
-                .watermark {{
-                    position: absolute;
-                    top: 50%;
-                    left: 50%;
-                    transform: translate(-50%, -50%) rotate(-45deg);
-                    font-size: 120px;
-                    color: rgba(0,0,0,0.05);
-                    font-weight: bold;
-                    z-index: 1;
-                    pointer-events: none;
-                }}
-                .content {{
-                    position: relative;
-                    z-index: 2;
-                }}
-                .header {{
-                    text-align: center;
-                    border-bottom: 2px solid #2c3e50;
-                    padding-bottom: 20px;
-                    margin-bottom: 30px;
-                }}
-                .company-name {{
-                    font-size: 28px;
-                    font-weight: bold;
-                    color: #2c3e50;
-                    margin-bottom: 10px;
-                }}
-                .company-details {{
-                    font-size: 14px;
-                    color: #666;
-                    margin-bottom: 5px;
-                }}
-                .certificate-title {{
-                    font-size: 24px;
-                    font-weight: bold;
-                    text-align: center;
-                    margin: 30px 0;
-                    color: #2c3e50;
-                }}
-                .certificate-number {{
-                    text-align: right;
-                    font-size: 14px;
-                    color: #666;
-                    margin-bottom: 20px;
-                }}
-                .main-content {{
-                    margin: 30px 0;
-                    line-height: 2;
-                }}
-                .shareholder-name {{
-                    font-size: 18px;
-                    font-weight: bold;
-                    color: #2c3e50;
-                    margin-bottom: 20px;
-                }}
-                .certificate-text {{
-                    font-size: 16px;
-                    text-align: justify;
-                    margin-bottom: 30px;
-                }}
-                .share-details {{
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-left: 4px solid #2c3e50;
-                    margin: 20px 0;
-                }}
-                .detail-row {{
-                    display: flex;
-                    justify-content: space-between;
-                    margin-bottom: 10px;
-                }}
-                .detail-label {{
-                    font-weight: bold;
-                    color: #2c3e50;
-                }}
-                .detail-value {{
-                    color: #333;
-                }}
-                .signature-section {{
-                    margin-top: 50px;
-                    display: flex;
-                    justify-content: space-between;
-                }}
-                .signature-box {{
-                    text-align: center;
-                    width: 45%;
-                }}
-                .signature-line {{
-                    border-top: 1px solid #333;
-                    margin-top: 50px;
-                    margin-bottom: 10px;
-                }}
-                .signature-title {{
-                    font-size: 14px;
-                    color: #666;
-                }}
-                .footer {{
-                    margin-top: 40px;
-                    text-align: center;
-                    font-size: 12px;
-                    color: #666;
-                    border-top: 1px solid #ddd;
-                    padding-top: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="certificate">
-                <div class="watermark">CERTIFICATE</div>
-                <div class="content">
-                    <div class="header">
-                        <div class="company-name">{self.company_name}</div>
-                        <div class="company-details">{self.company_address}</div>
-                        <div class="company-details">Email: {self.company_email}</div>
-                        <div class="company-details">Website: {self.company_website}</div>
-                    </div>
-                    
-                    <div class="certificate-number">
-                        Certificate Number: {issuance.certificate_number}
-                    </div>
-                    
-                    <div class="certificate-title">
-                        SHARE CERTIFICATE
-                    </div>
-                    
-                    <div class="main-content">
-                        <div class="shareholder-name">
-                            {shareholder.first_name} {shareholder.last_name}
-                        </div>
-                        
-                        <div class="certificate-text">
-                            This is to certify that the above-named shareholder is the registered owner of the following shares in {self.company_name}, a company duly incorporated and existing under the laws of the jurisdiction in which it operates.
-                        </div>
-                        
-                        <div class="share-details">
-                            <div class="detail-row">
-                                <span class="detail-label">Number of Shares:</span>
-                                <span class="detail-value">{issuance.number_of_shares:,}</span>
-                            </div>
-                            <div class="detail-row">
-                                <span class="detail-label">Price per Share:</span>
-                                <span class="detail-value">${issuance.price_per_share:,.2f}</span>
-                            </div>
-                            <div class="detail-row">
-                                <span class="detail-label">Total Value:</span>
-                                <span class="detail-value">${issuance.total_value:,.2f}</span>
-                            </div>
-                            <div class="detail-row">
-                                <span class="detail-label">Issuance Date:</span>
-                                <span class="detail-value">{issuance_date}</span>
-                            </div>
-                        </div>
-                        
-                        <div class="certificate-text">
-                            This certificate is issued in accordance with the company's articles of incorporation and bylaws. The shares represented by this certificate are fully paid and non-assessable.
-                        </div>
-                    </div>
-                    
-                    <div class="signature-section">
-                        <div class="signature-box">
-                            <div class="signature-line"></div>
-                            <div class="signature-title">Authorized Signature</div>
-                        </div>
-                        <div class="signature-box">
-                            <div class="signature-line"></div>
-                            <div class="signature-title">Company Seal</div>
-                        </div>
-                    </div>
-                    
-                    <div class="footer">
-                        <p>This certificate is computer-generated and is valid without a physical signature when issued through the company's authorized system.</p>
-                        <p>Generated on: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}</p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return html_content
+    def generate_certificate_html(
+        self, issuance: ShareIssuance, shareholder: ShareholderProfile, generated_at: Optional[datetime] = None
+    ) -> str:
+        """Generate standalone HTML for the share certificate, with its stylesheet inlined"""
+        fields = self.certificate_fields(issuance, shareholder, generated_at)
+        return self.template_for(issuance).render_html(fields, inline_css=True)
+
+    def _html_document(self, issuance: ShareIssuance, shareholder: ShareholderProfile):
+        from weasyprint import HTML
+        template = self.template_for(issuance)
+        html_doc = HTML(string=template.render_html(self.certificate_fields(issuance, shareholder)))
+        return html_doc, template.stylesheet(shared_font_config())
+
+    def _native_page(self, issuance: ShareIssuance, shareholder: ShareholderProfile) -> Tuple[Dict[str, str], str]:
+        return self.certificate_fields(issuance, shareholder), self.template_for(issuance).theme
 
     def generate_certificate_pdf(self, issuance: ShareIssuance, shareholder: ShareholderProfile) -> bytes:
         """Generate PDF certificate for a share issuance"""
-        html_content = self.generate_certificate_html(issuance, shareholder)
-        
-        # Create HTML document
-        html_doc = HTML(string=html_content)
-        
+        if self.backend == "native":
+            return native_pdf.certificate_pdf([self._native_page(issuance, shareholder)])
+
+        # The stylesheet was parsed once for this theme; only the markup is new
+        html_doc, stylesheet = self._html_document(issuance, shareholder)
+
         # Generate PDF
         pdf_bytes = html_doc.write_pdf(
-            font_config=self.font_config,
+            stylesheets=[stylesheet],
+            font_config=shared_font_config(),
             optimize_images=True
         )
-        
-        return pdf_bytes 
\ No newline at end of file
+
+        return pdf_bytes
+
+    def generate_merged_pdf(self, certificates: Iterable[Tuple[ShareIssuance, ShareholderProfile]]) -> bytes:
+        """Generate one PDF with the pages of several certificates"""
+        if self.backend == "native":
+            return native_pdf.certificate_pdf([self._native_page(*certificate) for certificate in certificates])
+
+        documents = []
+        for issuance, shareholder in certificates:
+            html_doc, stylesheet = self._html_document(issuance, shareholder)
+            documents.append(
+                html_doc.render(stylesheets=[stylesheet], font_config=shared_font_config(), optimize_images=True)
+            )
+        pages = [page for document in documents for page in document.pages]
+        return documents[0].copy(pages).write_pdf()
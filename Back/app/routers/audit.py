@@ -1,20 +1,94 @@
-from typing import List
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.auth import get_current_admin_user
-from app.models import User
-from app.schemas import AuditEventResponse
+from app.schemas import Principal, AuditEventResponse
 from app.services import AuditService
+from app.models import AuditAction
+from app.pagination import set_next_page
+from app.serialization import fast_path, fast_response
+from app.streaming import (
+    ndjson_chunks, csv_chunks, ndjson_response, on_own_session, wants_ndjson, NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE
+)
 
 router = APIRouter(prefix="/api/audit", tags=["audit"])
 
 
 @router.get("/", response_model=List[AuditEventResponse])
 async def get_audit_logs(
+    request: Request,
+    response: Response,
     limit: int = Query(100, ge=1, le=1000, description="Number of audit logs to return"),
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    action: Optional[AuditAction] = Query(None, description="Only return events of this action"),
+    user_id: Optional[int] = Query(None, description="Only return events by this user"),
+    since: Optional[datetime] = Query(None, description="Only return events at or after this timestamp"),
+    until: Optional[datetime] = Query(None, description="Only return events before this timestamp"),
+    stream: bool = Query(False, description="Stream every match as NDJSON, oldest first, instead of one page"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get audit logs (Admin only)"""
-    return AuditService.get_audit_logs(db, limit=limit) 
\ No newline at end of file
+    """Get audit logs, newest first (Admin only)
+
+    When more events match, the cursor for the next page is returned in the
+    X-Next-Cursor header and as a rel="next" Link. Streaming returns every
+    match in export order instead.
+    """
+    if wants_ndjson(request, stream):
+        return ndjson_response(
+            on_own_session(
+                db, AuditService.stream_audit_events_async, action=action, user_id=user_id, since=since, until=until
+            ),
+            AuditEventResponse
+        )
+    
+    try:
+        events, next_cursor = await AuditService.get_audit_log_page_async(
+            db,
+            limit=limit,
+            cursor=cursor,
+            action=action,
+            user_id=user_id,
+            since=since,
+            until=until
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    set_next_page(request, response, next_cursor)
+    if fast_path(request):
+        return fast_response(request, response, events, AuditEventResponse)
+    return events
+
+
+@router.get("/export")
+async def export_audit_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    action: Optional[AuditAction] = Query(None, description="Only export events of this action"),
+    user_id: Optional[int] = Query(None, description="Only export events by this user"),
+    since: Optional[datetime] = Query(None, description="Only export events at or after this timestamp"),
+    until: Optional[datetime] = Query(None, description="Only export events before this timestamp"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream the full audit log, oldest first (Admin only)"""
+    rows = on_own_session(
+        db, AuditService.stream_audit_events_async, action=action, user_id=user_id, since=since, until=until
+    )
+    if format == "csv":
+        body, media_type = csv_chunks(rows, AuditService.EXPORT_COLUMNS), CSV_MEDIA_TYPE
+    else:
+        body, media_type = ndjson_chunks(rows), NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=audit_log.{format}"
+        }
+    )
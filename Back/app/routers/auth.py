@@ -1,9 +1,9 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.auth import authenticate_user, create_access_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.auth import authenticate_user_async, create_access_token
 from app.schemas import Token, LoginRequest
 from app.services import AuditService
 from app.models import AuditAction
@@ -15,11 +15,11 @@ router = APIRouter(prefix="/api", tags=["authentication"])
 @router.post("/token/", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     request: Request = None
 ):
     """Login endpoint to get JWT access token"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,7 +28,7 @@ async def login_for_access_token(
         )
     
     # Log login event
-    AuditService.log_event(
+    await AuditService.log_event_async(
         db=db,
         user_id=user.id,
         action=AuditAction.LOGIN,
@@ -47,11 +47,11 @@ async def login_for_access_token(
 @router.post("/login/", response_model=Token)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     request: Request = None
 ):
     """Alternative login endpoint using JSON body"""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,7 +60,7 @@ async def login(
         )
     
     # Log login event
-    AuditService.log_event(
+    await AuditService.log_event_async(
         db=db,
         user_id=user.id,
         action=AuditAction.LOGIN,
@@ -1,28 +1,57 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.auth import get_current_admin_user
-from app.models import User
-from app.schemas import DashboardStats, OwnershipDistribution
-from app.services import DashboardService
+from app.schemas import Principal, DashboardStats, OwnershipDistribution, CapTableDiffEntry
+from app.services import DashboardService, CapTableHistoryService
+from app.cache import dashboard_cache
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard statistics (Admin only)"""
-    return DashboardService.get_dashboard_stats(db)
+    return await dashboard_cache.get_or_compute(
+        "stats", lambda: DashboardService.get_dashboard_stats_async(db)
+    )
 
 
 @router.get("/ownership-distribution", response_model=List[OwnershipDistribution])
 async def get_ownership_distribution(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    as_of: Optional[datetime] = Query(None, description="Return the distribution as of this UTC timestamp"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get ownership distribution for pie chart (Admin only)"""
-    return DashboardService.get_ownership_distribution(db) 
\ No newline at end of file
+    if as_of is not None:
+        as_of = CapTableHistoryService.normalize(as_of)
+        return await dashboard_cache.get_or_compute(
+            ("ownership-distribution", as_of),
+            lambda: CapTableHistoryService.get_ownership_distribution_as_of_async(db, as_of)
+        )
+    return await dashboard_cache.get_or_compute(
+        "ownership-distribution", lambda: DashboardService.get_ownership_distribution_async(db)
+    )
+
+
+@router.get("/cap-table-diff", response_model=List[CapTableDiffEntry])
+async def get_cap_table_diff(
+    from_date: datetime = Query(..., description="Start of the range (UTC, exclusive)"),
+    to_date: datetime = Query(..., description="End of the range (UTC, inclusive)"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get per-shareholder share changes between two dates (Admin only)"""
+    try:
+        return await CapTableHistoryService.get_diff_async(db, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
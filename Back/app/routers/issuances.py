@@ -1,50 +1,124 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.auth import get_current_admin_user, get_current_shareholder_user
-from app.models import User
-from app.schemas import ShareIssuanceCreate, ShareIssuanceResponse
-from app.services import ShareIssuanceService, AuditService
+from app.schemas import Principal, ShareIssuanceCreate, ShareIssuanceResponse, BulkIssuanceImportResult
+from app.services import ShareIssuanceService, AuditService, HoldingsService
 from app.models import AuditAction
 from app.pdf_generator import PDFCertificateGenerator
+from app.certificate_cache import certificate_cache
+from app.certificate_render_pool import certificate_render_pool, RenderPoolFull
+from app.certificate_batch import ZIP_MEDIA_TYPE, render_certificates, zip_chunks, collect_jobs, render_merged
+from app.config import settings
+from app.bulk_import import detect_format, iter_records, text_lines
+from app.pagination import set_next_page
+from app.etag import make_etag, etag_matches, set_etag, not_modified
+from app.serialization import fast_path, fast_response, representation, schema_fields
+from app.streaming import wants_ndjson, on_own_session, ndjson_response
 from io import BytesIO
 
 router = APIRouter(prefix="/api/issuances", tags=["issuances"])
 
 
+SORT_PATTERN = "^-?(issuance_date|number_of_shares|total_value|id)$"
+
+
+async def _issuance_page(request: Request, response: Response, db: AsyncSession, stream: bool, limit: int, **filters):
+    try:
+        if wants_ndjson(request, stream):
+            # Validate the sort and cursor before the response starts
+            ShareIssuanceService.issuance_query(**filters)
+            return ndjson_response(
+                on_own_session(db, ShareIssuanceService.stream_issuances_async, **filters), ShareIssuanceResponse
+            )
+        # The version moves with every write to the listed issuances, so a match skips the page query
+        version = await HoldingsService.get_version_async(db, filters["shareholder_id"])
+        etag = make_etag(
+            "issuances", filters["shareholder_id"], version, representation(request), str(request.query_params)
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        fast = fast_path(request)
+        issuances, next_cursor = await ShareIssuanceService.get_issuance_page_async(
+            db, limit=limit, columns=schema_fields(ShareIssuanceResponse) if fast else None, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    set_etag(response, etag)
+    set_next_page(request, response, next_cursor)
+    if fast:
+        return fast_response(request, response, issuances, ShareIssuanceResponse)
+    return issuances
+
+
 @router.get("/", response_model=List[ShareIssuanceResponse])
 async def get_issuances(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of issuances to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    sort: str = Query("-issuance_date", pattern=SORT_PATTERN, description="Sort key; prefix with - for descending"),
+    shareholder_id: Optional[int] = Query(None, description="Only return issuances to this shareholder"),
+    since: Optional[datetime] = Query(None, description="Only return issuances on or after this date"),
+    until: Optional[datetime] = Query(None, description="Only return issuances before this date"),
+    min_shares: Optional[int] = Query(None, ge=0, description="Only return issuances of at least this many shares"),
+    certificate_prefix: Optional[str] = Query(None, description="Only return certificates starting with this prefix"),
+    stream: bool = Query(False, description="Stream every match as NDJSON instead of one page"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all share issuances (Admin only)"""
-    return ShareIssuanceService.get_all_issuances(db)
+    """Get share issuances, one page at a time (Admin only)"""
+    return await _issuance_page(
+        request, response, db, stream,
+        limit=limit, cursor=cursor, sort=sort, shareholder_id=shareholder_id, since=since, until=until,
+        min_shares=min_shares, certificate_prefix=certificate_prefix
+    )
 
 
 @router.get("/my", response_model=List[ShareIssuanceResponse])
 async def get_my_issuances(
-    current_user: User = Depends(get_current_shareholder_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Number of issuances to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    sort: str = Query("-issuance_date", pattern=SORT_PATTERN, description="Sort key; prefix with - for descending"),
+    since: Optional[datetime] = Query(None, description="Only return issuances on or after this date"),
+    until: Optional[datetime] = Query(None, description="Only return issuances before this date"),
+    min_shares: Optional[int] = Query(None, ge=0, description="Only return issuances of at least this many shares"),
+    certificate_prefix: Optional[str] = Query(None, description="Only return certificates starting with this prefix"),
+    stream: bool = Query(False, description="Stream every match as NDJSON instead of one page"),
+    current_user: Principal = Depends(get_current_shareholder_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get current shareholder's issuances"""
-    return ShareIssuanceService.get_shareholder_issuances(db, current_user.id)
+    """Get current shareholder's issuances, one page at a time"""
+    if current_user.shareholder_profile_id is None:
+        return []
+    return await _issuance_page(
+        request, response, db, stream,
+        limit=limit, cursor=cursor, sort=sort, shareholder_id=current_user.shareholder_profile_id,
+        since=since, until=until, min_shares=min_shares, certificate_prefix=certificate_prefix
+    )
 
 
 @router.post("/", response_model=ShareIssuanceResponse)
 async def create_issuance(
     issuance_data: ShareIssuanceCreate,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
     request: Request = None
 ):
     """Create a new share issuance (Admin only)"""
     try:
-        issuance = ShareIssuanceService.create_issuance(db, issuance_data)
+        issuance = await ShareIssuanceService.create_issuance_async(db, issuance_data)
         
         # Log the event
-        AuditService.log_event(
+        await AuditService.log_event_async(
             db=db,
             user_id=current_user.id,
             action=AuditAction.SHARE_ISSUANCE,
@@ -66,14 +140,138 @@ async def create_issuance(
         )
 
 
+@router.post("/bulk", response_model=BulkIssuanceImportResult)
+async def bulk_import_issuances(
+    file: UploadFile = File(..., description="Issuance ledger as CSV or JSON lines"),
+    format: Optional[str] = Query(None, description="csv or jsonl; detected from the upload when omitted"),
+    allow_partial: bool = Query(False, description="Import the valid rows and report the invalid ones"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+    request: Request = None
+):
+    """Import many share issuances in a single transaction (Admin only)"""
+    try:
+        fmt = detect_format(file.filename, file.content_type, format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    result = await ShareIssuanceService.bulk_import_async(
+        db, iter_records(text_lines(file.file), fmt), allow_partial=allow_partial
+    )
+    if result["errors"] and not allow_partial:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Import rejected; no issuances were created", **result}
+        )
+    
+    if result["imported"]:
+        # One summary event for the whole batch
+        await AuditService.log_event_async(
+            db=db,
+            user_id=current_user.id,
+            action=AuditAction.SHARE_ISSUANCE,
+            details=(
+                f"Bulk imported {result['imported']} issuances totalling {result['total_shares']} shares "
+                f"({result['failed']} rows rejected)"
+            ),
+            ip_address=request.client.host if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+            durable=True
+        )
+    
+    return result
+
+
+async def _certificate_response(request: Request, issuance, shareholder, backend: Optional[str] = None) -> Response:
+    """Serve a certificate from the disk cache, rendering it on the render pool on a miss"""
+    pdf_generator = PDFCertificateGenerator(backend)
+    key = pdf_generator.cache_key(issuance, shareholder)
+    # The cache key covers everything printed, so it doubles as the ETag
+    etag = make_etag(key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    try:
+        pdf_bytes, cached = await certificate_cache.get_or_render_async(
+            key,
+            lambda: certificate_render_pool.render(issuance, shareholder, pdf_generator.backend, key)
+        )
+    except RenderPoolFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Certificate rendering is at capacity; retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    # Return PDF as streaming response
+    response = StreamingResponse(
+        BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=certificate_{issuance.certificate_number}.pdf",
+            "X-Certificate-Cache": "hit" if cached else "miss"
+        }
+    )
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/certificates/batch")
+async def get_certificate_batch(
+    format: str = Query("zip", pattern="^(zip|pdf)$", description="zip for one file per certificate, pdf to merge them"),
+    shareholder_id: Optional[int] = Query(None, description="Only include issuances to this shareholder"),
+    since: Optional[datetime] = Query(None, description="Only include issuances on or after this date"),
+    until: Optional[datetime] = Query(None, description="Only include issuances before this date"),
+    backend: Optional[str] = Query(None, pattern="^(weasyprint|native)$", description="PDF backend; defaults to the deployment setting"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Render certificates for every matching issuance across the process pool (Admin only)"""
+    filters = {"shareholder_id": shareholder_id, "since": since, "until": until}
+    if format == "zip":
+        documents = render_certificates(
+            on_own_session(db, ShareIssuanceService.stream_certificate_rows_async, **filters),
+            backend
+        )
+        return StreamingResponse(
+            zip_chunks(documents),
+            media_type=ZIP_MEDIA_TYPE,
+            headers={"Content-Disposition": "attachment; filename=certificates.zip"}
+        )
+    
+    # A merged PDF is only complete once every page is laid out, so it is built in one go
+    limit = settings.certificate_merge_limit
+    jobs = await collect_jobs(ShareIssuanceService.stream_certificate_rows_async(db, **filters), limit)
+    if not jobs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No issuances match"
+        )
+    if len(jobs) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Merged PDFs are limited to {limit} certificates; use format=zip"
+        )
+    pdf_bytes = await render_merged(jobs, backend)
+    return StreamingResponse(
+        BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=certificates.pdf"}
+    )
+
+
 @router.get("/{issuance_id}/certificate/")
 async def get_certificate(
+    request: Request,
     issuance_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    backend: Optional[str] = Query(None, pattern="^(weasyprint|native)$", description="PDF backend; defaults to the deployment setting"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate PDF certificate for a share issuance (Admin only)"""
-    issuance = ShareIssuanceService.get_issuance_by_id(db, issuance_id)
+    issuance = await ShareIssuanceService.get_issuance_by_id_async(db, issuance_id)
     if not issuance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,10 +279,8 @@ async def get_certificate(
         )
     
     # Get shareholder details
-    from app.models import ShareholderProfile
-    shareholder = db.query(ShareholderProfile).filter(
-        ShareholderProfile.id == issuance.shareholder_id
-    ).first()
+    from app.services import ShareholderService
+    shareholder = await ShareholderService.get_shareholder_by_id_async(db, issuance.shareholder_id)
     
     if not shareholder:
         raise HTTPException(
@@ -92,59 +288,40 @@ async def get_certificate(
             detail="Shareholder not found"
         )
     
-    # Generate PDF
-    pdf_generator = PDFCertificateGenerator()
-    pdf_bytes = pdf_generator.generate_certificate_pdf(issuance, shareholder)
-    
-    # Return PDF as streaming response
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=certificate_{issuance.certificate_number}.pdf"
-        }
-    )
+    return await _certificate_response(request, issuance, shareholder, backend)
 
 
 @router.get("/{issuance_id}/certificate/my/")
 async def get_my_certificate(
+    request: Request,
     issuance_id: int,
-    current_user: User = Depends(get_current_shareholder_user),
-    db: Session = Depends(get_db)
+    backend: Optional[str] = Query(None, pattern="^(weasyprint|native)$", description="PDF backend; defaults to the deployment setting"),
+    current_user: Principal = Depends(get_current_shareholder_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate PDF certificate for current shareholder's issuance"""
-    # Get shareholder profile
-    from app.services import ShareholderService
-    shareholder = ShareholderService.get_shareholder_by_user_id(db, current_user.id)
-    if not shareholder:
+    # The principal already carries the shareholder profile ID
+    if current_user.shareholder_profile_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shareholder profile not found"
         )
     
     # Get issuance and verify ownership
-    issuance = ShareIssuanceService.get_issuance_by_id(db, issuance_id)
+    issuance = await ShareIssuanceService.get_issuance_by_id_async(db, issuance_id)
     if not issuance:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Issuance not found"
         )
     
-    if issuance.shareholder_id != shareholder.id:
+    if issuance.shareholder_id != current_user.shareholder_profile_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this certificate"
         )
     
-    # Generate PDF
-    pdf_generator = PDFCertificateGenerator()
-    pdf_bytes = pdf_generator.generate_certificate_pdf(issuance, shareholder)
+    from app.services import ShareholderService
+    shareholder = await ShareholderService.get_shareholder_by_id_async(db, current_user.shareholder_profile_id)
     
-    # Return PDF as streaming response
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=certificate_{issuance.certificate_number}.pdf"
-        }
-    ) 
\ No newline at end of file
+    return await _certificate_response(request, issuance, shareholder, backend) 
\ No newline at end of file
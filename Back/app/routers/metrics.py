@@ -0,0 +1,79 @@
+from typing import Dict
+from fastapi import APIRouter, Depends
+from app.auth import get_current_admin_user, password_hash_executor, principal_cache
+from app.cache import dashboard_cache
+from app.audit_sink import audit_sink
+from app.certificate_cache import certificate_cache
+from app.certificate_prerender import certificate_prerenderer
+from app.certificate_render_pool import certificate_render_pool
+from app.database import get_pool_stats
+from app.schemas import (
+    Principal, PoolStats, CacheStats, PasswordHashingStats, PrincipalCacheStats, AuditSinkStats,
+    CertificateCacheStats, CertificatePrerenderStats, CertificateRenderPoolStats
+)
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/pool", response_model=Dict[str, PoolStats])
+async def get_database_pool_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get connection pool checkout and wait statistics (Admin only)"""
+    return get_pool_stats()
+
+
+@router.get("/dashboard-cache", response_model=CacheStats)
+async def get_dashboard_cache_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get dashboard cache hit rate and recompute time (Admin only)"""
+    return dashboard_cache.stats()
+
+
+@router.get("/password-hashing", response_model=PasswordHashingStats)
+async def get_password_hashing_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get password hashing queue depth and latency (Admin only)"""
+    return password_hash_executor.stats()
+
+
+@router.get("/principal-cache", response_model=PrincipalCacheStats)
+async def get_principal_cache_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get authenticated principal cache hit rate (Admin only)"""
+    return principal_cache.stats()
+
+
+@router.get("/audit-sink", response_model=AuditSinkStats)
+async def get_audit_sink_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get write-behind audit buffer depth and flush counters (Admin only)"""
+    return audit_sink.stats()
+
+
+@router.get("/certificate-cache", response_model=CertificateCacheStats)
+async def get_certificate_cache_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get rendered certificate cache size and hit rate (Admin only)"""
+    return certificate_cache.stats()
+
+
+@router.get("/certificate-prerender", response_model=CertificatePrerenderStats)
+async def get_certificate_prerender_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get background certificate render queue depth and failures (Admin only)"""
+    return certificate_prerenderer.stats()
+
+
+@router.get("/certificate-render-pool", response_model=CertificateRenderPoolStats)
+async def get_certificate_render_pool_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """Get certificate download render slots, queue depth and rejections (Admin only)"""
+    return certificate_render_pool.stats()
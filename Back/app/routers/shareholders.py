@@ -1,42 +1,71 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from app.database import get_db
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.auth import get_current_admin_user, get_current_shareholder_user
-from app.models import User
 from app.schemas import (
+    Principal,
     ShareholderProfileCreate, 
     ShareholderProfileResponse, 
-    ShareholderWithShares
+    ShareholderWithShares,
+    BulkShareholderOnboardingResult
 )
-from app.services import ShareholderService, AuditService
+from app.services import ShareholderService, AuditService, CapTableHistoryService
 from app.models import AuditAction
+from app.bulk_import import detect_format, iter_records, text_lines
+from app.streaming import wants_ndjson, on_own_session, ndjson_response, single_batch
+from app.etag import make_etag, etag_matches, set_etag, not_modified
+from app.serialization import fast_path, fast_response, representation
 
 router = APIRouter(prefix="/api/shareholders", tags=["shareholders"])
 
 
 @router.get("/", response_model=List[ShareholderWithShares])
 async def get_all_shareholders(
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    as_of: Optional[datetime] = Query(None, description="Return totals as of this UTC timestamp"),
+    stream: bool = Query(False, description="Stream shareholders as NDJSON"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all shareholders with their total shares (Admin only)"""
-    return ShareholderService.get_all_shareholders_with_shares(db)
+    if not wants_ndjson(request, stream):
+        etag = make_etag(
+            "shareholders", *await ShareholderService.get_listing_version_async(db), as_of, representation(request)
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    if as_of is not None:
+        shareholders = await CapTableHistoryService.get_shareholders_as_of_async(db, as_of)
+        if wants_ndjson(request, stream):
+            return ndjson_response(single_batch(shareholders), ShareholderWithShares)
+    elif wants_ndjson(request, stream):
+        return ndjson_response(
+            on_own_session(db, ShareholderService.stream_shareholders_with_shares_async), ShareholderWithShares
+        )
+    else:
+        shareholders = await ShareholderService.get_all_shareholders_with_shares_async(db)
+    if fast_path(request):
+        return fast_response(request, response, shareholders, ShareholderWithShares)
+    return shareholders
 
 
 @router.post("/", response_model=ShareholderProfileResponse)
 async def create_shareholder(
     shareholder_data: ShareholderProfileCreate,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
     request: Request = None
 ):
     """Create a new shareholder (Admin only)"""
     try:
-        shareholder = ShareholderService.create_shareholder(db, shareholder_data)
+        shareholder = await ShareholderService.create_shareholder_async(db, shareholder_data)
         
         # Log the event
-        AuditService.log_event(
+        await AuditService.log_event_async(
             db=db,
             user_id=current_user.id,
             action=AuditAction.SHAREHOLDER_CREATED,
@@ -53,16 +82,65 @@ async def create_shareholder(
         )
 
 
+@router.post("/bulk", response_model=BulkShareholderOnboardingResult)
+async def bulk_onboard_shareholders(
+    file: UploadFile = File(..., description="Shareholders as CSV or JSON lines"),
+    format: Optional[str] = Query(None, description="csv or jsonl; detected from the upload when omitted"),
+    allow_partial: bool = Query(False, description="Create the valid shareholders and report the invalid ones"),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+    request: Request = None
+):
+    """Onboard many shareholders in a single transaction (Admin only)"""
+    try:
+        fmt = detect_format(file.filename, file.content_type, format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    result = await ShareholderService.bulk_onboard_async(
+        db, iter_records(text_lines(file.file), fmt), allow_partial=allow_partial
+    )
+    if result["errors"] and not allow_partial:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Onboarding rejected; no shareholders were created", **result}
+        )
+    
+    if result["imported"]:
+        await AuditService.log_event_async(
+            db=db,
+            user_id=current_user.id,
+            action=AuditAction.SHAREHOLDER_CREATED,
+            details=f"Bulk onboarded {result['imported']} shareholders ({result['failed']} rows rejected)",
+            ip_address=request.client.host if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+            durable=True
+        )
+    
+    return result
+
+
 @router.get("/me", response_model=ShareholderProfileResponse)
 async def get_my_profile(
-    current_user: User = Depends(get_current_shareholder_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_shareholder_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current shareholder's profile"""
-    shareholder = ShareholderService.get_shareholder_by_user_id(db, current_user.id)
+    shareholder = None
+    if current_user.shareholder_profile_id is not None:
+        shareholder = await ShareholderService.get_shareholder_by_id_async(db, current_user.shareholder_profile_id)
     if not shareholder:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shareholder profile not found"
         )
+    etag = make_etag("shareholder", shareholder.id, shareholder.created_at, shareholder.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return shareholder 
\ No newline at end of file
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional, List
 from datetime import datetime
-from app.models import UserRole, AuditAction
+from app.models import UserRole, AuditAction, CertificateStatus
+from app.certificate_templates import validate_theme
 
 
 # Base schemas
@@ -61,6 +62,7 @@ class ShareIssuanceBase(BaseSchema):
     number_of_shares: int
     price_per_share: float
     notes: Optional[str] = None
+    certificate_theme: Optional[str] = None
 
     @validator('number_of_shares')
     def validate_shares(cls, v):
@@ -78,6 +80,11 @@ class ShareIssuanceBase(BaseSchema):
 class ShareIssuanceCreate(ShareIssuanceBase):
     shareholder_id: int
 
+    @validator('certificate_theme')
+    def validate_certificate_theme(cls, v):
+        validate_theme(v)
+        return v
+
 
 class ShareIssuanceResponse(ShareIssuanceBase):
     id: int
@@ -85,10 +92,37 @@ class ShareIssuanceResponse(ShareIssuanceBase):
     total_value: float
     issuance_date: datetime
     certificate_number: str
+    certificate_status: Optional[CertificateStatus] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
 
+class ShareIssuanceImportRow(ShareIssuanceCreate):
+    issuance_date: Optional[datetime] = None
+    certificate_number: Optional[str] = None
+
+
+class BulkImportError(BaseSchema):
+    line: int
+    error: str
+
+
+class BulkIssuanceImportResult(BaseSchema):
+    received: int
+    imported: int
+    failed: int
+    total_shares: int
+    total_value: float
+    errors: List[BulkImportError] = []
+
+
+class BulkShareholderOnboardingResult(BaseSchema):
+    received: int
+    imported: int
+    failed: int
+    errors: List[BulkImportError] = []
+
+
 # Authentication schemas
 class Token(BaseSchema):
     access_token: str
@@ -99,6 +133,15 @@ class TokenData(BaseSchema):
     email: Optional[str] = None
 
 
+class Principal(BaseSchema):
+    """Authenticated caller as resolved from an access token"""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    shareholder_profile_id: Optional[int] = None
+
+
 class LoginRequest(BaseSchema):
     email: EmailStr
     password: str
@@ -126,4 +169,100 @@ class OwnershipDistribution(BaseSchema):
     shareholder_name: str
     shares: int
     percentage: float
-    value: float 
\ No newline at end of file
+    value: float 
+
+class CapTableDiffEntry(BaseSchema):
+    shareholder_id: int
+    shareholder_name: str
+    shares_from: int
+    shares_to: int
+    shares_change: int
+    value_from: float
+    value_to: float
+    value_change: float
+
+
+# Metrics schemas
+class PoolStats(BaseSchema):
+    pool_class: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    waiting: int
+    checkouts: int
+    timeouts: int
+    wait_time_total_ms: float
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
+
+
+class CacheStats(BaseSchema):
+    version: int
+    entries: int
+    hits: int
+    stale_hits: int
+    misses: int
+    hit_rate: float
+    recompute_time_total_ms: float
+    recompute_time_avg_ms: float
+    recompute_time_max_ms: float
+
+
+class PasswordHashingStats(BaseSchema):
+    workers: int
+    queue_depth: int
+    active: int
+    completed: int
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
+    hash_time_avg_ms: float
+    hash_time_max_ms: float
+
+
+class PrincipalCacheStats(BaseSchema):
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class AuditSinkStats(BaseSchema):
+    running: bool
+    buffered: int
+    written: int
+    batches: int
+    failures: int
+    dropped: int
+    flush_time_max_ms: float
+
+
+class CertificatePrerenderStats(BaseSchema):
+    running: bool
+    queued: int
+    rendered: int
+    retries: int
+    failed: int
+    dropped: int
+    render_time_max_ms: float
+
+
+class CertificateRenderPoolStats(BaseSchema):
+    processes: int
+    max_queue: int
+    running: int
+    queued: int
+    rendered: int
+    rejected: int
+    render_time_avg_ms: float
+
+
+class CertificateCacheStats(BaseSchema):
+    enabled: bool
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
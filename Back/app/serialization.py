@@ -0,0 +1,92 @@
+import json
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Type
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.config import settings
+from app.streaming import plain_value
+
+# Both encoders are optional; without them list responses use the regular schema path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+_fields: Dict[Type[BaseModel], Tuple[str, ...]] = {}
+
+
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names of a response schema, in declaration order"""
+    if schema not in _fields:
+        _fields[schema] = tuple(schema.model_fields)
+    return _fields[schema]
+
+
+def plain_rows(rows: Iterable[Any], schema: Type[BaseModel]) -> List[dict]:
+    """Pick the schema's fields out of ORM objects, result rows or dicts without validating them"""
+    fields = schema_fields(schema)
+    rows = list(rows)
+    if not rows:
+        return []
+    first = rows[0]
+    if isinstance(first, Mapping):
+        return [{field: row[field] for field in fields} for row in rows]
+    if tuple(getattr(first, "_fields", ())) == fields:
+        # Result rows selected in schema order zip straight into records
+        return [dict(zip(fields, row)) for row in rows]
+    values = attrgetter(*fields)
+    return [dict(zip(fields, values(row))) for row in rows]
+
+
+def encode_json(rows: List[dict]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rows, option=orjson.OPT_UTC_Z)
+    return json.dumps(rows, default=plain_value, separators=(",", ":")).encode()
+
+
+def encode_msgpack(rows: List[dict]) -> bytes:
+    return msgpack.packb(rows, default=plain_value)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client asked for MessagePack and it can be served"""
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def representation(request: Request) -> str:
+    """Which encoding a list request will get, for ETags that must differ per encoding"""
+    if wants_msgpack(request):
+        return "msgpack"
+    return "fast-json" if settings.fast_serialization else "json"
+
+
+def fast_path(request: Request) -> bool:
+    """Whether a list request skips the response schema: FAST_SERIALIZATION is on or MessagePack was asked for"""
+    return settings.fast_serialization or wants_msgpack(request)
+
+
+def fast_response(request: Request, response: Response, rows: Iterable[Any], schema: Type[BaseModel]) -> Response:
+    """Encode a list response straight from rows, as JSON or negotiated MessagePack.
+
+    Only for data the API wrote itself: rows are not validated against the
+    schema. Headers already set on `response` are carried over.
+    """
+    records = plain_rows(rows, schema)
+    if wants_msgpack(request):
+        fast = Response(encode_msgpack(records), media_type=MSGPACK_MEDIA_TYPES[0])
+    else:
+        fast = Response(encode_json(records), media_type=JSON_MEDIA_TYPE)
+    for name, value in response.headers.items():
+        if name not in ("content-length", "content-type"):
+            fast.headers[name] = value
+    fast.headers["Vary"] = "Accept"
+    return fast
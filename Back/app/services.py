@@ -1,11 +1,27 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, insert, update, delete, tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+import asyncio
+import heapq
 import uuid
-from app.models import User, ShareholderProfile, ShareIssuance, AuditEvent, AuditAction, UserRole
-from app.schemas import ShareholderProfileCreate, ShareIssuanceCreate
-from app.auth import get_password_hash
+from pydantic import ValidationError
+from app.models import (
+    User, ShareholderProfile, ShareIssuance, ShareholderHolding, CompanyTotals,
+    CapTableCheckpoint, CheckpointHolding, AuditEvent, AuditAction, UserRole,
+    CertificateStatus
+)
+from app.schemas import ShareholderProfileCreate, ShareIssuanceCreate, ShareIssuanceImportRow
+from app.auth import get_password_hash, get_password_hash_async, hash_passwords_parallel
+from app.cache import dashboard_cache
+from app.audit_sink import audit_sink
+from app.certificate_prerender import certificate_prerenderer
+from app.audit_archive import audit_archive, as_utc, month_start, next_month
+from app.config import settings
+from app.pagination import encode_cursor, decode_cursor
+from app.streaming import merge_batches
 
 
 class ShareholderService:
@@ -31,38 +47,229 @@ class ShareholderService:
             tax_id=shareholder_data.tax_id
         )
         db.add(shareholder)
+        db.flush()
+        HoldingsService.record_new_shareholder(db, shareholder.id)
         db.commit()
+        dashboard_cache.bump()
         db.refresh(shareholder)
         return shareholder
 
+    @staticmethod
+    async def create_shareholder_async(db: AsyncSession, shareholder_data: ShareholderProfileCreate) -> ShareholderProfile:
+        """Create a new shareholder with user account"""
+        # Create user account
+        user = User(
+            email=shareholder_data.email,
+            hashed_password=await get_password_hash_async(shareholder_data.password),
+            role=UserRole.SHAREHOLDER
+        )
+        db.add(user)
+        await db.flush()  # Get the user ID
+        
+        # Create shareholder profile
+        shareholder = ShareholderProfile(
+            user_id=user.id,
+            first_name=shareholder_data.first_name,
+            last_name=shareholder_data.last_name,
+            phone=shareholder_data.phone,
+            address=shareholder_data.address,
+            tax_id=shareholder_data.tax_id
+        )
+        db.add(shareholder)
+        await db.flush()
+        await HoldingsService.record_new_shareholder_async(db, shareholder.id)
+        await db.commit()
+        dashboard_cache.bump()
+        await db.refresh(shareholder)
+        return shareholder
+
+    @staticmethod
+    async def bulk_onboard_async(
+        db: AsyncSession,
+        records: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+        allow_partial: bool = False
+    ) -> dict:
+        """Create shareholders from a stream of records in one transaction.
+
+        Records are consumed lazily and handled in chunks: one query checks
+        a chunk's emails against users, its passwords are hashed across the
+        hashing process pool, then users, profiles and holdings are inserted
+        in bulk. Nothing is committed if any row fails unless allow_partial;
+        once a row has failed without it, later chunks are only validated.
+        """
+        errors = []
+        received = 0
+        imported = 0
+        seen_emails = set()
+        chunk = []
+        for line, record, error in records:
+            received += 1
+            if error:
+                errors.append({"line": line, "error": error})
+                continue
+            try:
+                row = ShareholderProfileCreate.model_validate(record)
+            except ValidationError as e:
+                errors.append({"line": line, "error": _format_validation_error(e)})
+                continue
+            if row.email in seen_emails:
+                errors.append({"line": line, "error": f"Duplicate email {row.email}"})
+                continue
+            seen_emails.add(row.email)
+            chunk.append((line, row))
+            if len(chunk) >= settings.bulk_import_chunk_size:
+                imported += await ShareholderService._onboard_chunk_async(db, chunk, errors, allow_partial)
+                chunk = []
+        if chunk:
+            imported += await ShareholderService._onboard_chunk_async(db, chunk, errors, allow_partial)
+
+        errors.sort(key=lambda error: error["line"])
+        if errors and not allow_partial:
+            await db.rollback()
+            imported = 0
+        elif imported:
+            await db.commit()
+            dashboard_cache.bump()
+        return {"received": received, "imported": imported, "failed": len(errors), "errors": errors}
+
+    @staticmethod
+    async def _onboard_chunk_async(db: AsyncSession, chunk: List[tuple], errors: List[dict], allow_partial: bool) -> int:
+        result = await db.execute(select(User.email).where(User.email.in_([row.email for _, row in chunk])))
+        taken = set(result.scalars().all())
+        fresh = []
+        for line, row in chunk:
+            if row.email in taken:
+                errors.append({"line": line, "error": f"Email {row.email} is already registered"})
+            else:
+                fresh.append(row)
+        # Without allow_partial any error rolls everything back, so skip the hashing and inserts
+        if not fresh or (errors and not allow_partial):
+            return 0
+
+        hashed_passwords = await hash_passwords_parallel([row.password for row in fresh])
+        result = await db.execute(
+            insert(User).returning(User.id, User.email),
+            [
+                {"email": row.email, "hashed_password": hashed, "role": UserRole.SHAREHOLDER, "is_active": True}
+                for row, hashed in zip(fresh, hashed_passwords)
+            ]
+        )
+        user_ids = {email: user_id for user_id, email in result.all()}
+        result = await db.execute(
+            insert(ShareholderProfile).returning(ShareholderProfile.id),
+            [
+                {
+                    "user_id": user_ids[row.email],
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "phone": row.phone,
+                    "address": row.address,
+                    "tax_id": row.tax_id
+                }
+                for row in fresh
+            ]
+        )
+        await HoldingsService.record_new_shareholders_async(db, result.scalars().all())
+        return len(fresh)
+
+    @staticmethod
+    def _shareholders_with_shares_query():
+        return select(
+            ShareholderProfile,
+            User.email,
+            func.coalesce(ShareholderHolding.total_shares, 0).label('total_shares'),
+            func.coalesce(ShareholderHolding.total_value, 0).label('total_value')
+        ).join(User).outerjoin(ShareholderHolding).order_by(ShareholderProfile.id)
+
+    @staticmethod
+    def _shareholder_with_shares(shareholder: ShareholderProfile, email: str, total_shares, total_value) -> dict:
+        return {
+            "id": shareholder.id,
+            "user_id": shareholder.user_id,
+            "first_name": shareholder.first_name,
+            "last_name": shareholder.last_name,
+            "phone": shareholder.phone,
+            "address": shareholder.address,
+            "tax_id": shareholder.tax_id,
+            "created_at": shareholder.created_at,
+            "updated_at": shareholder.updated_at,
+            "email": email,
+            "total_shares": int(total_shares),
+            "total_value": float(total_value)
+        }
+
     @staticmethod
     def get_all_shareholders_with_shares(db: Session) -> List[dict]:
         """Get all shareholders with their total shares and value"""
-        result = db.query(
-            ShareholderProfile,
-            func.coalesce(func.sum(ShareIssuance.number_of_shares), 0).label('total_shares'),
-            func.coalesce(func.sum(ShareIssuance.total_value), 0).label('total_value')
-        ).outerjoin(ShareIssuance).group_by(ShareholderProfile.id).all()
-        
-        return [
-            {
-                "id": shareholder.id,
-                "first_name": shareholder.first_name,
-                "last_name": shareholder.last_name,
-                "email": shareholder.user.email,
-                "total_shares": int(total_shares),
-                "total_value": float(total_value)
-            }
-            for shareholder, total_shares, total_value in result
-        ]
+        result = db.execute(ShareholderService._shareholders_with_shares_query())
+        return [ShareholderService._shareholder_with_shares(*row) for row in result.all()]
+
+    @staticmethod
+    async def get_listing_version_async(db: AsyncSession) -> Tuple[Optional[int], Optional[datetime]]:
+        """Company totals version and latest profile edit, which together date the shareholder listing"""
+        result = await db.execute(select(
+            select(CompanyTotals.version).where(CompanyTotals.id == HoldingsService.COMPANY_TOTALS_ID).scalar_subquery(),
+            select(func.max(ShareholderProfile.updated_at)).scalar_subquery()
+        ))
+        return tuple(result.one())
+
+    @staticmethod
+    async def get_all_shareholders_with_shares_async(db: AsyncSession) -> List[dict]:
+        """Get all shareholders with their total shares and value"""
+        result = await db.execute(ShareholderService._shareholders_with_shares_query())
+        return [ShareholderService._shareholder_with_shares(*row) for row in result.all()]
+
+    @staticmethod
+    async def stream_shareholders_with_shares_async(db: AsyncSession):
+        """Yield shareholders with their totals in batches read from a server-side cursor"""
+        query = ShareholderService._shareholders_with_shares_query()
+        result = await db.stream(query.execution_options(yield_per=settings.stream_chunk_size))
+        async for partition in result.partitions():
+            yield [ShareholderService._shareholder_with_shares(*row) for row in partition]
 
     @staticmethod
     def get_shareholder_by_user_id(db: Session, user_id: int) -> Optional[ShareholderProfile]:
         """Get shareholder profile by user ID"""
         return db.query(ShareholderProfile).filter(ShareholderProfile.user_id == user_id).first()
 
+    @staticmethod
+    async def get_shareholder_by_user_id_async(db: AsyncSession, user_id: int) -> Optional[ShareholderProfile]:
+        """Get shareholder profile by user ID"""
+        result = await db.execute(select(ShareholderProfile).where(ShareholderProfile.user_id == user_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_shareholder_by_id_async(db: AsyncSession, shareholder_id: int) -> Optional[ShareholderProfile]:
+        """Get shareholder profile by ID"""
+        return await db.get(ShareholderProfile, shareholder_id)
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
 
 class ShareIssuanceService:
+    # Sort keys accepted by the issuance listing; prefix with "-" for descending
+    SORT_COLUMNS = {
+        "issuance_date": ShareIssuance.issuance_date,
+        "number_of_shares": ShareIssuance.number_of_shares,
+        "total_value": ShareIssuance.total_value,
+        "id": ShareIssuance.id,
+    }
+
+    @staticmethod
+    def generate_certificate_number() -> str:
+        """Generate a unique certificate number"""
+        return f"CERT-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+
     @staticmethod
     def create_issuance(db: Session, issuance_data: ShareIssuanceCreate) -> ShareIssuance:
         """Create a new share issuance"""
@@ -78,7 +285,7 @@ class ShareIssuanceService:
         # Calculate total value
         total_value = issuance_data.number_of_shares * issuance_data.price_per_share
         # Generate certificate number
-        certificate_number = f"CERT-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        certificate_number = ShareIssuanceService.generate_certificate_number()
         # Create issuance
         issuance = ShareIssuance(
             shareholder_id=issuance_data.shareholder_id,
@@ -86,20 +293,168 @@ class ShareIssuanceService:
             price_per_share=issuance_data.price_per_share,
             total_value=total_value,
             certificate_number=certificate_number,
+            certificate_theme=issuance_data.certificate_theme,
             notes=issuance_data.notes
         )
         db.add(issuance)
+        db.flush()
+        HoldingsService.record_issuance(db, issuance.shareholder_id, issuance.number_of_shares, issuance.total_value)
         db.commit()
+        dashboard_cache.bump()
         db.refresh(issuance)
         # Simulate email notification (log to console)
         print(f"[EMAIL] Sent share issuance notification to {shareholder.user.email}: {issuance.number_of_shares} shares issued on {issuance.issuance_date}.")
         return issuance
 
+    @staticmethod
+    async def create_issuance_async(db: AsyncSession, issuance_data: ShareIssuanceCreate) -> ShareIssuance:
+        """Create a new share issuance"""
+        # Validate shareholder exists
+        result = await db.execute(
+            select(ShareholderProfile)
+            .options(selectinload(ShareholderProfile.user))
+            .where(ShareholderProfile.id == issuance_data.shareholder_id)
+        )
+        shareholder = result.scalars().first()
+        if not shareholder:
+            raise ValueError("Shareholder not found")
+        # Validate number of shares is positive
+        if issuance_data.number_of_shares <= 0:
+            raise ValueError("Number of shares must be positive")
+        # Calculate total value
+        total_value = issuance_data.number_of_shares * issuance_data.price_per_share
+        # Generate certificate number
+        certificate_number = ShareIssuanceService.generate_certificate_number()
+        # Create issuance
+        issuance = ShareIssuance(
+            shareholder_id=issuance_data.shareholder_id,
+            number_of_shares=issuance_data.number_of_shares,
+            price_per_share=issuance_data.price_per_share,
+            total_value=total_value,
+            certificate_number=certificate_number,
+            certificate_status=CertificateStatus.PENDING if certificate_prerenderer.running else None,
+            certificate_theme=issuance_data.certificate_theme,
+            notes=issuance_data.notes
+        )
+        db.add(issuance)
+        await db.flush()
+        await HoldingsService.record_issuance_async(
+            db, issuance.shareholder_id, issuance.number_of_shares, issuance.total_value
+        )
+        await db.commit()
+        dashboard_cache.bump()
+        await db.refresh(issuance)
+        if issuance.certificate_status == CertificateStatus.PENDING:
+            certificate_prerenderer.enqueue(issuance.id)
+        # Simulate email notification (log to console)
+        print(f"[EMAIL] Sent share issuance notification to {shareholder.user.email}: {issuance.number_of_shares} shares issued on {issuance.issuance_date}.")
+        return issuance
+
+    @staticmethod
+    async def bulk_import_async(
+        db: AsyncSession,
+        records: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+        allow_partial: bool = False
+    ) -> dict:
+        """Validate a ledger of issuances up front and insert it in one transaction.
+
+        records yields (line number, record, parse error) as produced by
+        app.bulk_import.iter_records. When any row is invalid nothing is
+        written unless allow_partial is set, in which case the valid rows
+        are imported and the rest reported.
+        """
+        errors = []
+        rows = []
+        received = 0
+        for line, record, error in records:
+            received += 1
+            if error:
+                errors.append({"line": line, "error": error})
+                continue
+            try:
+                rows.append((line, ShareIssuanceImportRow.model_validate(record)))
+            except ValidationError as e:
+                errors.append({"line": line, "error": _format_validation_error(e)})
+
+        # Resolve every referenced shareholder and certificate number in bulk
+        known_shareholders = set()
+        for chunk in _chunks(list({row.shareholder_id for _, row in rows}), 500):
+            result = await db.execute(select(ShareholderProfile.id).where(ShareholderProfile.id.in_(chunk)))
+            known_shareholders.update(result.scalars().all())
+        provided_certificates = list({row.certificate_number for _, row in rows if row.certificate_number})
+        taken_certificates = set()
+        for chunk in _chunks(provided_certificates, 500):
+            result = await db.execute(
+                select(ShareIssuance.certificate_number).where(ShareIssuance.certificate_number.in_(chunk))
+            )
+            taken_certificates.update(result.scalars().all())
+
+        now = datetime.utcnow()
+        values = []
+        for line, row in rows:
+            if row.shareholder_id not in known_shareholders:
+                errors.append({"line": line, "error": f"Shareholder {row.shareholder_id} not found"})
+                continue
+            if row.certificate_number and row.certificate_number in taken_certificates:
+                errors.append({"line": line, "error": f"Duplicate certificate number {row.certificate_number}"})
+                continue
+            if row.certificate_number:
+                taken_certificates.add(row.certificate_number)
+            values.append({
+                "shareholder_id": row.shareholder_id,
+                "number_of_shares": row.number_of_shares,
+                "price_per_share": row.price_per_share,
+                "total_value": row.number_of_shares * row.price_per_share,
+                "issuance_date": CapTableHistoryService.normalize(row.issuance_date) if row.issuance_date else now,
+                "certificate_number": row.certificate_number or ShareIssuanceService.generate_certificate_number(),
+                "certificate_theme": row.certificate_theme,
+                "notes": row.notes
+            })
+
+        errors.sort(key=lambda error: error["line"])
+        result = {
+            "received": received,
+            "imported": 0,
+            "failed": len(errors),
+            "total_shares": 0,
+            "total_value": 0.0,
+            "errors": errors
+        }
+        if not values or (errors and not allow_partial):
+            return result
+
+        for chunk in _chunks(values, settings.bulk_import_chunk_size):
+            await db.execute(insert(ShareIssuance), chunk)
+
+        per_shareholder: Dict[int, Tuple[int, float, int]] = {}
+        for value in values:
+            shares, total, count = per_shareholder.get(value["shareholder_id"], (0, 0.0, 0))
+            per_shareholder[value["shareholder_id"]] = (
+                shares + value["number_of_shares"], total + value["total_value"], count + 1
+            )
+        await HoldingsService.record_issuance_batch_async(db, per_shareholder)
+        await CapTableHistoryService.invalidate_from_async(db, min(value["issuance_date"] for value in values))
+        await db.commit()
+        dashboard_cache.bump()
+
+        result.update(
+            imported=len(values),
+            total_shares=sum(shares for shares, _, _ in per_shareholder.values()),
+            total_value=sum(total for _, total, _ in per_shareholder.values())
+        )
+        return result
+
     @staticmethod
     def get_all_issuances(db: Session) -> List[ShareIssuance]:
         """Get all share issuances (admin only)"""
         return db.query(ShareIssuance).all()
 
+    @staticmethod
+    async def get_all_issuances_async(db: AsyncSession) -> List[ShareIssuance]:
+        """Get all share issuances (admin only)"""
+        result = await db.execute(select(ShareIssuance))
+        return result.scalars().all()
+
     @staticmethod
     def get_shareholder_issuances(db: Session, user_id: int) -> List[ShareIssuance]:
         """Get issuances for a specific shareholder"""
@@ -107,13 +462,575 @@ class ShareIssuanceService:
             ShareholderProfile.user_id == user_id
         ).all()
 
+    @staticmethod
+    async def get_shareholder_issuances_async(db: AsyncSession, user_id: int) -> List[ShareIssuance]:
+        """Get issuances for a specific shareholder"""
+        result = await db.execute(
+            select(ShareIssuance).join(ShareholderProfile).where(ShareholderProfile.user_id == user_id)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    def _decode_issuance_cursor(cursor: str, sort: str):
+        cursor_sort, value, issuance_id = decode_cursor(cursor, 3)
+        if cursor_sort != sort:
+            raise ValueError("Cursor was issued for a different sort order")
+        try:
+            if sort.lstrip("-") == "issuance_date":
+                value = datetime.fromisoformat(value)
+            return value, int(issuance_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    @staticmethod
+    def issuance_query(
+        sort: str = "-issuance_date",
+        cursor: Optional[str] = None,
+        shareholder_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        min_shares: Optional[int] = None,
+        certificate_prefix: Optional[str] = None
+    ):
+        """Filtered, sorted issuance query, starting after cursor if given"""
+        column = ShareIssuanceService.SORT_COLUMNS.get(sort.lstrip("-"))
+        if column is None:
+            raise ValueError(f"Unknown sort: {sort}")
+        descending = sort.startswith("-")
+        
+        query = select(ShareIssuance)
+        if shareholder_id is not None:
+            query = query.where(ShareIssuance.shareholder_id == shareholder_id)
+        if since is not None:
+            query = query.where(ShareIssuance.issuance_date >= CapTableHistoryService.normalize(since))
+        if until is not None:
+            query = query.where(ShareIssuance.issuance_date < CapTableHistoryService.normalize(until))
+        if min_shares is not None:
+            query = query.where(ShareIssuance.number_of_shares >= min_shares)
+        if certificate_prefix:
+            query = query.where(ShareIssuance.certificate_number.startswith(certificate_prefix, autoescape=True))
+        if cursor is not None:
+            value, issuance_id = ShareIssuanceService._decode_issuance_cursor(cursor, sort)
+            key = tuple_(column, ShareIssuance.id)
+            query = query.where(key < tuple_(value, issuance_id) if descending else key > tuple_(value, issuance_id))
+        
+        if descending:
+            return query.order_by(column.desc(), ShareIssuance.id.desc())
+        return query.order_by(column, ShareIssuance.id)
+
+    @staticmethod
+    async def get_issuance_page_async(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "-issuance_date",
+        columns: Optional[Sequence[str]] = None,
+        **filters
+    ) -> Tuple[List[ShareIssuance], Optional[str]]:
+        """Get one page of issuances and the cursor for the next page.
+
+        Pages seek on (sort column, id) rather than using OFFSET, so deep
+        pages cost the same as the first one. With `columns`, plain rows of
+        those columns are returned instead of ORM objects; they must include
+        id and the sort column.
+        """
+        query = ShareIssuanceService.issuance_query(sort, cursor, **filters).limit(limit + 1)
+        if columns is None:
+            issuances = (await db.execute(query)).scalars().all()
+        else:
+            query = query.with_only_columns(*(ShareIssuance.__table__.c[name] for name in columns))
+            issuances = (await db.execute(query)).all()
+        if len(issuances) <= limit:
+            return issuances, None
+        issuances = issuances[:limit]
+        last = issuances[-1]
+        column = ShareIssuanceService.SORT_COLUMNS[sort.lstrip("-")]
+        return issuances, encode_cursor(sort, getattr(last, column.key), last.id)
+
+    @staticmethod
+    async def stream_issuances_async(db: AsyncSession, sort: str = "-issuance_date", cursor: Optional[str] = None, **filters):
+        """Yield every matching issuance in batches read from a server-side cursor"""
+        query = ShareIssuanceService.issuance_query(sort, cursor, **filters)
+        result = await db.stream(query.execution_options(yield_per=settings.stream_chunk_size))
+        async for partition in result.scalars().partitions():
+            yield partition
+
+    @staticmethod
+    async def stream_certificate_rows_async(db: AsyncSession, **filters):
+        """Yield matching (issuance, shareholder) pairs in issuance order, in batches"""
+        query = ShareIssuanceService.issuance_query("issuance_date", **filters).add_columns(ShareholderProfile).join(
+            ShareholderProfile, ShareIssuance.shareholder_id == ShareholderProfile.id
+        )
+        result = await db.stream(query.execution_options(yield_per=settings.stream_chunk_size))
+        async for partition in result.tuples().partitions():
+            yield partition
+
     @staticmethod
     def get_issuance_by_id(db: Session, issuance_id: int) -> Optional[ShareIssuance]:
         """Get issuance by ID"""
         return db.query(ShareIssuance).filter(ShareIssuance.id == issuance_id).first()
 
+    @staticmethod
+    async def get_issuance_by_id_async(db: AsyncSession, issuance_id: int) -> Optional[ShareIssuance]:
+        """Get issuance by ID"""
+        return await db.get(ShareIssuance, issuance_id)
+
+
+class HoldingsService:
+    """Maintains shareholder_holdings and company_totals from share issuances.
+
+    Writes run on the caller's session, so the summary rows commit or roll
+    back together with the issuance or shareholder that changed them.
+    """
+
+    COMPANY_TOTALS_ID = 1
+    VALUE_TOLERANCE = 1e-6
+
+    @staticmethod
+    def _increment_holding(shareholder_id: int, shares: int, value: float, issuances: int):
+        return update(ShareholderHolding).where(
+            ShareholderHolding.shareholder_id == shareholder_id
+        ).values(
+            total_shares=ShareholderHolding.total_shares + shares,
+            total_value=ShareholderHolding.total_value + value,
+            issuance_count=ShareholderHolding.issuance_count + issuances,
+            version=ShareholderHolding.version + 1
+        )
+
+    @staticmethod
+    def _increment_totals(shareholders: int = 0, shares: int = 0, value: float = 0.0):
+        return update(CompanyTotals).where(
+            CompanyTotals.id == HoldingsService.COMPANY_TOTALS_ID
+        ).values(
+            total_shareholders=CompanyTotals.total_shareholders + shareholders,
+            total_shares=CompanyTotals.total_shares + shares,
+            total_value=CompanyTotals.total_value + value,
+            version=CompanyTotals.version + 1
+        )
+
+    @staticmethod
+    def _raw_holdings_query(shareholder_id: Optional[int] = None):
+        stmt = select(
+            ShareIssuance.shareholder_id,
+            func.coalesce(func.sum(ShareIssuance.number_of_shares), 0),
+            func.coalesce(func.sum(ShareIssuance.total_value), 0),
+            func.count(ShareIssuance.id)
+        ).group_by(ShareIssuance.shareholder_id)
+        if shareholder_id is not None:
+            stmt = stmt.where(ShareIssuance.shareholder_id == shareholder_id)
+        return stmt
+
+    @staticmethod
+    def _raw_totals_query():
+        return select(
+            select(func.count(ShareholderProfile.id)).scalar_subquery(),
+            select(func.coalesce(func.sum(ShareIssuance.number_of_shares), 0)).scalar_subquery(),
+            select(func.coalesce(func.sum(ShareIssuance.total_value), 0)).scalar_subquery()
+        )
+
+    @staticmethod
+    def _new_holding(shareholder_id: int, raw_row=None) -> ShareholderHolding:
+        _, shares, value, count = raw_row if raw_row else (shareholder_id, 0, 0.0, 0)
+        return ShareholderHolding(
+            shareholder_id=shareholder_id,
+            total_shares=int(shares),
+            total_value=float(value),
+            issuance_count=int(count),
+            version=1
+        )
+
+    @staticmethod
+    def _new_totals(raw_row) -> CompanyTotals:
+        shareholders, shares, value = raw_row
+        return CompanyTotals(
+            id=HoldingsService.COMPANY_TOTALS_ID,
+            total_shareholders=int(shareholders),
+            total_shares=int(shares),
+            total_value=float(value),
+            version=1
+        )
+
+    @staticmethod
+    def record_issuance(db: Session, shareholder_id: int, shares: int, value: float, issuances: int = 1) -> None:
+        """Apply flushed issuances to the summary rows, seeding them from raw data if missing"""
+        if db.execute(HoldingsService._increment_holding(shareholder_id, shares, value, issuances)).rowcount == 0:
+            raw = db.execute(HoldingsService._raw_holdings_query(shareholder_id)).first()
+            db.add(HoldingsService._new_holding(shareholder_id, raw))
+        if db.execute(HoldingsService._increment_totals(shares=shares, value=value)).rowcount == 0:
+            db.add(HoldingsService._new_totals(db.execute(HoldingsService._raw_totals_query()).first()))
+
+    @staticmethod
+    async def record_issuance_async(
+        db: AsyncSession, shareholder_id: int, shares: int, value: float, issuances: int = 1
+    ) -> None:
+        """Apply flushed issuances to the summary rows, seeding them from raw data if missing"""
+        await HoldingsService.record_issuance_batch_async(db, {shareholder_id: (shares, value, issuances)})
+
+    @staticmethod
+    async def record_issuance_batch_async(db: AsyncSession, per_shareholder: Dict[int, Tuple[int, float, int]]) -> None:
+        """Apply {shareholder_id: (shares, value, issuances)} with one update per shareholder"""
+        for shareholder_id, (shares, value, issuances) in per_shareholder.items():
+            result = await db.execute(HoldingsService._increment_holding(shareholder_id, shares, value, issuances))
+            if result.rowcount == 0:
+                raw = (await db.execute(HoldingsService._raw_holdings_query(shareholder_id))).first()
+                db.add(HoldingsService._new_holding(shareholder_id, raw))
+        shares = sum(shares for shares, _, _ in per_shareholder.values())
+        value = sum(value for _, value, _ in per_shareholder.values())
+        result = await db.execute(HoldingsService._increment_totals(shares=shares, value=value))
+        if result.rowcount == 0:
+            db.add(HoldingsService._new_totals((await db.execute(HoldingsService._raw_totals_query())).first()))
+
+    @staticmethod
+    def record_new_shareholder(db: Session, shareholder_id: int) -> None:
+        """Create the empty holding row for a flushed shareholder profile"""
+        db.add(HoldingsService._new_holding(shareholder_id))
+        if db.execute(HoldingsService._increment_totals(shareholders=1)).rowcount == 0:
+            db.add(HoldingsService._new_totals(db.execute(HoldingsService._raw_totals_query()).first()))
+
+    @staticmethod
+    async def record_new_shareholder_async(db: AsyncSession, shareholder_id: int) -> None:
+        """Create the empty holding row for a flushed shareholder profile"""
+        db.add(HoldingsService._new_holding(shareholder_id))
+        result = await db.execute(HoldingsService._increment_totals(shareholders=1))
+        if result.rowcount == 0:
+            db.add(HoldingsService._new_totals((await db.execute(HoldingsService._raw_totals_query())).first()))
+
+    @staticmethod
+    async def record_new_shareholders_async(db: AsyncSession, shareholder_ids: List[int]) -> None:
+        """Create empty holding rows for a batch of flushed shareholder profiles"""
+        if not shareholder_ids:
+            return
+        await db.execute(
+            insert(ShareholderHolding),
+            [
+                {"shareholder_id": shareholder_id, "total_shares": 0, "total_value": 0.0, "issuance_count": 0, "version": 1}
+                for shareholder_id in shareholder_ids
+            ]
+        )
+        result = await db.execute(HoldingsService._increment_totals(shareholders=len(shareholder_ids)))
+        if result.rowcount == 0:
+            db.add(HoldingsService._new_totals((await db.execute(HoldingsService._raw_totals_query())).first()))
+
+    @staticmethod
+    async def bump_holding_version_async(db: AsyncSession, shareholder_id: int) -> None:
+        """Move one shareholder's holding version for an issuance change that leaves the totals alone"""
+        await db.execute(
+            update(ShareholderHolding)
+            .where(ShareholderHolding.shareholder_id == shareholder_id)
+            .values(version=ShareholderHolding.version + 1)
+        )
+
+    @staticmethod
+    async def bump_totals_version_async(db: AsyncSession) -> None:
+        """Move the company version for issuance changes that leave the totals alone"""
+        await db.execute(HoldingsService._increment_totals())
+
+    @staticmethod
+    async def get_version_async(db: AsyncSession, shareholder_id: Optional[int] = None) -> Optional[int]:
+        """Version of one shareholder's holding, or of the company totals when shareholder_id is None.
+
+        Every write to a shareholder's issuances moves both, so they stand in
+        for the state of the issuance listings. Certificate status changes
+        move the holding version at once and the company version once the
+        pre-render queue drains.
+        """
+        if shareholder_id is None:
+            query = select(CompanyTotals.version).where(CompanyTotals.id == HoldingsService.COMPANY_TOTALS_ID)
+        else:
+            query = select(ShareholderHolding.version).where(ShareholderHolding.shareholder_id == shareholder_id)
+        return (await db.execute(query)).scalar()
+
+    @staticmethod
+    def get_company_totals(db: Session) -> Optional[CompanyTotals]:
+        """Get the maintained company-wide totals row"""
+        return db.get(CompanyTotals, HoldingsService.COMPANY_TOTALS_ID)
+
+    @staticmethod
+    async def get_company_totals_async(db: AsyncSession) -> Optional[CompanyTotals]:
+        """Get the maintained company-wide totals row"""
+        return await db.get(CompanyTotals, HoldingsService.COMPANY_TOTALS_ID)
+
+    @staticmethod
+    def find_drift(db: Session) -> List[dict]:
+        """Recompute holdings from raw issuances and list every summary value that disagrees"""
+        expected = {row[0]: row for row in db.execute(HoldingsService._raw_holdings_query()).all()}
+        stored = {holding.shareholder_id: holding for holding in db.query(ShareholderHolding).all()}
+        drift = []
+
+        def compare(scope, field, expected_value, actual_value, is_float=False):
+            if actual_value is None:
+                mismatch = True
+            elif is_float:
+                mismatch = abs(float(expected_value) - float(actual_value)) > HoldingsService.VALUE_TOLERANCE * max(1.0, abs(float(expected_value)))
+            else:
+                mismatch = int(expected_value) != int(actual_value)
+            if mismatch:
+                drift.append({"scope": scope, "field": field, "expected": expected_value, "actual": actual_value})
+
+        for (shareholder_id,) in db.query(ShareholderProfile.id).all():
+            _, shares, value, count = expected.get(shareholder_id, (shareholder_id, 0, 0.0, 0))
+            holding = stored.pop(shareholder_id, None)
+            scope = f"shareholder:{shareholder_id}"
+            compare(scope, "total_shares", int(shares), holding.total_shares if holding else None)
+            compare(scope, "total_value", float(value), holding.total_value if holding else None, is_float=True)
+            compare(scope, "issuance_count", int(count), holding.issuance_count if holding else None)
+        for shareholder_id in stored:
+            drift.append({"scope": f"shareholder:{shareholder_id}", "field": "orphaned", "expected": None, "actual": shareholder_id})
+
+        shareholders, shares, value = db.execute(HoldingsService._raw_totals_query()).first()
+        totals = HoldingsService.get_company_totals(db)
+        compare("company", "total_shareholders", int(shareholders), totals.total_shareholders if totals else None)
+        compare("company", "total_shares", int(shares), totals.total_shares if totals else None)
+        compare("company", "total_value", float(value), totals.total_value if totals else None, is_float=True)
+        return drift
+
+    @staticmethod
+    def rebuild(db: Session) -> Tuple[int, int]:
+        """Rewrite holdings and company totals from raw issuances.
+
+        Rows that already match are left untouched, so their version only
+        moves when the data actually changed. Returns (rows written, rows deleted).
+        """
+        expected = {row[0]: row for row in db.execute(HoldingsService._raw_holdings_query()).all()}
+        stored = {holding.shareholder_id: holding for holding in db.query(ShareholderHolding).all()}
+        written = 0
+
+        for (shareholder_id,) in db.query(ShareholderProfile.id).all():
+            fresh = HoldingsService._new_holding(shareholder_id, expected.get(shareholder_id))
+            holding = stored.pop(shareholder_id, None)
+            if holding is None:
+                db.add(fresh)
+                written += 1
+            elif (holding.total_shares, holding.issuance_count) != (fresh.total_shares, fresh.issuance_count) or \
+                    abs(holding.total_value - fresh.total_value) > HoldingsService.VALUE_TOLERANCE * max(1.0, abs(fresh.total_value)):
+                holding.total_shares = fresh.total_shares
+                holding.total_value = fresh.total_value
+                holding.issuance_count = fresh.issuance_count
+                holding.version += 1
+                written += 1
+
+        if stored:
+            db.execute(delete(ShareholderHolding).where(ShareholderHolding.shareholder_id.in_(list(stored))))
+
+        fresh_totals = HoldingsService._new_totals(db.execute(HoldingsService._raw_totals_query()).first())
+        totals = HoldingsService.get_company_totals(db)
+        if totals is None:
+            db.add(fresh_totals)
+        else:
+            totals.total_shareholders = fresh_totals.total_shareholders
+            totals.total_shares = fresh_totals.total_shares
+            totals.total_value = fresh_totals.total_value
+            totals.version += 1
+        db.commit()
+        dashboard_cache.bump()
+        return written, len(stored)
+
+
+class CapTableHistoryService:
+    """Point-in-time cap tables built from stored checkpoints.
+
+    A checkpoint stores per-shareholder totals for every issuance dated at
+    or before its as_of. A query for date X loads the nearest checkpoint
+    at or before X and only aggregates the issuances dated after it.
+    Checkpoints are taken at fixed interval boundaries (midnight UTC for the
+    default 24 hours) by app.cap_table_checkpointer, outside any request.
+    """
+
+    # Latest checkpoint as_of seen by this process, to skip the lookup when it is current
+    _latest_checkpoint_at: Optional[datetime] = None
+
+    @staticmethod
+    def normalize(moment: datetime) -> datetime:
+        """Convert a timestamp to the naive UTC used by issuance_date"""
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+
+    @staticmethod
+    async def _nearest_checkpoint_async(db: AsyncSession, as_of: datetime) -> Optional[CapTableCheckpoint]:
+        result = await db.execute(
+            select(CapTableCheckpoint)
+            .where(CapTableCheckpoint.as_of <= as_of)
+            .order_by(CapTableCheckpoint.as_of.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def _replay_async(
+        db: AsyncSession, after: Optional[datetime], until: datetime
+    ) -> Dict[int, Tuple[int, float]]:
+        """Aggregate issuances dated in (after, until] per shareholder"""
+        stmt = select(
+            ShareIssuance.shareholder_id,
+            func.sum(ShareIssuance.number_of_shares),
+            func.sum(ShareIssuance.total_value)
+        ).where(ShareIssuance.issuance_date <= until).group_by(ShareIssuance.shareholder_id)
+        if after is not None:
+            stmt = stmt.where(ShareIssuance.issuance_date > after)
+        result = await db.execute(stmt)
+        return {shareholder_id: (int(shares), float(value)) for shareholder_id, shares, value in result.all()}
+
+    @staticmethod
+    async def get_holdings_as_of_async(db: AsyncSession, as_of: datetime) -> Dict[int, Tuple[int, float]]:
+        """Get {shareholder_id: (shares, value)} for issuances dated at or before as_of"""
+        as_of = CapTableHistoryService.normalize(as_of)
+        checkpoint = await CapTableHistoryService._nearest_checkpoint_async(db, as_of)
+        holdings: Dict[int, Tuple[int, float]] = {}
+        if checkpoint is not None:
+            result = await db.execute(
+                select(CheckpointHolding.shareholder_id, CheckpointHolding.total_shares, CheckpointHolding.total_value)
+                .where(CheckpointHolding.checkpoint_id == checkpoint.id)
+            )
+            holdings = {shareholder_id: (shares, value) for shareholder_id, shares, value in result.all()}
+
+        replayed = await CapTableHistoryService._replay_async(db, checkpoint.as_of if checkpoint else None, as_of)
+        for shareholder_id, (shares, value) in replayed.items():
+            base_shares, base_value = holdings.get(shareholder_id, (0, 0.0))
+            holdings[shareholder_id] = (base_shares + shares, base_value + value)
+        return holdings
+
+    @staticmethod
+    async def get_shareholders_as_of_async(db: AsyncSession, as_of: datetime) -> List[dict]:
+        """Get all shareholders with their total shares and value as of a date"""
+        holdings = await CapTableHistoryService.get_holdings_as_of_async(db, as_of)
+        result = await db.execute(
+            select(ShareholderProfile, User.email).join(User).order_by(ShareholderProfile.id)
+        )
+        return [
+            ShareholderService._shareholder_with_shares(shareholder, email, *holdings.get(shareholder.id, (0, 0.0)))
+            for shareholder, email in result.all()
+        ]
+
+    @staticmethod
+    async def get_ownership_distribution_as_of_async(db: AsyncSession, as_of: datetime) -> List[dict]:
+        """Get ownership distribution for pie chart as of a date"""
+        holdings = await CapTableHistoryService.get_holdings_as_of_async(db, as_of)
+        total_shares = sum(shares for shares, _ in holdings.values())
+        if total_shares == 0:
+            return []
+        result = await db.execute(
+            select(ShareholderProfile.id, ShareholderProfile.first_name, ShareholderProfile.last_name)
+            .where(ShareholderProfile.id.in_([shareholder_id for shareholder_id, (shares, _) in holdings.items() if shares > 0]))
+            .order_by(ShareholderProfile.id)
+        )
+        rows = [(first_name, last_name, *holdings[shareholder_id]) for shareholder_id, first_name, last_name in result.all()]
+        return DashboardService._distribution(rows, total_shares)
+
+    @staticmethod
+    async def get_diff_async(db: AsyncSession, from_date: datetime, to_date: datetime) -> List[dict]:
+        """Get per-shareholder changes between two dates"""
+        from_date = CapTableHistoryService.normalize(from_date)
+        to_date = CapTableHistoryService.normalize(to_date)
+        if to_date < from_date:
+            raise ValueError("to_date must not be before from_date")
+
+        before = await CapTableHistoryService.get_holdings_as_of_async(db, from_date)
+        changes = await CapTableHistoryService._replay_async(db, from_date, to_date)
+        if not changes:
+            return []
+
+        result = await db.execute(
+            select(ShareholderProfile.id, ShareholderProfile.first_name, ShareholderProfile.last_name)
+            .where(ShareholderProfile.id.in_(list(changes)))
+            .order_by(ShareholderProfile.id)
+        )
+        diff = []
+        for shareholder_id, first_name, last_name in result.all():
+            shares_from, value_from = before.get(shareholder_id, (0, 0.0))
+            shares_change, value_change = changes[shareholder_id]
+            diff.append({
+                "shareholder_id": shareholder_id,
+                "shareholder_name": f"{first_name} {last_name}",
+                "shares_from": shares_from,
+                "shares_to": shares_from + shares_change,
+                "shares_change": shares_change,
+                "value_from": value_from,
+                "value_to": value_from + value_change,
+                "value_change": value_change
+            })
+        return diff
+
+    @staticmethod
+    async def create_checkpoint_async(db: AsyncSession, as_of: datetime) -> CapTableCheckpoint:
+        """Store a checkpoint of holdings as of a date"""
+        as_of = CapTableHistoryService.normalize(as_of)
+        holdings = await CapTableHistoryService.get_holdings_as_of_async(db, as_of)
+        checkpoint = CapTableCheckpoint(as_of=as_of)
+        db.add(checkpoint)
+        await db.flush()
+        db.add_all([
+            CheckpointHolding(
+                checkpoint_id=checkpoint.id,
+                shareholder_id=shareholder_id,
+                total_shares=shares,
+                total_value=value
+            )
+            for shareholder_id, (shares, value) in holdings.items()
+            if shares
+        ])
+        await db.commit()
+        return checkpoint
+
+    @staticmethod
+    def current_checkpoint_boundary(now: Optional[datetime] = None) -> Optional[datetime]:
+        """Get the most recent checkpoint boundary, or None if checkpoints are disabled"""
+        interval = timedelta(hours=settings.cap_table_checkpoint_interval_hours)
+        if interval <= timedelta(0):
+            return None
+        now = now or datetime.utcnow()
+        return datetime.min + ((now - datetime.min) // interval) * interval
+
+    @staticmethod
+    async def maybe_checkpoint_async(db: AsyncSession) -> Optional[CapTableCheckpoint]:
+        """Take a checkpoint at the latest boundary if this process has not seen one yet"""
+        boundary = CapTableHistoryService.current_checkpoint_boundary()
+        if boundary is None:
+            return None
+        latest = CapTableHistoryService._latest_checkpoint_at
+        if latest is not None and latest >= boundary:
+            return None
+
+        latest = await db.scalar(select(func.max(CapTableCheckpoint.as_of)))
+        if latest is not None and latest >= boundary:
+            CapTableHistoryService._latest_checkpoint_at = latest
+            return None
+        # Use a separate session so a lost race cannot expire the caller's objects
+        async with AsyncSession(db.bind, expire_on_commit=False) as checkpoint_db:
+            try:
+                checkpoint = await CapTableHistoryService.create_checkpoint_async(checkpoint_db, boundary)
+            except IntegrityError:
+                # Another worker took the same checkpoint first
+                await checkpoint_db.rollback()
+                checkpoint = None
+        CapTableHistoryService._latest_checkpoint_at = boundary
+        return checkpoint
+
+    @staticmethod
+    def invalidate_from(db: Session, since: datetime) -> int:
+        """Drop checkpoints that a back-dated issuance at since would make wrong"""
+        since = CapTableHistoryService.normalize(since)
+        stale_ids = select(CapTableCheckpoint.id).where(CapTableCheckpoint.as_of >= since)
+        db.execute(delete(CheckpointHolding).where(CheckpointHolding.checkpoint_id.in_(stale_ids)))
+        result = db.execute(delete(CapTableCheckpoint).where(CapTableCheckpoint.as_of >= since))
+        CapTableHistoryService._latest_checkpoint_at = None
+        return result.rowcount
+
+    @staticmethod
+    async def invalidate_from_async(db: AsyncSession, since: datetime) -> int:
+        """Drop checkpoints that a back-dated issuance at since would make wrong"""
+        since = CapTableHistoryService.normalize(since)
+        stale_ids = select(CapTableCheckpoint.id).where(CapTableCheckpoint.as_of >= since)
+        await db.execute(delete(CheckpointHolding).where(CheckpointHolding.checkpoint_id.in_(stale_ids)))
+        result = await db.execute(delete(CapTableCheckpoint).where(CapTableCheckpoint.as_of >= since))
+        CapTableHistoryService._latest_checkpoint_at = None
+        return result.rowcount
+
 
 class AuditService:
+    # Columns, in order, of an audit log export
+    EXPORT_COLUMNS = ("id", "created_at", "user_id", "action", "details", "ip_address", "user_agent")
+
     @staticmethod
     def log_event(
         db: Session, 
@@ -136,55 +1053,336 @@ class AuditService:
         db.refresh(audit_event)
         return audit_event
 
+    @staticmethod
+    async def log_event_async(
+        db: AsyncSession, 
+        user_id: int, 
+        action: AuditAction, 
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        durable: bool = False
+    ) -> Optional[AuditEvent]:
+        """Log an audit event.
+
+        Events go to the write-behind audit sink when it is running, so the
+        request does not pay for its own transaction. Pass durable=True for
+        events that must be committed before the response is sent.
+        """
+        if not durable and audit_sink.running:
+            audit_sink.enqueue(user_id, action, details, ip_address, user_agent)
+            return None
+        
+        audit_event = AuditEvent(
+            user_id=user_id,
+            action=action,
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        db.add(audit_event)
+        await db.commit()
+        await db.refresh(audit_event)
+        return audit_event
+
     @staticmethod
     def get_audit_logs(db: Session, limit: int = 100) -> List[AuditEvent]:
         """Get recent audit logs"""
         return db.query(AuditEvent).order_by(AuditEvent.created_at.desc()).limit(limit).all()
 
+    @staticmethod
+    async def get_audit_logs_async(db: AsyncSession, limit: int = 100) -> List[AuditEvent]:
+        """Get recent audit logs"""
+        result = await db.execute(select(AuditEvent).order_by(AuditEvent.created_at.desc()).limit(limit))
+        return result.scalars().all()
 
-class DashboardService:
     @staticmethod
-    def get_dashboard_stats(db: Session) -> dict:
-        """Get dashboard statistics"""
-        total_shareholders = db.query(ShareholderProfile).count()
+    def _filter_events(
+        query,
+        action: Optional[AuditAction] = None,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ):
+        if action is not None:
+            query = query.where(AuditEvent.action == action)
+        if user_id is not None:
+            query = query.where(AuditEvent.user_id == user_id)
+        if since is not None:
+            query = query.where(AuditEvent.created_at >= as_utc(since))
+        if until is not None:
+            query = query.where(AuditEvent.created_at < as_utc(until))
+        return query
+
+    @staticmethod
+    def _archive_filter(
+        action: Optional[AuditAction] = None,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        before: Optional[Tuple[datetime, int]] = None
+    ):
+        """Predicate applying the same filters as _filter_events to archived rows"""
+        since = since and as_utc(since)
+        until = until and as_utc(until)
         
-        shares_result = db.query(
-            func.coalesce(func.sum(ShareIssuance.number_of_shares), 0).label('total_shares'),
-            func.coalesce(func.sum(ShareIssuance.total_value), 0).label('total_value')
-        ).first()
+        def match(row: dict) -> bool:
+            return (
+                (action is None or row["action"] == action.value)
+                and (user_id is None or row["user_id"] == user_id)
+                and (since is None or row["created_at"] >= since)
+                and (until is None or row["created_at"] < until)
+                and (before is None or (row["created_at"], row["id"]) < before)
+            )
+        return match
+
+    @staticmethod
+    def _archived_event(row: dict) -> AuditEvent:
+        """Detached AuditEvent for a row read back from the archive"""
+        return AuditEvent(**{**row, "action": AuditAction(row["action"])})
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        created_at, event_id = decode_cursor(cursor, 2)
+        try:
+            return as_utc(datetime.fromisoformat(created_at)), int(event_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    @staticmethod
+    async def get_audit_log_page_async(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        action: Optional[AuditAction] = None,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[AuditEvent], Optional[str]]:
+        """Get one page of audit logs, newest first, and the cursor for the next page.
+
+        Pages seek on (created_at, id) rather than using OFFSET, so with the
+        composite indexes every page costs the same however deep it is.
+        Archived months are read only when the page runs past the newest
+        archived event, which is kept in memory.
+        """
+        query = AuditService._filter_events(select(AuditEvent), action, user_id, since, until)
+        before = None
+        if cursor is not None:
+            before = AuditService.decode_cursor(cursor)
+            query = query.where(tuple_(AuditEvent.created_at, AuditEvent.id) < tuple_(*before))
         
-        return {
-            "total_shareholders": total_shareholders,
-            "total_shares_issued": int(shares_result.total_shares),
-            "total_value": float(shares_result.total_value)
-        }
+        query = query.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc()).limit(limit + 1)
+        events = list((await db.execute(query)).scalars().all())
+        
+        newest_archived_at = await audit_archive.newest_archived_at_async()
+        reaches_archive = newest_archived_at is not None and (since is None or as_utc(since) <= newest_archived_at) and (
+            len(events) <= limit or as_utc(events[-1].created_at) <= newest_archived_at
+        )
+        if reaches_archive:
+            match = AuditService._archive_filter(action, user_id, since, until, before)
+            archived = await asyncio.to_thread(
+                audit_archive.latest, limit + 1, match, since and as_utc(since), until and as_utc(until)
+            )
+            events = heapq.nlargest(
+                limit + 1,
+                events + [AuditService._archived_event(row) for row in archived],
+                key=lambda event: (as_utc(event.created_at), event.id)
+            )
+        
+        if len(events) <= limit:
+            return events, None
+        events = events[:limit]
+        return events, encode_cursor(events[-1].created_at, events[-1].id)
 
     @staticmethod
-    def get_ownership_distribution(db: Session) -> List[dict]:
-        """Get ownership distribution for pie chart"""
-        # Get total shares for percentage calculation
-        total_shares_result = db.query(
-            func.coalesce(func.sum(ShareIssuance.number_of_shares), 0)
-        ).scalar()
-        total_shares = int(total_shares_result) if total_shares_result else 0
+    async def stream_audit_events_async(
+        db: AsyncSession,
+        action: Optional[AuditAction] = None,
+        user_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        chunk_size: Optional[int] = None
+    ):
+        """Yield matching audit events, oldest first, in batches of plain rows.
+
+        Rows come from a server-side cursor without building ORM objects,
+        so memory stays flat however many events are exported. Archived
+        months in the range are read from disk and merged with the live
+        rows by (created_at, id), so the export stays in order while an
+        archive run is part-way through; an event both archived and not yet
+        purged is exported once. The caller owns the session and must keep
+        it open until iteration finishes.
+        """
+        chunk_size = chunk_size or settings.audit_export_chunk_size
+        archived = audit_archive.batches(
+            AuditService._archive_filter(action, user_id, since, until),
+            since and as_utc(since),
+            until and as_utc(until),
+            batch_size=chunk_size
+        )
+
+        async def archived_batches():
+            while True:
+                batch = await asyncio.to_thread(next, archived, None)
+                if batch is None:
+                    return
+                yield batch
         
-        if total_shares == 0:
-            return []
+        query = AuditService._filter_events(AuditService._export_query(), action, user_id, since, until)
+        result = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for batch in merge_batches(
+            [archived_batches(), result.mappings().partitions()],
+            key=lambda row: (as_utc(row["created_at"]), row["id"]),
+            batch_size=chunk_size
+        ):
+            yield batch
+
+    @staticmethod
+    def _export_query():
+        columns = [getattr(AuditEvent, column) for column in AuditService.EXPORT_COLUMNS]
+        return select(*columns).order_by(AuditEvent.created_at, AuditEvent.id)
+
+    @staticmethod
+    def archive_cutoff(retention_months: int, now: Optional[datetime] = None) -> datetime:
+        """Start of the oldest month kept in the database"""
+        cutoff = month_start(now or datetime.now(timezone.utc))
+        for _ in range(retention_months):
+            cutoff = month_start(cutoff - timedelta(days=1))
+        return cutoff
+
+    @staticmethod
+    async def archive_month_async(db: AsyncSession, month: datetime) -> Tuple[int, int]:
+        """Archive one month of audit events to disk, then purge them in batches.
+
+        Returns (archived, purged). Safe to re-run: a part whose purge was
+        interrupted is purged before the month's remaining rows are read.
+        """
+        purged = 0
+        for part in audit_archive.manifest(month)["parts"]:
+            if not part["purged"]:
+                purged += await AuditService._purge_part_async(db, month, part)
         
-        # Get distribution
-        result = db.query(
-            ShareholderProfile,
-            func.coalesce(func.sum(ShareIssuance.number_of_shares), 0).label('shares'),
-            func.coalesce(func.sum(ShareIssuance.total_value), 0).label('value')
-        ).outerjoin(ShareIssuance).group_by(ShareholderProfile.id).all()
+        query = AuditService._filter_events(AuditService._export_query(), since=month, until=next_month(month))
+        
+        async def batches():
+            result = await db.stream(query.execution_options(yield_per=settings.audit_export_chunk_size))
+            async for partition in result.mappings().partitions():
+                yield partition
         
+        part = await audit_archive.write_part_async(month, batches())
+        await db.rollback()
+        if part is None:
+            return 0, purged
+        purged += await AuditService._purge_part_async(db, month, part)
+        return part["count"], purged
+
+    @staticmethod
+    async def _purge_part_async(db: AsyncSession, month: datetime, part: dict) -> int:
+        """Delete an archived part's rows in batches, then mark it purged"""
+        query = (
+            AuditService._filter_events(select(AuditEvent.id), since=month, until=next_month(month))
+            .where(AuditEvent.id.between(part["min_id"], part["max_id"]))
+            .limit(settings.audit_purge_batch_size)
+        )
+        purged = 0
+        while True:
+            ids = (await db.execute(query)).scalars().all()
+            if not ids:
+                break
+            await db.execute(delete(AuditEvent).where(AuditEvent.id.in_(ids)))
+            await db.commit()
+            purged += len(ids)
+        audit_archive.mark_purged(month, part["file"])
+        return purged
+
+    @staticmethod
+    async def archive_expired_async(
+        db: AsyncSession, retention_months: Optional[int] = None, now: Optional[datetime] = None
+    ) -> List[dict]:
+        """Archive and purge every month older than the retention window"""
+        retention_months = settings.audit_retention_months if retention_months is None else retention_months
+        if retention_months <= 0:
+            return []
+        cutoff = AuditService.archive_cutoff(retention_months, now)
+        oldest = (await db.execute(
+            select(func.min(AuditEvent.created_at)).where(AuditEvent.created_at < cutoff)
+        )).scalar()
+        if oldest is None:
+            return []
+        
+        results = []
+        month = month_start(oldest)
+        while month < cutoff:
+            archived, purged = await AuditService.archive_month_async(db, month)
+            if archived or purged:
+                results.append({"month": f"{month.year:04d}-{month.month:02d}", "archived": archived, "purged": purged})
+            month = next_month(month)
+        return results
+
+
+class DashboardService:
+    @staticmethod
+    def _stats_from_totals(totals: Optional[CompanyTotals], raw_row=None) -> dict:
+        if totals is not None:
+            shareholders, shares, value = totals.total_shareholders, totals.total_shares, totals.total_value
+        else:
+            shareholders, shares, value = raw_row
+        return {
+            "total_shareholders": int(shareholders),
+            "total_shares_issued": int(shares),
+            "total_value": float(value)
+        }
+
+    @staticmethod
+    def _distribution_query():
+        return select(
+            ShareholderProfile.first_name,
+            ShareholderProfile.last_name,
+            ShareholderHolding.total_shares,
+            ShareholderHolding.total_value
+        ).join(ShareholderHolding).where(ShareholderHolding.total_shares > 0).order_by(ShareholderProfile.id)
+
+    @staticmethod
+    def _distribution(rows, total_shares: int) -> List[dict]:
         return [
             {
-                "shareholder_name": f"{shareholder.first_name} {shareholder.last_name}",
+                "shareholder_name": f"{first_name} {last_name}",
                 "shares": int(shares),
                 "percentage": round((shares / total_shares) * 100, 2),
                 "value": float(value)
             }
-            for shareholder, shares, value in result
-            if shares > 0
-        ] 
\ No newline at end of file
+            for first_name, last_name, shares, value in rows
+        ]
+
+    @staticmethod
+    def get_dashboard_stats(db: Session) -> dict:
+        """Get dashboard statistics from the maintained company totals"""
+        totals = HoldingsService.get_company_totals(db)
+        raw = None if totals else db.execute(HoldingsService._raw_totals_query()).first()
+        return DashboardService._stats_from_totals(totals, raw)
+
+    @staticmethod
+    async def get_dashboard_stats_async(db: AsyncSession) -> dict:
+        """Get dashboard statistics from the maintained company totals"""
+        totals = await HoldingsService.get_company_totals_async(db)
+        raw = None if totals else (await db.execute(HoldingsService._raw_totals_query())).first()
+        return DashboardService._stats_from_totals(totals, raw)
+
+    @staticmethod
+    def get_ownership_distribution(db: Session) -> List[dict]:
+        """Get ownership distribution for pie chart"""
+        total_shares = DashboardService.get_dashboard_stats(db)["total_shares_issued"]
+        if total_shares == 0:
+            return []
+        rows = db.execute(DashboardService._distribution_query()).all()
+        return DashboardService._distribution(rows, total_shares)
+
+    @staticmethod
+    async def get_ownership_distribution_async(db: AsyncSession) -> List[dict]:
+        """Get ownership distribution for pie chart"""
+        total_shares = (await DashboardService.get_dashboard_stats_async(db))["total_shares_issued"]
+        if total_shares == 0:
+            return []
+        rows = (await db.execute(DashboardService._distribution_query())).all()
+        return DashboardService._distribution(rows, total_shares)
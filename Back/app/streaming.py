@@ -0,0 +1,136 @@
+import csv
+import enum
+import heapq
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Iterable, List, Mapping, Sequence, Type
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def plain_value(value: Any) -> Any:
+    """Enum members and datetimes as JSON-friendly values"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_line(row: Mapping) -> str:
+    """Encode one row as a line of JSON"""
+    return json.dumps({key: plain_value(value) for key, value in row.items()}) + "\n"
+
+
+async def ndjson_chunks(batches: AsyncIterator[Iterable[Mapping]]) -> AsyncIterator[str]:
+    """Encode batches of rows as newline-delimited JSON, one chunk per batch"""
+    async for batch in batches:
+        chunk = "".join(ndjson_line(row) for row in batch)
+        if chunk:
+            yield chunk
+
+
+async def csv_chunks(batches: AsyncIterator[Iterable[Mapping]], columns: Sequence[str]) -> AsyncIterator[str]:
+    """Encode batches of rows as CSV with a header line, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            writer.writerow(["" if row[column] is None else plain_value(row[column]) for column in columns])
+        chunk = buffer.getvalue()
+        if chunk:
+            yield chunk
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    """Whether the client opted into a streamed NDJSON list response"""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def on_own_session(db: AsyncSession, stream: Callable[..., AsyncIterator], *args, **kwargs) -> AsyncIterator:
+    """Run a batch generator on a fresh session bound like db.
+
+    A streamed response keeps reading after the endpoint returns, so it
+    cannot rely on the request's session staying open.
+    """
+    async with AsyncSession(db.bind) as stream_db:
+        async for batch in stream(stream_db, *args, **kwargs):
+            yield batch
+
+
+async def ndjson_model_chunks(batches: AsyncIterator[Iterable[Any]], schema: Type[BaseModel]) -> AsyncIterator[str]:
+    """Serialize batches of rows through a response schema as NDJSON"""
+    async for batch in batches:
+        chunk = "".join(
+            schema.model_validate(dict(row) if isinstance(row, Mapping) else row).model_dump_json() + "\n"
+            for row in batch
+        )
+        if chunk:
+            yield chunk
+
+
+def ndjson_response(batches: AsyncIterator[Iterable[Any]], schema: Type[BaseModel]) -> StreamingResponse:
+    """Stream rows as NDJSON, encoding each batch as it arrives"""
+    return StreamingResponse(ndjson_model_chunks(batches, schema), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def merge_batches(
+    sources: Sequence[AsyncIterator[Iterable[Mapping]]], key: Callable[[Mapping], Any], batch_size: int
+) -> AsyncIterator[List[Mapping]]:
+    """Merge batch streams, each already sorted by key, into one sorted stream of batches.
+
+    Only the current batch of each source is held. A row whose key equals
+    the previous row's is dropped, so a row present in two sources is
+    yielded once.
+    """
+    current = [iter(()) for _ in sources]
+
+    async def next_row(index: int):
+        while True:
+            row = next(current[index], None)
+            if row is not None:
+                return row
+            try:
+                current[index] = iter(await sources[index].__anext__())
+            except StopAsyncIteration:
+                return None
+
+    heap = []
+    for index in range(len(sources)):
+        row = await next_row(index)
+        if row is not None:
+            heap.append((key(row), index, row))
+    heapq.heapify(heap)
+
+    batch, last_key = [], None
+    while heap:
+        row_key, index, row = heap[0]
+        following = await next_row(index)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (key(following), index, following))
+        if row_key == last_key:
+            continue
+        last_key = row_key
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def single_batch(rows: Iterable[Any]) -> AsyncIterator[Iterable[Any]]:
+    """Adapt rows already in memory to the batch interface"""
+    yield rows
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Archive old audit events for Cap Table Management System
+
+Audit events are kept in the database for AUDIT_RETENTION_MONTHS months.
+Older months are written to compressed segment files under AUDIT_ARCHIVE_DIR
+and purged from audit_events in batches. The audit API keeps reading them
+from the archive. Run this from cron, e.g. daily.
+"""
+import argparse
+import asyncio
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.config import settings
+from app.database import AsyncSessionLocal, async_engine, engine, Base
+from app.services import AuditService
+
+
+async def archive(retention_months: int) -> list:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await AuditService.archive_expired_async(db, retention_months=retention_months)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    """Main archive function"""
+    parser = argparse.ArgumentParser(description="Archive audit events older than the retention window")
+    parser.add_argument(
+        "--retention-months", type=int, default=settings.audit_retention_months,
+        help="months of audit events to keep in the database (default: AUDIT_RETENTION_MONTHS)"
+    )
+    args = parser.parse_args()
+
+    print("🗄️  Cap Table Management System - Audit Archive")
+    print("=" * 50)
+
+    if args.retention_months <= 0:
+        print("ℹ️  Retention is disabled; set AUDIT_RETENTION_MONTHS or pass --retention-months")
+        return True
+
+    Base.metadata.create_all(bind=engine)
+    cutoff = AuditService.archive_cutoff(args.retention_months)
+    print(f"🔄 Archiving audit events before {cutoff:%Y-%m-%d} to {settings.audit_archive_dir}/...")
+    results = asyncio.run(archive(args.retention_months))
+
+    if not results:
+        print("✅ Nothing to archive")
+        return True
+    for result in results:
+        print(f"   {result['month']}: {result['archived']} archived, {result['purged']} purged")
+    print(f"✅ Archived {sum(result['archived'] for result in results)} audit event(s)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
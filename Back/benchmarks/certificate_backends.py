@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Certificate backend benchmark for Cap Table Management System
+
+Compares the per-render cost and output size of the WeasyPrint backend,
+which lays out the HTML template, with the native backend, which writes
+the fixed certificate layout directly (app/native_pdf.py).
+
+Run from the Back directory:  python -m benchmarks.certificate_backends
+"""
+import argparse
+import sys
+from app.certificate_templates import available_themes
+from app.pdf_generator import BACKENDS, PDFCertificateGenerator
+from benchmarks.certificate_render import sample_certificate, measure
+from benchmarks.timing import summarize
+
+
+def render(generator: PDFCertificateGenerator, issuance, shareholder) -> bytes:
+    return generator.generate_certificate_pdf(issuance, shareholder)
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Benchmark certificate rendering with each PDF backend")
+    parser.add_argument("--iterations", type=int, default=20, help="renders measured per backend")
+    parser.add_argument("--theme", choices=available_themes(), default="classic", help="certificate theme to render")
+    args = parser.parse_args()
+
+    print("⏱️  Cap Table Management System - Certificate Backend Benchmark")
+    print("=" * 50)
+
+    issuance, shareholder = sample_certificate(args.theme)
+    results = {}
+    for backend in BACKENDS:
+        generator = PDFCertificateGenerator(backend)
+        results[backend] = summarize(measure(render, generator, issuance, shareholder, args.iterations))
+        results[backend]["kb"] = len(render(generator, issuance, shareholder)) / 1024
+
+    print(f"Theme: {args.theme}, {args.iterations} render(s) per backend")
+    print(f"{'backend':<12}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}{'size KB':>10}")
+    for backend, summary in results.items():
+        print(
+            f"{backend:<12}{summary['mean_ms']:>10.1f}{summary['median_ms']:>12.1f}"
+            f"{summary['p95_ms']:>10.1f}{summary['kb']:>10.1f}"
+        )
+    speedup = results["weasyprint"]["mean_ms"] / results["native"]["mean_ms"]
+    print(f"✅ Native backend renders {speedup:.0f}x as fast on average")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
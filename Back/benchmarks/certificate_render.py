@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Certificate render benchmark for Cap Table Management System
+
+Compares the per-render cost of the original approach, where every render
+builds a new FontConfiguration and WeasyPrint re-parses the inline
+stylesheet, with the compiled template, which parses each theme's
+stylesheet once and shares one font configuration per process.
+
+Run from the Back directory:  python -m benchmarks.certificate_render
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
+from app.certificate_templates import available_themes
+from app.pdf_generator import PDFCertificateGenerator
+from benchmarks.timing import summarize
+
+
+def sample_certificate(theme: str):
+    issuance = SimpleNamespace(
+        id=1,
+        certificate_number="CERT-20240101-BENCH001",
+        number_of_shares=125000,
+        price_per_share=1.25,
+        total_value=156250.0,
+        issuance_date=datetime(2024, 1, 1),
+        created_at=datetime(2024, 1, 1, 9, 30),
+        certificate_theme=theme
+    )
+    shareholder = SimpleNamespace(id=1, first_name="Ada", last_name="Lovelace")
+    return issuance, shareholder
+
+
+def render_uncompiled(generator: PDFCertificateGenerator, issuance, shareholder) -> bytes:
+    """The pre-template path: fresh font configuration, stylesheet parsed from the document"""
+    html_content = generator.generate_certificate_html(issuance, shareholder)
+    return HTML(string=html_content).write_pdf(font_config=FontConfiguration(), optimize_images=True)
+
+
+def render_compiled(generator: PDFCertificateGenerator, issuance, shareholder) -> bytes:
+    return generator.generate_certificate_pdf(issuance, shareholder)
+
+
+def measure(render, generator, issuance, shareholder, iterations: int) -> list:
+    """Seconds per render, after one warm-up render"""
+    render(generator, issuance, shareholder)
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        render(generator, issuance, shareholder)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Benchmark certificate rendering before and after template compilation")
+    parser.add_argument("--iterations", type=int, default=20, help="renders measured per variant")
+    parser.add_argument("--theme", choices=available_themes(), default="classic", help="certificate theme to render")
+    args = parser.parse_args()
+
+    print("⏱️  Cap Table Management System - Certificate Render Benchmark")
+    print("=" * 50)
+
+    generator = PDFCertificateGenerator()
+    issuance, shareholder = sample_certificate(args.theme)
+    results = {
+        "uncompiled": summarize(measure(render_uncompiled, generator, issuance, shareholder, args.iterations)),
+        "compiled": summarize(measure(render_compiled, generator, issuance, shareholder, args.iterations)),
+    }
+
+    print(f"Theme: {args.theme}, {args.iterations} render(s) per variant")
+    print(f"{'variant':<12}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}")
+    for variant, summary in results.items():
+        print(f"{variant:<12}{summary['mean_ms']:>10.1f}{summary['median_ms']:>12.1f}{summary['p95_ms']:>10.1f}")
+    speedup = results["uncompiled"]["mean_ms"] / results["compiled"]["mean_ms"]
+    print(f"✅ Compiled template renders {speedup:.2f}x as fast on average")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
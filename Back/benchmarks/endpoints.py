@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite for Cap Table Management System
+
+Seeds the schema at one or more dataset sizes, then times every read
+route, login and issuance creation through the full FastAPI stack and
+counts the SQL statements each request runs. Users and shareholder
+profiles are built with the factories from tests/factories.py; issuances
+and audit events are generated directly, since building a million of
+them through factory_boy would dominate the run. The app keeps its
+production settings: the audit sink writes in the background, render
+workers are warmed at startup and cap table checkpoints are taken.
+
+Results are written as JSON so runs on different commits can be compared:
+
+    python -m benchmarks.endpoints --scale small medium --output before.json
+    python -m benchmarks.endpoints --scale small medium --output after.json --compare before.json
+
+Use --database-url to benchmark PostgreSQL instead of a local SQLite file.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+import factory.random
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from tests.factories import UserFactory, AdminUserFactory, ShareholderProfileFactory
+from app.main import app
+from app.auth import get_password_hash, principal_cache
+from app.audit_sink import audit_sink
+from app.cache import dashboard_cache
+from app.cap_table_checkpointer import cap_table_checkpointer
+from app.certificate_cache import certificate_cache
+from app.certificate_prerender import certificate_prerenderer
+from app.database import Base, get_db, get_async_db, get_async_database_url
+from app.models import AuditAction, AuditEvent, ShareIssuance, ShareholderProfile, User
+from app.services import CapTableHistoryService, HoldingsService
+from benchmarks.timing import summarize
+
+SCALES = {
+    "small": {"shareholders": 10, "issuances": 1_000},
+    "medium": {"shareholders": 1_000, "issuances": 100_000},
+    "large": {"shareholders": 100_000, "issuances": 1_000_000},
+}
+
+PASSWORD = "benchmark"
+ADMIN_EMAIL = "admin@benchmark.example.com"
+SHAREHOLDER_EMAIL = "shareholder1@benchmark.example.com"
+INSERT_BATCH = 10_000
+FIRST_ISSUANCE = datetime(2021, 1, 1)
+LAST_ISSUANCE = datetime(2024, 1, 1)
+BULK_ISSUANCES = 100
+# Every onboarded shareholder costs a bcrypt hash, so this upload is kept small
+BULK_SHAREHOLDERS = 10
+
+
+def issuance_ledger(batch: int) -> Tuple[str, bytes, str]:
+    """CSV upload of BULK_ISSUANCES issuances to shareholder 1"""
+    lines = ["shareholder_id,number_of_shares,price_per_share,issuance_date,notes"]
+    lines += [f"1,100,1.0,2024-01-15T00:00:00,benchmark {batch}-{row}" for row in range(BULK_ISSUANCES)]
+    return "ledger.csv", "\n".join(lines).encode(), "text/csv"
+
+
+def shareholder_roster(batch: int) -> Tuple[str, bytes, str]:
+    """CSV upload of BULK_SHAREHOLDERS new shareholders; emails differ per batch so every request succeeds"""
+    lines = ["email,password,first_name,last_name,tax_id"]
+    lines += [
+        f"bulk{batch}-{row}@benchmark.example.com,{PASSWORD},Bulk{row},Batch{batch},TAXB{batch}-{row}"
+        for row in range(BULK_SHAREHOLDERS)
+    ]
+    return "people.csv", "\n".join(lines).encode(), "text/csv"
+
+
+class Route(NamedTuple):
+    name: str
+    method: str
+    path: str
+    role: Optional[str]
+    body: Optional[dict] = None
+    # Builds the uploaded file for each request from its attempt number
+    upload: Optional[Callable[[int], Tuple[str, bytes, str]]] = None
+
+
+ROUTES = [
+    Route("login", "POST", "/api/token/", None, {"username": SHAREHOLDER_EMAIL, "password": PASSWORD}),
+    Route("shareholders", "GET", "/api/shareholders/", "admin"),
+    Route("shareholder profile", "GET", "/api/shareholders/me", "shareholder"),
+    Route("issuances", "GET", "/api/issuances/", "admin"),
+    Route("issuances by value", "GET", "/api/issuances/?sort=-total_value&min_shares=5000", "admin"),
+    Route("my issuances", "GET", "/api/issuances/my", "shareholder"),
+    Route("create issuance", "POST", "/api/issuances/", "admin", {"shareholder_id": 1, "number_of_shares": 100, "price_per_share": 1.0}),
+    Route("bulk issuances", "POST", "/api/issuances/bulk", "admin", upload=issuance_ledger),
+    Route("bulk shareholders", "POST", "/api/shareholders/bulk", "admin", upload=shareholder_roster),
+    Route("certificate", "GET", "/api/issuances/1/certificate/", "admin"),
+    Route("my certificate", "GET", "/api/issuances/10/certificate/my/", "shareholder"),
+    Route("certificate batch", "GET", "/api/issuances/certificates/batch?shareholder_id=1&until=2021-01-15T00:00:00", "admin"),
+    Route("dashboard stats", "GET", "/api/dashboard/stats", "admin"),
+    Route("ownership distribution", "GET", "/api/dashboard/ownership-distribution", "admin"),
+    Route("cap table diff", "GET", "/api/dashboard/cap-table-diff?from_date=2022-01-01T00:00:00&to_date=2023-01-01T00:00:00", "admin"),
+    Route("audit", "GET", "/api/audit/", "admin"),
+    Route("audit stream", "GET", "/api/audit/?stream=true", "admin"),
+    Route("audit export", "GET", "/api/audit/export", "admin"),
+    Route("audit export csv", "GET", "/api/audit/export?format=csv", "admin"),
+    Route("pool metrics", "GET", "/api/metrics/pool", "admin"),
+    Route("cache metrics", "GET", "/api/metrics/dashboard-cache", "admin"),
+    Route("hashing metrics", "GET", "/api/metrics/password-hashing", "admin"),
+    Route("principal metrics", "GET", "/api/metrics/principal-cache", "admin"),
+    Route("audit sink metrics", "GET", "/api/metrics/audit-sink", "admin"),
+    Route("cert cache metrics", "GET", "/api/metrics/certificate-cache", "admin"),
+    Route("prerender metrics", "GET", "/api/metrics/certificate-prerender", "admin"),
+    Route("render pool metrics", "GET", "/api/metrics/certificate-render-pool", "admin"),
+]
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the given engines"""
+
+    def __init__(self, *engines):
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._executed)
+
+    def _executed(self, *args) -> None:
+        self.count += 1
+
+
+def _insert_batches(db, model, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH:
+            db.execute(insert(model), batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+
+
+def seed(session_factory, shareholders: int, issuances: int, seed_value: int) -> None:
+    """Fill a fresh schema with users, profiles, issuances and audit events"""
+    factory.random.reseed_random(seed_value)
+    rng = random.Random(seed_value)
+    # One bcrypt hash shared by every account; logins still pay the full verification cost
+    hashed_password = get_password_hash(PASSWORD)
+    span = (LAST_ISSUANCE - FIRST_ISSUANCE).total_seconds()
+
+    def user_row(user) -> dict:
+        return {"id": user.id, "email": user.email, "hashed_password": user.hashed_password, "role": user.role, "is_active": True}
+
+    def profile_row(profile) -> dict:
+        return {
+            "id": profile.id, "user_id": profile.user_id, "first_name": profile.first_name,
+            "last_name": profile.last_name, "phone": profile.phone, "address": profile.address, "tax_id": profile.tax_id
+        }
+
+    def issuance_rows():
+        for issuance_id in range(1, issuances + 1):
+            # Shareholder 1 is the benchmark login, so it is given a share of issuances to list
+            shareholder_id = 1 if issuance_id % 10 == 0 else rng.randint(1, shareholders)
+            issued_at = FIRST_ISSUANCE + timedelta(seconds=span * issuance_id / issuances)
+            shares = rng.randint(100, 10_000)
+            price = round(rng.uniform(0.5, 20.0), 2)
+            yield {
+                "id": issuance_id, "shareholder_id": shareholder_id, "number_of_shares": shares,
+                "price_per_share": price, "total_value": shares * price, "issuance_date": issued_at,
+                "certificate_number": f"CERT-{issued_at:%Y%m%d}-{issuance_id:08d}", "notes": None,
+                "created_at": issued_at.replace(tzinfo=timezone.utc)
+            }
+
+    def audit_rows():
+        for event_id in range(1, issuances + 1):
+            yield {
+                "id": event_id, "user_id": 1, "action": AuditAction.SHARE_ISSUANCE,
+                "details": f"Issued certificate {event_id}", "ip_address": "127.0.0.1", "user_agent": "benchmark",
+                "created_at": (FIRST_ISSUANCE + timedelta(seconds=span * event_id / issuances)).replace(tzinfo=timezone.utc)
+            }
+
+    with session_factory() as db:
+        _insert_batches(db, User, [user_row(AdminUserFactory.build(id=1, email=ADMIN_EMAIL, hashed_password=hashed_password))])
+        _insert_batches(db, User, (
+            user_row(UserFactory.build(
+                id=number + 1, email=f"shareholder{number}@benchmark.example.com", hashed_password=hashed_password
+            ))
+            for number in range(1, shareholders + 1)
+        ))
+        _insert_batches(db, ShareholderProfile, (
+            profile_row(ShareholderProfileFactory.build(id=number, user_id=number + 1))
+            for number in range(1, shareholders + 1)
+        ))
+        _insert_batches(db, ShareIssuance, issuance_rows())
+        _insert_batches(db, AuditEvent, audit_rows())
+        HoldingsService.rebuild(db)
+        if db.bind.dialect.name == "postgresql":
+            # Rows were inserted with explicit ids, so move the sequences past them for the create route
+            for model in (User, ShareholderProfile, ShareIssuance, AuditEvent):
+                table = model.__tablename__
+                db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"))
+        db.commit()
+
+
+def token(client: TestClient, email: str) -> str:
+    response = client.post("/api/token/", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def time_route(client: TestClient, counter: QueryCounter, route: Route, headers: Dict[str, dict], iterations: int) -> dict:
+    """Latency summary and SQL statements per request for one route, after one warm-up request"""
+    kwargs = {"headers": headers.get(route.role, {})}
+    if route.body is not None:
+        kwargs["data" if route.role is None else "json"] = route.body
+
+    timings, queries = [], []
+    for attempt in range(iterations + 1):
+        # Measure the route itself rather than the response caches in front of it
+        dashboard_cache.clear()
+        certificate_cache.clear()
+        if route.upload is not None:
+            kwargs["files"] = {"file": route.upload(attempt)}
+        before = counter.count
+        started = time.perf_counter()
+        response = client.request(route.method, route.path, **kwargs)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            return {"status": response.status_code, "error": response.text[:200] or response.reason_phrase}
+        if attempt:
+            timings.append(elapsed)
+            queries.append(counter.count - before)
+    summary = {key: round(value, 3) for key, value in summarize(timings).items()}
+    return {"status": response.status_code, **summary, "queries": round(sum(queries) / len(queries), 1)}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print each route's change against a previous run; False when any got slower or runs more queries"""
+    ok = True
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'} (regression threshold {threshold:.0%})")
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        for name, route in current["routes"].items():
+            before = previous["routes"].get(name)
+            if not before or "mean_ms" not in before or "mean_ms" not in route:
+                continue
+            change = route["mean_ms"] / before["mean_ms"] - 1
+            queries = route["queries"] - before["queries"]
+            regressed = change > threshold or queries > 0
+            print(f"{'❌' if regressed else '  '} {scale:<8}{name:<24}{change:>+9.1%}{queries:>+8.1f} queries")
+            ok = ok and not regressed
+    return ok
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Benchmark every API route over seeded datasets")
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=["small"], help="dataset sizes to run")
+    parser.add_argument("--iterations", type=int, default=5, help="timed requests per route")
+    parser.add_argument("--database-url", help="database to seed (a temporary SQLite file by default); it is wiped")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the generated data")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON file to write results to")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    print("⏱️  Cap Table Management System - Endpoint Benchmark")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="captable-benchmark-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    options = {"connect_args": {"check_same_thread": False}} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, **options)
+    async_engine = create_async_engine(get_async_database_url(database_url), poolclass=NullPool)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def benchmark_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    def benchmark_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = benchmark_db
+    app.dependency_overrides[get_async_db] = benchmark_async_db
+    audit_sink.session_factory = async_session_factory
+    cap_table_checkpointer.session_factory = async_session_factory
+    # Background pre-renders would compete with the certificate routes being timed
+    certificate_prerenderer.enabled = False
+    certificate_cache.directory = Path(workdir) / "certificate_cache"
+    counter = QueryCounter(engine, async_engine.sync_engine)
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "iterations": args.iterations,
+        "seed": args.seed,
+        "scales": {},
+    }
+    # Startup takes a checkpoint, so the schema has to exist before the app starts
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for scale in args.scale:
+            size = SCALES[scale]
+            print(f"🔄 Seeding {scale}: {size['shareholders']:,} shareholders, {size['issuances']:,} issuances...")
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            started = time.perf_counter()
+            seed(session_factory, size["shareholders"], size["issuances"], args.seed)
+            seeded = time.perf_counter() - started
+            principal_cache.clear()
+            # Checkpoints were dropped with the old schema, so take one over the new data as startup would
+            CapTableHistoryService._latest_checkpoint_at = None
+            client.portal.call(cap_table_checkpointer.checkpoint)
+
+            headers = {
+                "admin": {"Authorization": f"Bearer {token(client, ADMIN_EMAIL)}"},
+                "shareholder": {"Authorization": f"Bearer {token(client, SHAREHOLDER_EMAIL)}"},
+            }
+            routes = {}
+            print(f"{'route':<24}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}{'queries':>9}")
+            for route in ROUTES:
+                routes[route.name] = result = time_route(client, counter, route, headers, args.iterations)
+                if "error" in result:
+                    print(f"{route.name:<24}  ⚠️  HTTP {result['status']}")
+                    continue
+                print(
+                    f"{route.name:<24}{result['mean_ms']:>10.1f}{result['median_ms']:>12.1f}"
+                    f"{result['p95_ms']:>10.1f}{result['queries']:>9.1f}"
+                )
+            results["scales"][scale] = {"dataset": size, "seed_seconds": round(seeded, 1), "routes": routes}
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            return compare(results, json.load(baseline), args.threshold)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+List serialization benchmark for Cap Table Management System
+
+Encodes a large issuance listing the way FastAPI does with response_model
+(validate every ORM object into ShareIssuanceResponse, convert to JSON
+types, then stdlib json) and with the fast path (pick the schema fields
+straight from ORM objects or result rows, then orjson or MessagePack).
+
+Run from the Back directory:  python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.models import CertificateStatus, ShareIssuance
+from app.schemas import ShareIssuanceResponse
+from app import serialization
+from benchmarks.timing import summarize
+
+
+def sample_issuances(count: int) -> List[ShareIssuance]:
+    start = datetime(2020, 1, 1)
+    return [
+        ShareIssuance(
+            id=number,
+            shareholder_id=number % 500 + 1,
+            number_of_shares=1000 + number,
+            price_per_share=1.25,
+            total_value=1.25 * (1000 + number),
+            issuance_date=start + timedelta(hours=number),
+            certificate_number=f"CERT-{start:%Y%m%d}-{number:08d}",
+            certificate_status=CertificateStatus.READY,
+            certificate_theme=None,
+            notes=None,
+            created_at=(start + timedelta(hours=number)).replace(tzinfo=timezone.utc),
+            updated_at=None
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="issuances per response")
+    parser.add_argument("--iterations", type=int, default=10, help="encodings measured per variant")
+    args = parser.parse_args()
+
+    print("⏱️  Cap Table Management System - Serialization Benchmark")
+    print("=" * 50)
+
+    issuances = sample_issuances(args.rows)
+    Row = namedtuple("Row", serialization.schema_fields(ShareIssuanceResponse))
+    rows = [Row(*(getattr(issuance, field) for field in Row._fields)) for issuance in issuances]
+    adapter = TypeAdapter(List[ShareIssuanceResponse])
+
+    variants = {
+        "schema": lambda: JSONResponse(
+            adapter.dump_python(adapter.validate_python(issuances, from_attributes=True), mode="json")
+        ).body,
+        "fast orm": lambda: serialization.encode_json(serialization.plain_rows(issuances, ShareIssuanceResponse)),
+        "fast rows": lambda: serialization.encode_json(serialization.plain_rows(rows, ShareIssuanceResponse)),
+    }
+    if serialization.msgpack is not None:
+        variants["msgpack rows"] = lambda: serialization.encode_msgpack(
+            serialization.plain_rows(rows, ShareIssuanceResponse)
+        )
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json (orjson not installed)"
+
+    results = {}
+    for variant, encode in variants.items():
+        size = len(encode())
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            encode()
+            timings.append(time.perf_counter() - started)
+        results[variant] = dict(summarize(timings), kb=size / 1024)
+
+    print(f"{args.rows} issuances per response, {args.iterations} encoding(s) per variant, fast path uses {encoder}")
+    print(f"{'variant':<14}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}{'size KB':>10}")
+    for variant, summary in results.items():
+        print(
+            f"{variant:<14}{summary['mean_ms']:>10.1f}{summary['median_ms']:>12.1f}"
+            f"{summary['p95_ms']:>10.1f}{summary['kb']:>10.1f}"
+        )
+    speedup = results["schema"]["mean_ms"] / results["fast rows"]["mean_ms"]
+    print(f"✅ Fast path encodes {speedup:.1f}x as fast on average")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
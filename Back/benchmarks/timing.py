@@ -0,0 +1,11 @@
+import statistics
+
+
+def summarize(timings: list) -> dict:
+    """Mean, median and 95th percentile of timings in seconds, as milliseconds"""
+    ordered = sorted(timings)
+    return {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
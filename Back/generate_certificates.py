@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Batch share certificate generation for Cap Table Management System
+
+Renders certificates for every issuance, or those of one shareholder or
+date range, across a process pool. Writes a ZIP with one PDF per
+certificate, or a single merged PDF with --format pdf.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.certificate_batch import (
+    certificate_process_count, shutdown_certificate_process_pool, render_certificates, zip_chunks, collect_jobs,
+    render_merged
+)
+from app.config import settings
+from app.pdf_generator import BACKENDS
+from app.database import AsyncSessionLocal, async_engine, engine, Base
+from app.services import ShareIssuanceService
+
+
+async def write_zip(path: str, filters: dict, backend: str) -> int:
+    count = 0
+    async with AsyncSessionLocal() as db:
+        documents = render_certificates(ShareIssuanceService.stream_certificate_rows_async(db, **filters), backend)
+
+        async def counted():
+            nonlocal count
+            async for document in documents:
+                count += 1
+                yield document
+
+        with open(path, "wb") as output:
+            async for chunk in zip_chunks(counted()):
+                output.write(chunk)
+    return count
+
+
+async def write_merged(path: str, filters: dict, backend: str) -> int:
+    async with AsyncSessionLocal() as db:
+        jobs = await collect_jobs(
+            ShareIssuanceService.stream_certificate_rows_async(db, **filters), settings.certificate_merge_limit
+        )
+    if len(jobs) > settings.certificate_merge_limit:
+        raise ValueError(f"Merged PDFs are limited to {settings.certificate_merge_limit} certificates; use --format zip")
+    if jobs:
+        pdf = await render_merged(jobs, backend)
+        with open(path, "wb") as output:
+            output.write(pdf)
+    return len(jobs)
+
+
+def main():
+    """Main certificate generation function"""
+    parser = argparse.ArgumentParser(description="Render share certificates in bulk")
+    parser.add_argument("--format", choices=["zip", "pdf"], default="zip", help="one PDF per certificate in a ZIP, or one merged PDF")
+    parser.add_argument("--output", help="file to write (certificates.zip or certificates.pdf by default)")
+    parser.add_argument("--shareholder-id", type=int, help="only include issuances to this shareholder")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only include issuances on or after this date")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="only include issuances before this date")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=settings.certificate_backend, help="PDF backend to render with")
+    args = parser.parse_args()
+
+    print("📜 Cap Table Management System - Certificate Generation")
+    print("=" * 50)
+
+    output = args.output or f"certificates.{args.format}"
+    filters = {"shareholder_id": args.shareholder_id, "since": args.since, "until": args.until}
+    write = write_zip if args.format == "zip" else write_merged
+
+    Base.metadata.create_all(bind=engine)
+    print(f"🔄 Rendering certificates with {args.backend} using {certificate_process_count()} process(es)...")
+    started = time.perf_counter()
+    try:
+        count = asyncio.run(write(output, filters, args.backend))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    finally:
+        shutdown_certificate_process_pool()
+        asyncio.run(async_engine.dispose())
+    elapsed = time.perf_counter() - started
+
+    if not count:
+        print("⚠️  No issuances match")
+        return False
+
+    print(f"✅ Wrote {count} certificate(s) to {output} in {elapsed:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
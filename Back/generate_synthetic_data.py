@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Synthetic cap table generator for Cap Table Management System
+
+Fills the configured database with production-sized, realistic data to
+reproduce scale problems locally:
+
+- ownership is skewed: a few shareholders receive most issuances (Zipf)
+- issuances arrive in bursts around funding rounds, with a trickle of
+  grants in between, at a price per share that rises over time
+- the audit log is dominated by logins during business hours
+
+Rows are written in large batches (COPY on PostgreSQL, multi-row inserts
+elsewhere) with one precomputed password hash, and the same --seed always
+produces the same data. New rows are appended after the existing ones;
+cap table checkpoints the back-dated issuances invalidate are dropped and
+holdings are rebuilt at the end.
+"""
+import argparse
+import csv
+import enum
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Sequence
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from sqlalchemy import func, insert, select, text
+from app.auth import get_password_hash
+from app.database import SessionLocal, engine, Base
+from app.models import AuditAction, AuditEvent, ShareIssuance, ShareholderProfile, User, UserRole
+from app.services import CapTableHistoryService, HoldingsService
+
+FIRST_NAMES = [
+    "Ada", "Alan", "Amara", "Ana", "Arjun", "Beatriz", "Carlos", "Chen", "Chloe", "Daniel", "Elena", "Emeka",
+    "Fatima", "Grace", "Hana", "Hugo", "Ines", "Ivan", "Jamal", "Julia", "Kenji", "Lars", "Leila", "Lucas",
+    "Maya", "Mateo", "Mei", "Nadia", "Noah", "Olga", "Omar", "Priya", "Rafael", "Sara", "Sofia", "Tariq",
+    "Tomas", "Yara", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Adeyemi", "Andersen", "Bauer", "Chen", "Costa", "Dubois", "Fernandes", "Garcia", "Haddad", "Ivanova",
+    "Jensen", "Kim", "Kowalski", "Larsen", "Lopez", "Mensah", "Moreau", "Nakamura", "Novak", "Okafor",
+    "Patel", "Petrov", "Quinn", "Rossi", "Santos", "Schmidt", "Silva", "Singh", "Tanaka", "Yilmaz",
+]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) AppleWebKit/605.1.15 Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "python-requests/2.31.0",
+]
+# Share of audit events per action: the log is mostly logins
+AUDIT_MIX = [
+    (AuditAction.LOGIN, 0.86),
+    (AuditAction.SHARE_ISSUANCE, 0.10),
+    (AuditAction.SHAREHOLDER_CREATED, 0.03),
+    (AuditAction.SHAREHOLDER_UPDATED, 0.01),
+]
+# Issuances outside a funding round (option grants, transfers)
+BACKGROUND_SHARE = 0.2
+
+
+def zipf_cum_weights(count: int, exponent: float) -> List[float]:
+    """Cumulative weights where rank r is picked in proportion to 1 / r**exponent"""
+    total, weights = 0.0, []
+    for rank in range(1, count + 1):
+        total += rank ** -exponent
+        weights.append(total)
+    return weights
+
+
+def business_hours(rng: random.Random, start: datetime, days: int) -> datetime:
+    """A weekday timestamp, clustered around early afternoon"""
+    day = start + timedelta(days=rng.randrange(days))
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    hour = min(max(rng.gauss(13, 2.5), 0), 23.99)
+    return day + timedelta(hours=hour)
+
+
+def user_rows(first_id: int, count: int, admins: int, hashed_password: str) -> Iterator[dict]:
+    for offset in range(count):
+        user_id = first_id + offset
+        yield {
+            "id": user_id,
+            "email": f"{'admin' if offset < admins else 'shareholder'}{user_id}@synthetic.example.com",
+            "hashed_password": hashed_password,
+            "role": UserRole.ADMIN if offset < admins else UserRole.SHAREHOLDER,
+            "is_active": True,
+        }
+
+
+def profile_rows(rng: random.Random, first_id: int, first_user_id: int, count: int) -> Iterator[dict]:
+    for offset in range(count):
+        profile_id = first_id + offset
+        yield {
+            "id": profile_id,
+            "user_id": first_user_id + offset,
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "phone": f"+1555{rng.randrange(10 ** 7):07d}",
+            "address": f"{rng.randint(1, 9999)} {rng.choice(LAST_NAMES)} Street",
+            "tax_id": f"SYN{profile_id:09d}",
+        }
+
+
+def issuance_rows(
+    rng: random.Random, first_id: int, count: int, shareholder_ids: Sequence[int], start: datetime, days: int,
+    rounds: int, skew: float
+) -> Iterator[dict]:
+    cum_weights = zipf_cum_weights(len(shareholder_ids), skew)
+    # Shuffle so the largest holders are not simply the oldest profiles
+    holders = list(shareholder_ids)
+    rng.shuffle(holders)
+    round_dates = sorted(start + timedelta(days=rng.uniform(0, days)) for _ in range(rounds))
+    end = start + timedelta(days=days)
+
+    batch = 10_000
+    for batch_start in range(0, count, batch):
+        size = min(batch, count - batch_start)
+        for offset, shareholder_id in enumerate(rng.choices(holders, cum_weights=cum_weights, k=size)):
+            issuance_id = first_id + batch_start + offset
+            if rng.random() < BACKGROUND_SHARE:
+                issued_at = start + timedelta(days=rng.uniform(0, days))
+            else:
+                # Closing paperwork trails each round by a few days
+                issued_at = min(rng.choice(round_dates) + timedelta(days=abs(rng.gauss(0, 4))), end)
+            years = (issued_at - start).days / 365.25
+            price = round(0.25 * 1.8 ** years * rng.uniform(0.9, 1.1), 4)
+            shares = max(1, int(rng.lognormvariate(7, 1.6)))
+            yield {
+                "id": issuance_id,
+                "shareholder_id": shareholder_id,
+                "number_of_shares": shares,
+                "price_per_share": price,
+                "total_value": shares * price,
+                "issuance_date": issued_at,
+                "certificate_number": f"SYN-{issued_at:%Y%m%d}-{issuance_id:09d}",
+                "notes": None,
+                "created_at": issued_at.replace(tzinfo=timezone.utc),
+            }
+
+
+def audit_rows(
+    rng: random.Random, first_id: int, count: int, user_ids: Sequence[int], start: datetime, days: int, skew: float
+) -> Iterator[dict]:
+    cum_weights = zipf_cum_weights(len(user_ids), skew)
+    users = list(user_ids)
+    rng.shuffle(users)
+    actions = [action for action, _ in AUDIT_MIX]
+    action_weights = [share for _, share in AUDIT_MIX]
+
+    batch = 10_000
+    for batch_start in range(0, count, batch):
+        size = min(batch, count - batch_start)
+        chosen_users = rng.choices(users, cum_weights=cum_weights, k=size)
+        chosen_actions = rng.choices(actions, weights=action_weights, k=size)
+        for offset, (user_id, action) in enumerate(zip(chosen_users, chosen_actions)):
+            yield {
+                "id": first_id + batch_start + offset,
+                "user_id": user_id,
+                "action": action,
+                "details": f"Synthetic {action.value.replace('_', ' ')} by user {user_id}",
+                "ip_address": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                "user_agent": rng.choice(USER_AGENTS),
+                "created_at": business_hours(rng, start, days).replace(tzinfo=timezone.utc),
+            }
+
+
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy stores Python enums by member name
+        return value.name
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy(connection, table, columns: List[str], batch: List[dict]) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(row[column]) for column in columns] for row in batch)
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def load(model, rows: Iterable[dict], batch_size: int) -> int:
+    """Write rows in batches of batch_size, one transaction each; returns the row count"""
+    table = model.__table__
+    use_copy = engine.dialect.name == "postgresql"
+    written, batch = 0, []
+
+    def flush():
+        with engine.begin() as connection:
+            if use_copy:
+                _copy(connection, table, list(batch[0]), batch)
+            else:
+                connection.execute(insert(table), batch)
+
+    started = time.perf_counter()
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+            print(f"   {table.name}: {written:,} rows ({written / (time.perf_counter() - started):,.0f}/s)", end="\r")
+    if batch:
+        flush()
+        written += len(batch)
+    print(f"   {table.name}: {written:,} rows in {time.perf_counter() - started:.1f}s" + " " * 20)
+    return written
+
+
+def next_id(model) -> int:
+    with engine.connect() as connection:
+        return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def reset_sequences() -> None:
+    """Move PostgreSQL id sequences past the explicitly numbered rows"""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        for model in (User, ShareholderProfile, ShareIssuance, AuditEvent):
+            table = model.__tablename__
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            ))
+
+
+def main():
+    """Main generation function"""
+    parser = argparse.ArgumentParser(description="Generate a large synthetic cap table")
+    parser.add_argument("--shareholders", type=int, default=10_000, help="shareholder accounts to create")
+    parser.add_argument("--admins", type=int, default=5, help="admin accounts to create")
+    parser.add_argument("--issuances", type=int, default=100_000, help="share issuances to create")
+    parser.add_argument("--audit-events", type=int, default=200_000, help="audit events to create")
+    parser.add_argument("--rounds", type=int, default=12, help="funding rounds the issuances cluster around")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for ownership and activity (0 is uniform)")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2019, 1, 1), help="first issuance date")
+    parser.add_argument("--years", type=float, default=5, help="years of history to generate")
+    parser.add_argument("--password", default="synthetic123", help="password for every generated account")
+    parser.add_argument("--seed", type=int, default=1, help="random seed; the same seed generates the same data")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="rows per insert batch")
+    args = parser.parse_args()
+
+    print("🏭 Cap Table Management System - Synthetic Data Generator")
+    print("=" * 50)
+
+    if args.shareholders < 1 or args.admins < 1:
+        print("❌ At least one shareholder and one admin are needed")
+        return False
+
+    Base.metadata.create_all(bind=engine)
+    days = max(1, int(args.years * 365.25))
+    # Separate streams, so changing one table's size leaves the others' data unchanged
+    streams: Dict[str, random.Random] = {name: random.Random(f"{args.seed}-{name}") for name in ("profiles", "issuances", "audit")}
+
+    first_user_id = next_id(User)
+    first_profile_id = next_id(ShareholderProfile)
+    user_count = args.admins + args.shareholders
+    # Hashed once: bcrypt per row would take hours at this scale
+    hashed_password = get_password_hash(args.password)
+
+    print(f"🔄 Writing {user_count:,} users, {args.issuances:,} issuances and {args.audit_events:,} audit events...")
+    started = time.perf_counter()
+    load(User, user_rows(first_user_id, user_count, args.admins, hashed_password), args.batch_size)
+    load(
+        ShareholderProfile,
+        profile_rows(streams["profiles"], first_profile_id, first_user_id + args.admins, args.shareholders),
+        args.batch_size
+    )
+    shareholder_ids = range(first_profile_id, first_profile_id + args.shareholders)
+    first_issuance_id = next_id(ShareIssuance)
+    load(
+        ShareIssuance,
+        issuance_rows(
+            streams["issuances"], first_issuance_id, args.issuances, shareholder_ids, args.start, days,
+            args.rounds, args.skew
+        ),
+        args.batch_size
+    )
+    user_ids = range(first_user_id, first_user_id + user_count)
+    load(
+        AuditEvent,
+        audit_rows(streams["audit"], next_id(AuditEvent), args.audit_events, user_ids, args.start, days, args.skew),
+        args.batch_size
+    )
+    reset_sequences()
+
+    db = SessionLocal()
+    try:
+        earliest = db.scalar(select(func.min(ShareIssuance.issuance_date)).where(ShareIssuance.id >= first_issuance_id))
+        if earliest is not None:
+            # Issuances are back-dated from --start, so later checkpoints no longer include them
+            dropped = CapTableHistoryService.invalidate_from(db, earliest)
+            db.commit()
+            print(f"🔄 Dropped {dropped:,} cap table checkpoint(s) from {earliest:%Y-%m-%d} on")
+        print("🔄 Rebuilding holdings...")
+        written, _ = HoldingsService.rebuild(db)
+    finally:
+        db.close()
+
+    print(f"✅ Generated in {time.perf_counter() - started:.1f}s; {written:,} holding(s) written")
+    print(f"   Log in as admin{first_user_id}@synthetic.example.com / {args.password}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Bulk shareholder onboarding for Cap Table Management System
+
+Streams a CSV or JSON lines file of shareholders (email, password,
+first_name, last_name, phone, address, tax_id) into the database,
+hashing passwords across all cores.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.auth import shutdown_hashing_process_pool, hashing_process_count
+from app.bulk_import import detect_format, iter_records
+from app.database import AsyncSessionLocal, async_engine, engine, Base
+from app.services import ShareholderService
+
+
+async def onboard(path: str, fmt: str, allow_partial: bool) -> dict:
+    with open(path, encoding="utf-8-sig", newline="") as source:
+        async with AsyncSessionLocal() as db:
+            return await ShareholderService.bulk_onboard_async(db, iter_records(source, fmt), allow_partial=allow_partial)
+
+
+def main():
+    """Main onboarding function"""
+    parser = argparse.ArgumentParser(description="Onboard shareholders from a CSV or JSON lines file")
+    parser.add_argument("path", help="file of shareholders to create")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (detected from the extension by default)")
+    parser.add_argument("--allow-partial", action="store_true", help="create valid shareholders even if some rows fail")
+    args = parser.parse_args()
+
+    print("🚀 Cap Table Management System - Shareholder Onboarding")
+    print("=" * 50)
+
+    try:
+        fmt = detect_format(args.path, None, args.format)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    Base.metadata.create_all(bind=engine)
+    print(f"🔄 Onboarding shareholders from {args.path} using {hashing_process_count()} hashing process(es)...")
+    started = time.perf_counter()
+    try:
+        result = asyncio.run(onboard(args.path, fmt, args.allow_partial))
+    finally:
+        shutdown_hashing_process_pool()
+        asyncio.run(async_engine.dispose())
+    elapsed = time.perf_counter() - started
+
+    for error in result["errors"]:
+        print(f"   line {error['line']}: {error['error']}")
+    if result["errors"] and not args.allow_partial:
+        print(f"❌ {result['failed']} invalid row(s); no shareholders were created")
+        return False
+
+    print(f"✅ Onboarded {result['imported']} of {result['received']} shareholder(s) in {elapsed:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
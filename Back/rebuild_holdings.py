@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Verify or rebuild the shareholder holdings summary for Cap Table Management System
+
+The shareholder_holdings and company_totals tables are maintained incrementally
+on every issuance. This script recomputes them from the raw share_issuances
+table and reports any drift; pass --rebuild to rewrite the drifted rows.
+"""
+import argparse
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.database import SessionLocal, engine, Base
+from app.services import HoldingsService
+
+
+def main():
+    """Main verify/rebuild function"""
+    parser = argparse.ArgumentParser(description="Verify or rebuild shareholder holdings")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite drifted holdings from raw issuances")
+    args = parser.parse_args()
+
+    print("🔍 Cap Table Management System - Holdings Verification")
+    print("=" * 50)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        drift = HoldingsService.find_drift(db)
+        if not drift:
+            print("✅ Holdings match the raw issuances")
+            return True
+
+        print(f"⚠️  Found {len(drift)} drifted value(s):")
+        for entry in drift:
+            print(f"   {entry['scope']} {entry['field']}: expected {entry['expected']}, stored {entry['actual']}")
+
+        if not args.rebuild:
+            print("\n   Run with --rebuild to recompute holdings from issuances")
+            return False
+
+        print("🔄 Rebuilding holdings...")
+        written, deleted = HoldingsService.rebuild(db)
+        print(f"✅ Rebuild completed: {written} holding(s) written, {deleted} orphaned holding(s) removed")
+        return True
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -2,13 +2,19 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool, NullPool
 from app.main import app
-from app.database import get_db, Base
-from app.models import User, UserRole, ShareholderProfile
-from app.auth import get_password_hash
-import factory
-from factory.fuzzy import FuzzyText, FuzzyInteger
+from app.config import settings
+from app.database import get_db, get_async_db, Base
+from app.auth import principal_cache
+from app.cache import dashboard_cache
+from app.audit_sink import audit_sink
+from app.certificate_cache import certificate_cache
+from app.cap_table_checkpointer import cap_table_checkpointer
+from app.certificate_prerender import certificate_prerenderer
+from app.certificate_render_pool import certificate_render_pool
+from tests.factories import UserFactory, AdminUserFactory, ShareholderProfileFactory
 
 
 # Test database
@@ -20,6 +26,11 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database file, used by the API routes
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def override_get_db():
     """Override database dependency for testing"""
@@ -30,13 +41,35 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    """Override async database dependency for testing"""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+# Tests read audit rows straight after each request, so write them synchronously
+audit_sink.enabled = False
+audit_sink.session_factory = TestingAsyncSessionLocal
+certificate_prerenderer.enabled = False
+certificate_prerenderer.session_factory = TestingAsyncSessionLocal
+certificate_render_pool.warm = False
+cap_table_checkpointer.enabled = False
+cap_table_checkpointer.session_factory = TestingAsyncSessionLocal
+# Certificates render with the dependency-free backend, so the tests run where WeasyPrint's pango is missing
+settings.certificate_backend = "native"
 
 
 @pytest.fixture
-def client():
+def client(tmp_path):
     """Test client fixture"""
     Base.metadata.create_all(bind=engine)
+    dashboard_cache.clear()
+    principal_cache.clear()
+    certificate_cache.directory = tmp_path / "certificate_cache"
+    certificate_cache.clear()
     with TestClient(app) as c:
         yield c
     Base.metadata.drop_all(bind=engine)
@@ -54,32 +87,6 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
-# Factory classes for test data
-class UserFactory(factory.Factory):
-    class Meta:
-        model = User
-    
-    email = factory.Sequence(lambda n: f"user{n}@example.com")
-    hashed_password = factory.LazyFunction(lambda: get_password_hash("testpassword"))
-    role = UserRole.SHAREHOLDER
-    is_active = True
-
-
-class AdminUserFactory(UserFactory):
-    role = UserRole.ADMIN
-
-
-class ShareholderProfileFactory(factory.Factory):
-    class Meta:
-        model = ShareholderProfile
-    
-    first_name = FuzzyText(length=10)
-    last_name = FuzzyText(length=10)
-    phone = factory.Sequence(lambda n: f"+1234567890{n}")
-    address = factory.Faker('address')
-    tax_id = factory.Sequence(lambda n: f"TAX{n:06d}")
-
-
 @pytest.fixture
 def admin_user(db_session):
     """Create admin user for testing"""
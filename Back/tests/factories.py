@@ -0,0 +1,31 @@
+import factory
+from factory.fuzzy import FuzzyText
+from app.auth import get_password_hash
+from app.models import User, UserRole, ShareholderProfile
+
+
+# Factory classes for test data, kept apart from conftest so importing them
+# does not reconfigure the app for tests
+class UserFactory(factory.Factory):
+    class Meta:
+        model = User
+    
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    hashed_password = factory.LazyFunction(lambda: get_password_hash("testpassword"))
+    role = UserRole.SHAREHOLDER
+    is_active = True
+
+
+class AdminUserFactory(UserFactory):
+    role = UserRole.ADMIN
+
+
+class ShareholderProfileFactory(factory.Factory):
+    class Meta:
+        model = ShareholderProfile
+    
+    first_name = FuzzyText(length=10)
+    last_name = FuzzyText(length=10)
+    phone = factory.Sequence(lambda n: f"+1234567890{n}")
+    address = factory.Faker('address')
+    tax_id = factory.Sequence(lambda n: f"TAX{n:06d}")
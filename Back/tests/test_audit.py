@@ -0,0 +1,132 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from fastapi import status
+from app.models import AuditEvent, AuditAction
+from app.services import AuditService
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def _seed_events(db_session, user_id, count, start=datetime(2024, 1, 1)):
+    for i in range(count):
+        db_session.add(AuditEvent(
+            user_id=user_id,
+            action=AuditAction.SHARE_ISSUANCE if i % 2 else AuditAction.SHAREHOLDER_CREATED,
+            details=f"event {i}",
+            created_at=start + timedelta(minutes=i)
+        ))
+    db_session.commit()
+
+
+class TestAuditLogPagination:
+    def test_cursor_walks_every_event_once(self, client, admin_token, admin_user, db_session):
+        """Test following X-Next-Cursor returns each event exactly once, newest first"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        db_session.query(AuditEvent).delete()
+        db_session.commit()
+        _seed_events(db_session, admin_user.id, 7)
+
+        seen = []
+        params = {"limit": 3}
+        while True:
+            response = client.get("/api/audit/", params=params, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [event["details"] for event in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 3, "cursor": cursor}
+
+        assert seen == [f"event {i}" for i in reversed(range(7))]
+
+    def test_filters(self, client, admin_token, admin_user, shareholder_user, db_session):
+        """Test action, user and time range filters combine"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        _seed_events(db_session, admin_user.id, 6)
+        _seed_events(db_session, shareholder_user.id, 2)
+
+        response = client.get("/api/audit/", params={
+            "action": AuditAction.SHARE_ISSUANCE.value,
+            "user_id": admin_user.id,
+            "since": "2024-01-01T00:02:00",
+            "until": "2024-01-01T00:05:00"
+        }, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [event["details"] for event in response.json()] == ["event 3"]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client, admin_token):
+        """Test a malformed cursor is rejected"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/audit/", params={"cursor": "not-a-cursor"}, headers=headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_audit_logs_shareholder_forbidden(self, client, shareholder_token):
+        """Test shareholder cannot read audit logs"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.get("/api/audit/", headers=headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestAuditLogExport:
+    def test_export_ndjson(self, client, admin_token, admin_user, db_session):
+        """Test the NDJSON export streams every matching event oldest first"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        _seed_events(db_session, admin_user.id, 5)
+
+        response = client.get("/api/audit/export", params={"until": "2024-02-01T00:00:00"}, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["details"] for event in events] == [f"event {i}" for i in range(5)]
+        assert events[1]["action"] == AuditAction.SHARE_ISSUANCE.value
+
+    def test_export_csv_filtered(self, client, admin_token, admin_user, db_session):
+        """Test the CSV export honours the action filter"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        _seed_events(db_session, admin_user.id, 5)
+
+        response = client.get("/api/audit/export", params={
+            "format": "csv",
+            "action": AuditAction.SHAREHOLDER_CREATED.value
+        }, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert list(rows[0].keys()) == list(AuditService.EXPORT_COLUMNS)
+        assert [row["details"] for row in rows] == ["event 0", "event 2", "event 4"]
+
+    def test_export_fetches_in_chunks(self, db_session, admin_user):
+        """Test rows are fetched from the cursor in chunk_size batches"""
+        _seed_events(db_session, admin_user.id, 5)
+
+        async def run():
+            async with TestingAsyncSessionLocal() as db:
+                return [len(batch) async for batch in AuditService.stream_audit_events_async(db, chunk_size=2)]
+
+        assert asyncio.run(run()) == [2, 2, 1]
+
+    def test_list_stream_ndjson(self, client, admin_token, admin_user, db_session):
+        """Test the audit list streams in the response schema when asked for NDJSON"""
+        headers = {"Authorization": f"Bearer {admin_token}", "Accept": "application/x-ndjson"}
+        _seed_events(db_session, admin_user.id, 3)
+
+        response = client.get("/api/audit/", params={"until": "2024-02-01T00:00:00", "limit": 1}, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["details"] for event in events] == ["event 0", "event 1", "event 2"]
+        assert set(events[0]) == {"id", "user_id", "action", "details", "ip_address", "user_agent", "created_at"}
+
+    def test_export_shareholder_forbidden(self, client, shareholder_token):
+        """Test shareholder cannot export audit logs"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.get("/api/audit/export", headers=headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
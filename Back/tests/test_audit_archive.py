@@ -0,0 +1,147 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+import pytest
+from fastapi import status
+from app.audit_archive import audit_archive
+from app.models import AuditEvent, AuditAction
+from app.services import AuditService
+from tests.conftest import TestingAsyncSessionLocal
+
+NOW = datetime(2024, 4, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    """Point the audit archive at a temporary directory"""
+    monkeypatch.setattr(audit_archive, "directory", tmp_path)
+    return tmp_path
+
+
+def _add_events(db_session, user_id, *timestamps, action=AuditAction.LOGIN):
+    for created_at in timestamps:
+        db_session.add(AuditEvent(user_id=user_id, action=action, details=created_at.isoformat(), created_at=created_at))
+    db_session.commit()
+
+
+def _archive(retention_months=1):
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await AuditService.archive_expired_async(db, retention_months=retention_months, now=NOW)
+    return asyncio.run(run())
+
+
+class TestAuditArchive:
+    def test_archive_cutoff(self):
+        """Test the retention window counts whole months back from the current one"""
+        assert AuditService.archive_cutoff(1, NOW) == datetime(2024, 3, 1, tzinfo=timezone.utc)
+        assert AuditService.archive_cutoff(4, NOW) == datetime(2023, 12, 1, tzinfo=timezone.utc)
+
+    def test_archive_and_purge(self, db_session, admin_user, archive_dir):
+        """Test months past retention move to compressed segments and leave the table"""
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5), datetime(2024, 1, 20), datetime(2024, 2, 3))
+        _add_events(db_session, admin_user.id, datetime(2024, 3, 10), datetime(2024, 4, 1))
+
+        results = _archive()
+
+        assert results == [
+            {"month": "2024-01", "archived": 2, "purged": 2},
+            {"month": "2024-02", "archived": 1, "purged": 1},
+        ]
+        assert (archive_dir / "2024-01" / "part-0001.ndjson.gz").exists()
+        manifest = json.loads((archive_dir / "2024-01" / "manifest.json").read_text())
+        assert manifest["parts"][0]["count"] == 2
+        assert db_session.query(AuditEvent).count() == 2
+
+    def test_rerun_archives_late_rows_only(self, db_session, admin_user, archive_dir):
+        """Test rows arriving for an archived month go into a new part without duplicates"""
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5))
+        _archive()
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 6))
+
+        assert _archive() == [{"month": "2024-01", "archived": 1, "purged": 1}]
+        assert _archive() == []
+        assert [row["details"] for row in audit_archive.iter_month(datetime(2024, 1, 1, tzinfo=timezone.utc))] == [
+            "2024-01-05T00:00:00", "2024-01-06T00:00:00"
+        ]
+
+    def test_newest_archived_at_is_kept_in_memory(self, db_session, admin_user, archive_dir, monkeypatch):
+        """Test page requests reuse the newest archived timestamp and archiving moves it forward"""
+        assert asyncio.run(audit_archive.newest_archived_at_async()) is None
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5))
+        _archive()
+
+        def read_manifests():
+            raise AssertionError("manifests read again")
+        monkeypatch.setattr(audit_archive, "newest_archived_at", read_manifests)
+        assert asyncio.run(audit_archive.newest_archived_at_async()) == datetime(2024, 1, 5, tzinfo=timezone.utc)
+
+
+class TestAuditArchiveQueryThrough:
+    def test_pages_continue_into_archive(self, client, admin_token, admin_user, db_session, archive_dir):
+        """Test cursor pagination walks from live events into archived months"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        db_session.query(AuditEvent).delete()
+        db_session.commit()
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5), datetime(2024, 2, 3), datetime(2024, 2, 4))
+        _add_events(db_session, admin_user.id, datetime(2024, 3, 10), datetime(2024, 4, 1))
+        _archive()
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/api/audit/", params=params, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [event["details"] for event in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+        assert seen == [
+            "2024-04-01T00:00:00", "2024-03-10T00:00:00", "2024-02-04T00:00:00",
+            "2024-02-03T00:00:00", "2024-01-05T00:00:00"
+        ]
+
+    def test_filters_apply_to_archive(self, client, admin_token, admin_user, db_session, archive_dir):
+        """Test action and time filters are applied to archived events"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5), datetime(2024, 2, 3))
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 6), action=AuditAction.SHARE_ISSUANCE)
+        _archive()
+
+        response = client.get("/api/audit/", params={
+            "action": AuditAction.SHARE_ISSUANCE.value,
+            "until": "2024-03-01T00:00:00"
+        }, headers=headers)
+
+        assert [event["details"] for event in response.json()] == ["2024-01-06T00:00:00"]
+
+    def test_export_includes_archive(self, client, admin_token, admin_user, db_session, archive_dir):
+        """Test the export streams archived months and live events in time order"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5), datetime(2024, 3, 10))
+        _archive()
+
+        response = client.get("/api/audit/export", params={"until": "2024-04-01T00:00:00"}, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        details = [json.loads(line)["details"] for line in response.text.splitlines()]
+        assert details == ["2024-01-05T00:00:00", "2024-03-10T00:00:00"]
+
+    def test_export_merges_overlapping_archive(self, client, admin_token, admin_user, db_session, archive_dir):
+        """Test late live rows inside an archived month are exported in order, and unpurged rows once"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        db_session.query(AuditEvent).delete()
+        db_session.commit()
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 5), datetime(2024, 1, 20))
+        _archive()
+        # An archived row whose purge has not run yet is still in the table
+        archived = next(audit_archive.batches(lambda row: True))[0]
+        db_session.add(AuditEvent(**{**archived, "action": AuditAction(archived["action"])}))
+        db_session.commit()
+        _add_events(db_session, admin_user.id, datetime(2024, 1, 10), datetime(2024, 3, 10))
+
+        response = client.get("/api/audit/export", params={"until": "2024-04-01T00:00:00"}, headers=headers)
+
+        details = [json.loads(line)["details"] for line in response.text.splitlines()]
+        assert details == ["2024-01-05T00:00:00", "2024-01-10T00:00:00", "2024-01-20T00:00:00", "2024-03-10T00:00:00"]
@@ -0,0 +1,77 @@
+import asyncio
+from fastapi import status
+from app.audit_sink import AuditSink
+from app.models import AuditEvent, AuditAction
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def _sink(**kwargs) -> AuditSink:
+    options = {"batch_size": 10, "flush_interval": 60, "max_buffer": 100}
+    options.update(kwargs)
+    sink = AuditSink(**options)
+    sink.session_factory = TestingAsyncSessionLocal
+    return sink
+
+
+class TestAuditSink:
+    def test_flush_writes_in_batches(self, db_session, admin_user):
+        """Test buffered events are inserted in batch_size chunks"""
+        sink = _sink(batch_size=4)
+        for i in range(10):
+            sink.enqueue(admin_user.id, AuditAction.LOGIN, details=f"login {i}")
+
+        assert asyncio.run(sink.flush()) is True
+        assert db_session.query(AuditEvent).count() == 10
+        assert sink.stats()["batches"] == 3
+        assert sink.stats()["buffered"] == 0
+
+    def test_stop_drains_buffer(self, db_session, admin_user):
+        """Test stopping the sink writes events the interval has not flushed yet"""
+        sink = _sink()
+
+        async def run():
+            sink.start()
+            sink.enqueue(admin_user.id, AuditAction.LOGIN)
+            assert sink.running
+            await sink.stop()
+
+        asyncio.run(run())
+        assert db_session.query(AuditEvent).count() == 1
+        assert not sink.running
+
+    def test_batch_size_triggers_flush(self, db_session, admin_user):
+        """Test a full batch is written without waiting for the interval"""
+        sink = _sink(batch_size=2)
+
+        async def run():
+            sink.start()
+            sink.enqueue(admin_user.id, AuditAction.LOGIN)
+            sink.enqueue(admin_user.id, AuditAction.LOGIN)
+            for _ in range(100):
+                if sink.stats()["written"]:
+                    break
+                await asyncio.sleep(0.01)
+            written = sink.stats()["written"]
+            await sink.stop()
+            return written
+
+        assert asyncio.run(run()) == 2
+
+    def test_max_buffer_drops_oldest(self):
+        """Test the buffer stays bounded when the database is unreachable"""
+        sink = _sink(max_buffer=3)
+        for i in range(5):
+            sink.enqueue(1, AuditAction.LOGIN, details=str(i))
+
+        assert sink.stats()["buffered"] == 3
+        assert sink.stats()["dropped"] == 2
+
+
+class TestAuditSinkEndpoint:
+    def test_audit_sink_stats_admin(self, client, admin_token):
+        """Test admin can read audit sink counters"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/metrics/audit-sink", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["buffered"] == 0
@@ -0,0 +1,85 @@
+import json
+import pytest
+from fastapi import status
+from app.models import ShareIssuance, ShareholderProfile, ShareholderHolding, AuditEvent
+
+
+def _csv(shareholder_id, *rows):
+    lines = ["shareholder_id,number_of_shares,price_per_share,issuance_date,notes"]
+    lines += [f"{sid if sid is not None else shareholder_id},{shares},{price},2024-01-15T00:00:00,{note}" for sid, shares, price, note in rows]
+    return "\n".join(lines).encode()
+
+
+class TestBulkIssuanceImport:
+    def test_bulk_import_csv(self, client, admin_token, shareholder_user, db_session):
+        """Test a valid CSV ledger is imported in one go"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv(shareholder.id, (None, 100, 1.0, "seed"), (None, 200, 2.0, "series a"))
+        
+        response = client.post("/api/issuances/bulk", files={"file": ("ledger.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["total_shares"] == 300
+        assert data["total_value"] == 500.0
+        assert db_session.query(ShareIssuance).count() == 2
+        assert db_session.get(ShareholderHolding, shareholder.id).total_shares == 300
+        assert db_session.query(AuditEvent).filter(AuditEvent.details.like("Bulk imported%")).count() == 1
+    
+    def test_bulk_import_rejects_invalid_batch(self, client, admin_token, shareholder_user, db_session):
+        """Test one invalid row rejects the whole batch by default"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv(shareholder.id, (None, 100, 1.0, "ok"), (99999, 100, 1.0, "unknown"), (None, -5, 1.0, "negative"))
+        
+        response = client.post("/api/issuances/bulk", files={"file": ("ledger.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.json()["detail"]["errors"]
+        assert [error["line"] for error in errors] == [3, 4]
+        assert db_session.query(ShareIssuance).count() == 0
+    
+    def test_bulk_import_partial_jsonl(self, client, admin_token, shareholder_user, db_session):
+        """Test allow_partial imports valid JSON lines and reports the rest"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = "\n".join([
+            json.dumps({"shareholder_id": shareholder.id, "number_of_shares": 50, "price_per_share": 3.0}),
+            "not json",
+            json.dumps({"shareholder_id": shareholder.id, "number_of_shares": 25, "price_per_share": 0}),
+        ]).encode()
+        
+        response = client.post(
+            "/api/issuances/bulk",
+            params={"allow_partial": True},
+            files={"file": ("ledger.jsonl", content, "application/x-ndjson")},
+            headers=headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["failed"] == 2
+        assert db_session.query(ShareIssuance).count() == 1
+    
+    def test_bulk_import_reports_non_utf8_line(self, client, admin_token, shareholder_user, db_session):
+        """Test a Latin-1 line is reported against its line number instead of failing the request"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv(shareholder.id, (None, 100, 1.0, "ok"), (None, 200, 2.0, "caf\xe9")).decode().encode("latin-1")
+        
+        response = client.post("/api/issuances/bulk", files={"file": ("ledger.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.json()["detail"]["errors"]
+        assert [error["line"] for error in errors] == [3]
+        assert "UTF-8" in errors[0]["error"]
+    
+    def test_bulk_import_shareholder_forbidden(self, client, shareholder_token):
+        """Test shareholders cannot bulk import"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.post("/api/issuances/bulk", files={"file": ("ledger.csv", b"", "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
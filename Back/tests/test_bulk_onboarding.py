@@ -0,0 +1,70 @@
+import pytest
+from fastapi import status
+from app import services
+from app.models import User, ShareholderProfile, ShareholderHolding
+
+
+def _csv(*rows):
+    lines = ["email,password,first_name,last_name,tax_id"]
+    lines += [f"{email},secret{n},First{n},Last{n},TAX{n}" for n, email in enumerate(rows)]
+    return "\n".join(lines).encode()
+
+
+class TestBulkShareholderOnboarding:
+    def test_bulk_onboard_csv(self, client, admin_token, db_session):
+        """Test shareholders are created with hashed passwords and holdings"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv("a@example.com", "b@example.com", "c@example.com")
+        
+        response = client.post("/api/shareholders/bulk", files={"file": ("people.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["imported"] == 3
+        assert db_session.query(ShareholderProfile).count() == 3
+        assert db_session.query(ShareholderHolding).count() == 3
+        
+        login = client.post("/api/token/", data={"username": "b@example.com", "password": "secret1"})
+        assert login.status_code == status.HTTP_200_OK
+    
+    def test_bulk_onboard_rejects_duplicates(self, client, admin_token, shareholder_user, db_session):
+        """Test existing and repeated emails reject the batch"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv("new@example.com", shareholder_user.email, "new@example.com")
+        
+        response = client.post("/api/shareholders/bulk", files={"file": ("people.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["failed"] == 2
+        assert db_session.query(User).filter(User.email == "new@example.com").count() == 0
+    
+    def test_bulk_onboard_reports_non_utf8_line(self, client, admin_token, db_session):
+        """Test a Latin-1 row is rejected with its line number instead of failing the request"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv("a@example.com", "b@example.com") + "\njos\xe9@example.com,secret,Jos\xe9,Ruiz,TAX9".encode("latin-1")
+        
+        response = client.post("/api/shareholders/bulk", files={"file": ("people.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.json()["detail"]["errors"]
+        assert [error["line"] for error in errors] == [4]
+        assert "UTF-8" in errors[0]["error"]
+        assert db_session.query(User).filter(User.email == "a@example.com").count() == 0
+    
+    def test_bulk_onboard_stops_inserting_after_error(self, client, admin_token, shareholder_user, db_session, monkeypatch):
+        """Test later chunks are only validated once a row has failed the batch"""
+        hashed = []
+
+        async def hash_passwords(passwords):
+            hashed.extend(passwords)
+            return ["hashed"] * len(passwords)
+
+        monkeypatch.setattr(services.settings, "bulk_import_chunk_size", 1)
+        monkeypatch.setattr(services, "hash_passwords_parallel", hash_passwords)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        content = _csv(shareholder_user.email, "new@example.com", shareholder_user.email)
+        
+        response = client.post("/api/shareholders/bulk", files={"file": ("people.csv", content, "text/csv")}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [error["line"] for error in response.json()["detail"]["errors"]] == [2, 4]
+        assert hashed == []
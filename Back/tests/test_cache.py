@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from fastapi import status
+from app.cache import VersionedCache
+
+
+class TestVersionedCache:
+    def test_hit_until_bump(self):
+        """Test cached values are reused until the version is bumped"""
+        cache = VersionedCache(ttl=60)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return len(calls)
+        
+        async def run():
+            assert await cache.get_or_compute("stats", compute) == 1
+            assert await cache.get_or_compute("stats", compute) == 1
+            cache.bump()
+            assert await cache.get_or_compute("stats", compute) == 2
+        
+        asyncio.run(run())
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+    
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are recomputed"""
+        cache = VersionedCache(ttl=0)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return len(calls)
+        
+        async def run():
+            await cache.get_or_compute("stats", compute)
+            return await cache.get_or_compute("stats", compute)
+        
+        assert asyncio.run(run()) == 2
+    
+    def test_stale_while_revalidate(self):
+        """Test concurrent callers get the stale value while one recomputes"""
+        cache = VersionedCache(ttl=60, stale_while_revalidate=60)
+        
+        async def slow_compute():
+            await asyncio.sleep(0.05)
+            return "fresh"
+        
+        async def run():
+            await cache.get_or_compute("stats", lambda: asyncio.sleep(0, result="old"))
+            cache.bump()
+            return await asyncio.gather(
+                cache.get_or_compute("stats", slow_compute),
+                cache.get_or_compute("stats", slow_compute)
+            )
+        
+        assert asyncio.run(run()) == ["fresh", "old"]
+        assert cache.stats()["stale_hits"] == 1
+
+
+class TestDashboardCacheEndpoint:
+    def test_size_bound_prunes_entries_and_locks(self):
+        """Test distinct keys beyond max_entries evict the least recently used and leave no locks behind"""
+        cache = VersionedCache(ttl=60, max_entries=2)
+        
+        async def compute():
+            return 1
+        
+        async def run():
+            for key in ("a", "b"):
+                await cache.get_or_compute(key, compute)
+            await cache.get_or_compute("a", compute)
+            for key in range(100):
+                await cache.get_or_compute(("as_of", key), compute)
+        
+        asyncio.run(run())
+        assert list(cache._entries) == [("as_of", 98), ("as_of", 99)]
+        assert set(cache._locks) <= set(cache._entries)
+    
+    def test_cache_stats_admin(self, client, admin_token):
+        """Test dashboard calls are reflected in cache stats"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.get("/api/dashboard/stats", headers=headers)
+        client.get("/api/dashboard/stats", headers=headers)
+        
+        response = client.get("/api/metrics/dashboard-cache", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["misses"] == 1
+        assert data["hits"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from datetime import datetime
+from fastapi import status
+from app.cap_table_checkpointer import cap_table_checkpointer
+from app.config import settings
+from app.models import ShareIssuance, ShareholderProfile, CapTableCheckpoint
+from app.services import CapTableHistoryService
+
+
+@pytest.fixture
+def dated_issuances(db_session, shareholder_user):
+    """Create issuances on known dates for the test shareholder"""
+    shareholder = db_session.query(ShareholderProfile).first()
+    for n, (issued_on, shares) in enumerate([
+        (datetime(2024, 1, 15), 1000),
+        (datetime(2024, 3, 1), 500),
+        (datetime(2024, 6, 30), 250),
+    ]):
+        db_session.add(ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=shares,
+            price_per_share=2.0,
+            total_value=shares * 2.0,
+            issuance_date=issued_on,
+            certificate_number=f"CERT-HIST-{n}"
+        ))
+    db_session.commit()
+    return shareholder
+
+
+class TestPointInTimeCapTable:
+    def test_shareholders_as_of(self, client, admin_token, dated_issuances):
+        """Test shareholder totals only include issuances up to as_of"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/shareholders/", params={"as_of": "2024-03-31T00:00:00"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data[0]["total_shares"] == 1500
+        assert data[0]["total_value"] == 3000.0
+    
+    def test_ownership_distribution_as_of_before_history(self, client, admin_token, dated_issuances):
+        """Test distribution is empty before the first issuance"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get(
+            "/api/dashboard/ownership-distribution", params={"as_of": "2023-12-31T00:00:00"}, headers=headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+    
+    def test_cap_table_diff(self, client, admin_token, dated_issuances):
+        """Test diff reports changes between two dates"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/dashboard/cap-table-diff", params={
+            "from_date": "2024-02-01T00:00:00",
+            "to_date": "2024-12-31T00:00:00"
+        }, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["shares_from"] == 1000
+        assert data[0]["shares_change"] == 750
+        assert data[0]["shares_to"] == 1750
+    
+    def test_cap_table_diff_invalid_range(self, client, admin_token):
+        """Test diff rejects a reversed date range"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/dashboard/cap-table-diff", params={
+            "from_date": "2024-12-31T00:00:00",
+            "to_date": "2024-01-01T00:00:00"
+        }, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestCheckpoints:
+    def test_checkpointer_takes_checkpoint(self, client, admin_token, dated_issuances, db_session):
+        """Test the background checkpointer, not issuance creation, checkpoints history and as_of reads use it"""
+        CapTableHistoryService._latest_checkpoint_at = None
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.post("/api/issuances/", json={
+            "shareholder_id": dated_issuances.id,
+            "number_of_shares": 100,
+            "price_per_share": 2.0
+        }, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert db_session.query(CapTableCheckpoint).count() == 0
+
+        asyncio.run(cap_table_checkpointer.checkpoint())
+        assert asyncio.run(cap_table_checkpointer.checkpoint()) is None
+        
+        checkpoint = db_session.query(CapTableCheckpoint).one()
+        assert checkpoint.as_of == CapTableHistoryService.current_checkpoint_boundary()
+        assert sum(holding.total_shares for holding in checkpoint.holdings) == 1750
+        
+        response = client.get("/api/shareholders/", params={"as_of": "2100-01-01T00:00:00"}, headers=headers)
+        assert response.json()[0]["total_shares"] == 1850
+
+    def test_checkpointer_waits_for_next_boundary(self, monkeypatch):
+        """Test the checkpointer sleeps until just past the next interval boundary"""
+        monkeypatch.setattr(settings, "cap_table_checkpoint_interval_hours", 24.0)
+
+        seconds = cap_table_checkpointer.seconds_until_next(datetime(2024, 1, 1, 23, 0))
+
+        assert seconds == 3600 + cap_table_checkpointer.SETTLE_SECONDS
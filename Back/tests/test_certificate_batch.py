@@ -0,0 +1,115 @@
+import asyncio
+import io
+import zipfile
+from datetime import datetime
+from fastapi import status
+from app.certificate_batch import zip_chunks
+from app.certificate_cache import certificate_cache
+from app.config import settings
+from app.models import ShareIssuance, ShareholderProfile
+from tests.factories import UserFactory, ShareholderProfileFactory
+
+
+def _create_issuances(db_session, shareholder, *dates):
+    for issuance_date in dates:
+        db_session.add(ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=100,
+            price_per_share=2.0,
+            total_value=200.0,
+            issuance_date=issuance_date,
+            certificate_number=f"CERT-BATCH-{shareholder.id}-{issuance_date:%Y%m%d}"
+        ))
+    db_session.commit()
+
+
+def _other_shareholder(db_session):
+    user = UserFactory()
+    db_session.add(user)
+    db_session.commit()
+    profile = ShareholderProfileFactory(user_id=user.id)
+    db_session.add(profile)
+    db_session.commit()
+    return profile
+
+
+class TestZipChunks:
+    def test_streams_a_valid_archive(self):
+        """Test documents written one chunk at a time form a readable ZIP"""
+        async def documents():
+            yield "a.pdf", b"%PDF-a"
+            yield "b.pdf", b"%PDF-b"
+
+        async def collect():
+            return [chunk async for chunk in zip_chunks(documents())]
+
+        chunks = asyncio.run(collect())
+
+        assert len(chunks) == 3
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.namelist() == ["a.pdf", "b.pdf"]
+            assert archive.read("b.pdf") == b"%PDF-b"
+
+
+class TestCertificateBatch:
+    def test_zip_filters_by_shareholder_and_date(self, client, admin_token, shareholder_user, db_session):
+        """Test the ZIP holds one certificate per matching issuance, in issuance order"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        shareholder = db_session.query(ShareholderProfile).first()
+        _create_issuances(db_session, shareholder, datetime(2024, 3, 1), datetime(2024, 1, 1), datetime(2023, 6, 1))
+        _create_issuances(db_session, _other_shareholder(db_session), datetime(2024, 2, 1))
+
+        response = client.get("/api/issuances/certificates/batch", params={
+            "shareholder_id": shareholder.id, "since": "2024-01-01T00:00:00"
+        }, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == [
+                f"certificate_CERT-BATCH-{shareholder.id}-20240101.pdf",
+                f"certificate_CERT-BATCH-{shareholder.id}-20240301.pdf"
+            ]
+            assert archive.read(archive.namelist()[0]).startswith(b"%PDF")
+
+    def test_zip_uses_certificate_cache(self, client, admin_token, shareholder_user, db_session):
+        """Test a repeated batch is served from the rendered certificate cache"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        shareholder = db_session.query(ShareholderProfile).first()
+        _create_issuances(db_session, shareholder, datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        first = client.get("/api/issuances/certificates/batch", headers=headers)
+        second = client.get("/api/issuances/certificates/batch", headers=headers)
+
+        assert second.content == first.content
+        assert certificate_cache.stats()["hits"] == 2
+
+    def test_merged_pdf(self, client, admin_token, shareholder_user, db_session):
+        """Test format=pdf returns one merged document"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        shareholder = db_session.query(ShareholderProfile).first()
+        _create_issuances(db_session, shareholder, datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        response = client.get("/api/issuances/certificates/batch", params={"format": "pdf"}, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/pdf"
+        assert "certificates.pdf" in response.headers["content-disposition"]
+
+    def test_merged_pdf_limit(self, client, admin_token, shareholder_user, db_session, monkeypatch):
+        """Test merging more certificates than allowed asks for a ZIP instead"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        monkeypatch.setattr(settings, "certificate_merge_limit", 1)
+        shareholder = db_session.query(ShareholderProfile).first()
+        _create_issuances(db_session, shareholder, datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        response = client.get("/api/issuances/certificates/batch", params={"format": "pdf"}, headers=headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_admin(self, client, shareholder_token):
+        """Test shareholders cannot render certificates in bulk"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.get("/api/issuances/certificates/batch", headers=headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
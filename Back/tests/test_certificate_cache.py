@@ -0,0 +1,136 @@
+import asyncio
+import os
+from fastapi import status
+from app.certificate_cache import CertificateCache, certificate_cache
+from app.models import ShareIssuance, ShareholderProfile
+from app.pdf_generator import PDFCertificateGenerator
+
+
+def _create_issuance(db_session, certificate_number="CERT-20240101-CACHE001"):
+    shareholder = db_session.query(ShareholderProfile).first()
+    issuance = ShareIssuance(
+        shareholder_id=shareholder.id,
+        number_of_shares=1000,
+        price_per_share=10.50,
+        total_value=10500.0,
+        certificate_number=certificate_number
+    )
+    db_session.add(issuance)
+    db_session.commit()
+    db_session.refresh(issuance)
+    return issuance, shareholder
+
+
+class TestCertificateCache:
+    def test_get_and_put(self, tmp_path):
+        """Test stored renders are returned and counted as hits"""
+        cache = CertificateCache(str(tmp_path), 1024)
+
+        assert cache.get("1-abc") is None
+        cache.put("1-abc", b"%PDF-one")
+
+        assert cache.get("1-abc") == b"%PDF-one"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 8)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the oldest untouched render is evicted once the size limit is exceeded"""
+        cache = CertificateCache(str(tmp_path), 20)
+        cache.put("1-a", b"x" * 8)
+        cache.put("2-a", b"x" * 8)
+        os.utime(tmp_path / "1-a.pdf", (1, 1))
+        os.utime(tmp_path / "2-a.pdf", (2, 2))
+        cache.get("1-a")
+
+        cache.put("3-a", b"x" * 8)
+
+        assert sorted(os.listdir(tmp_path)) == ["1-a.pdf", "3-a.pdf"]
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 16
+
+    def test_new_version_replaces_old(self, tmp_path):
+        """Test storing a new render of an issuance drops its stale renders"""
+        cache = CertificateCache(str(tmp_path), 1024)
+        cache.put("1-old", b"old")
+        cache.put("12-old", b"other")
+
+        cache.put("1-new", b"new")
+
+        assert sorted(os.listdir(tmp_path)) == ["1-new.pdf", "12-old.pdf"]
+
+    def test_backends_keep_their_own_render(self, tmp_path):
+        """Test a render from one backend does not replace the other backend's render of the issuance"""
+        cache = CertificateCache(str(tmp_path), 1024)
+        cache.put("1-weasyprint-old", b"weasy")
+        cache.put("1-native-old", b"native")
+
+        cache.put("1-native-new", b"native")
+
+        assert sorted(os.listdir(tmp_path)) == ["1-native-new.pdf", "1-weasyprint-old.pdf"]
+
+    def test_index_is_scanned_once(self, tmp_path, monkeypatch):
+        """Test existing renders are indexed on first use and later writes do not rescan the directory"""
+        (tmp_path / "1-a.pdf").write_bytes(b"x" * 8)
+        cache = CertificateCache(str(tmp_path), 20)
+        scans = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+
+        for number in range(2, 6):
+            cache.put(f"{number}-a", b"x" * 8)
+
+        assert len(scans) == 1
+        assert sorted(os.listdir(tmp_path)) == ["4-a.pdf", "5-a.pdf"]
+        assert cache.stats()["bytes"] == 16
+
+    def test_disabled(self, tmp_path):
+        """Test a zero size limit renders every time without touching disk"""
+        cache = CertificateCache(str(tmp_path / "cache"), 0)
+
+        async def render():
+            return b"pdf"
+
+        assert asyncio.run(cache.get_or_render_async("1-a", render)) == (b"pdf", False)
+        assert asyncio.run(cache.get_or_render_async("1-a", render)) == (b"pdf", False)
+        assert not (tmp_path / "cache").exists()
+
+
+class TestCertificateRendering:
+    def test_deterministic_html(self, client, shareholder_user, db_session):
+        """Test the same issuance renders identical HTML and a stable cache key"""
+        issuance, shareholder = _create_issuance(db_session)
+        generator = PDFCertificateGenerator()
+
+        assert generator.generate_certificate_html(issuance, shareholder) == \
+            generator.generate_certificate_html(issuance, shareholder)
+        assert generator.cache_key(issuance, shareholder) == generator.cache_key(issuance, shareholder)
+        # The fixed timestamp is the recording time, so the footer must not call it the render time
+        assert "Recorded on:" in generator.generate_certificate_html(issuance, shareholder)
+
+    def test_cache_key_tracks_printed_data(self, client, shareholder_user, db_session):
+        """Test editing the shareholder's name changes the cache key"""
+        issuance, shareholder = _create_issuance(db_session)
+        generator = PDFCertificateGenerator()
+        before = generator.cache_key(issuance, shareholder)
+
+        shareholder.last_name = "Renamed"
+        db_session.commit()
+
+        after = generator.cache_key(issuance, shareholder)
+        assert after != before
+        assert after.startswith(f"{issuance.id}-")
+
+    def test_second_download_is_cached(self, client, shareholder_token, db_session):
+        """Test repeated certificate downloads are served from the cache"""
+        issuance, _ = _create_issuance(db_session)
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        url = f"/api/issuances/{issuance.id}/certificate/my/"
+
+        first = client.get(url, headers=headers)
+        second = client.get(url, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.headers["X-Certificate-Cache"] == "miss"
+        assert second.headers["X-Certificate-Cache"] == "hit"
+        assert second.content == first.content
+        assert certificate_cache.stats()["entries"] == 1
@@ -0,0 +1,163 @@
+import asyncio
+import time
+import pytest
+from fastapi import status
+from app.certificate_batch import cache_key, certificate_job
+from app.certificate_cache import certificate_cache
+from app.certificate_prerender import certificate_prerenderer
+from app.models import CertificateStatus, CompanyTotals, ShareIssuance, ShareholderHolding, ShareholderProfile
+from app.services import HoldingsService
+
+
+@pytest.fixture
+def prerenderer(monkeypatch, tmp_path):
+    """Run the pre-renderer with an in-process fake render and no retry delay"""
+    calls = []
+
+    async def render(job):
+        calls.append(job[0]["id"])
+        return b"%PDF-prerendered"
+
+    monkeypatch.setattr(certificate_prerenderer, "enabled", True)
+    monkeypatch.setattr(certificate_prerenderer, "retry_delay", 0)
+    monkeypatch.setattr(certificate_prerenderer, "_render_async", render)
+    monkeypatch.setattr(certificate_cache, "directory", tmp_path / "certificate_cache")
+    certificate_prerenderer.rendered = certificate_prerenderer.retried = certificate_prerenderer.failed = 0
+    return calls
+
+
+def _create_issuance(db_session):
+    shareholder = db_session.query(ShareholderProfile).first()
+    issuance = ShareIssuance(
+        shareholder_id=shareholder.id,
+        number_of_shares=1000,
+        price_per_share=1.0,
+        total_value=1000.0,
+        certificate_number="CERT-20240101-PRERENDER",
+        certificate_status=CertificateStatus.PENDING
+    )
+    db_session.add(issuance)
+    db_session.commit()
+    db_session.refresh(issuance)
+    return issuance, shareholder
+
+
+def _status(db_session, issuance_id):
+    db_session.expire_all()
+    return db_session.get(ShareIssuance, issuance_id).certificate_status
+
+
+def _totals_version(db_session):
+    db_session.expire_all()
+    return db_session.get(CompanyTotals, HoldingsService.COMPANY_TOTALS_ID).version
+
+
+class TestCertificatePrerender:
+    def test_process_renders_into_cache(self, prerenderer, shareholder_user, db_session):
+        """Test a processed issuance is cached and marked ready"""
+        issuance, shareholder = _create_issuance(db_session)
+
+        assert asyncio.run(certificate_prerenderer.process(issuance.id)) == CertificateStatus.READY
+
+        assert certificate_cache.contains(cache_key(certificate_job(issuance, shareholder)))
+        assert _status(db_session, issuance.id) == CertificateStatus.READY
+        assert prerenderer == [issuance.id]
+
+    def test_already_cached_is_not_rendered(self, prerenderer, shareholder_user, db_session):
+        """Test an issuance whose certificate is already cached is only marked ready"""
+        issuance, shareholder = _create_issuance(db_session)
+        certificate_cache.put(cache_key(certificate_job(issuance, shareholder)), b"%PDF-cached")
+
+        asyncio.run(certificate_prerenderer.process(issuance.id))
+
+        assert prerenderer == []
+        assert _status(db_session, issuance.id) == CertificateStatus.READY
+
+    def test_retries_transient_failures(self, prerenderer, shareholder_user, db_session, monkeypatch):
+        """Test a render that fails once is retried and succeeds"""
+        issuance, _ = _create_issuance(db_session)
+        attempts = []
+
+        async def flaky(job):
+            attempts.append(job)
+            if len(attempts) == 1:
+                raise RuntimeError("renderer crashed")
+            return b"%PDF-retried"
+
+        monkeypatch.setattr(certificate_prerenderer, "_render_async", flaky)
+
+        assert asyncio.run(certificate_prerenderer.process(issuance.id)) == CertificateStatus.READY
+        assert len(attempts) == 2
+        assert certificate_prerenderer.stats()["retries"] == 1
+
+    def test_marks_failed_after_retries(self, prerenderer, shareholder_user, db_session, monkeypatch):
+        """Test an issuance is marked failed once every retry is used up"""
+        issuance, _ = _create_issuance(db_session)
+        attempts = []
+
+        async def broken(job):
+            attempts.append(job)
+            raise RuntimeError("renderer crashed")
+
+        monkeypatch.setattr(certificate_prerenderer, "_render_async", broken)
+        monkeypatch.setattr(certificate_prerenderer, "retries", 2)
+
+        assert asyncio.run(certificate_prerenderer.process(issuance.id)) == CertificateStatus.FAILED
+        assert len(attempts) == 3
+        assert _status(db_session, issuance.id) == CertificateStatus.FAILED
+
+    def test_company_version_moves_once_per_drained_queue(self, prerenderer, shareholder_user, db_session):
+        """Test each status change moves the holding version and a drained queue moves the company version once"""
+        issuance, shareholder = _create_issuance(db_session)
+        second = ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=10,
+            price_per_share=1.0,
+            total_value=10.0,
+            certificate_number="CERT-20240101-PRERENDER2",
+            certificate_status=CertificateStatus.PENDING
+        )
+        db_session.add(second)
+        db_session.commit()
+        HoldingsService.rebuild(db_session)
+        holding_before = db_session.get(ShareholderHolding, shareholder.id).version
+        totals_before = _totals_version(db_session)
+
+        async def drain():
+            certificate_prerenderer.start()
+            certificate_prerenderer.enqueue(issuance.id)
+            certificate_prerenderer.enqueue(second.id)
+            await certificate_prerenderer._queue.join()
+            deadline = time.monotonic() + 10
+            while _totals_version(db_session) == totals_before and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            await certificate_prerenderer.stop()
+
+        asyncio.run(drain())
+
+        db_session.expire_all()
+        assert db_session.get(ShareholderHolding, shareholder.id).version == holding_before + 2
+        assert _totals_version(db_session) == totals_before + 1
+
+    def test_new_issuance_is_prerendered(self, prerenderer, client, admin_token, shareholder_user, db_session):
+        """Test creating an issuance queues its certificate and the download is then a cache hit"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        shareholder = db_session.query(ShareholderProfile).first()
+
+        response = client.post("/api/issuances/", json={
+            "shareholder_id": shareholder.id,
+            "number_of_shares": 500,
+            "price_per_share": 2.0
+        }, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        issuance_id = response.json()["id"]
+        assert response.json()["certificate_status"] == "pending"
+
+        deadline = time.monotonic() + 10
+        while _status(db_session, issuance_id) != CertificateStatus.READY and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert _status(db_session, issuance_id) == CertificateStatus.READY
+        response = client.get(f"/api/issuances/{issuance_id}/certificate/", headers=headers)
+        assert response.headers["X-Certificate-Cache"] == "hit"
+        assert response.content == b"%PDF-prerendered"
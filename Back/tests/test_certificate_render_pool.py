@@ -0,0 +1,139 @@
+import asyncio
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from app import certificate_render_pool as render_pool_module
+from app.certificate_batch import certificate_job
+from app.certificate_render_pool import CertificateRenderPool, RenderPoolFull, certificate_render_pool
+from app.config import settings
+from app.models import ShareIssuance, ShareholderProfile
+
+
+def _job_objects():
+    issuance = SimpleNamespace(
+        id=1, certificate_number="CERT-POOL", number_of_shares=1, price_per_share=1.0, total_value=1.0,
+        issuance_date=None, created_at=None, certificate_theme=None
+    )
+    return issuance, SimpleNamespace(id=1, first_name="Ada", last_name="Lovelace")
+
+
+@pytest.fixture
+def threaded_pool(monkeypatch):
+    """A pool backed by threads and a slow fake render, so limits can be exercised in-process"""
+    def slow_render(job, backend):
+        time.sleep(0.2)
+        return b"%PDF-slow", 0.2
+
+    monkeypatch.setattr(render_pool_module, "_render_timed", slow_render)
+    # Only WeasyPrint renders go through the pool; the fake render stands in for it
+    monkeypatch.setattr(settings, "certificate_backend", "weasyprint")
+    pool = CertificateRenderPool(processes=1, max_queue=1, warm=False)
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestCertificateRenderPool:
+    def test_rejects_beyond_queue(self, threaded_pool):
+        """Test renders beyond the workers plus queue are rejected rather than queued"""
+        async def burst():
+            return await asyncio.gather(
+                *(threaded_pool.render(*_job_objects()) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(burst())
+
+        assert results[:2] == [b"%PDF-slow", b"%PDF-slow"]
+        assert isinstance(results[2], RenderPoolFull)
+        stats = threaded_pool.stats()
+        assert (stats["rendered"], stats["rejected"], stats["running"], stats["queued"]) == (2, 1, 0, 0)
+
+    def test_same_key_renders_once(self, threaded_pool):
+        """Test concurrent renders of one certificate share a single slot and render"""
+        async def burst():
+            return await asyncio.gather(*(threaded_pool.render(*_job_objects(), key="1-weasyprint-a") for _ in range(3)))
+
+        assert asyncio.run(burst()) == [b"%PDF-slow"] * 3
+        stats = threaded_pool.stats()
+        assert (stats["rendered"], stats["coalesced"], stats["rejected"]) == (1, 2, 0)
+
+    def test_native_skips_capacity_check(self, threaded_pool):
+        """Test inline native renders are served while the worker queue is full"""
+        threaded_pool._in_flight = threaded_pool.processes + threaded_pool.max_queue
+        issuance, shareholder = _job_objects()
+        issuance.issuance_date = datetime(2024, 1, 1)
+
+        pdf = asyncio.run(threaded_pool.render(issuance, shareholder, backend="native"))
+
+        assert pdf.startswith(b"%PDF")
+        assert threaded_pool.stats()["rejected"] == 0
+        threaded_pool._in_flight = 0
+
+        # An inline render first must not leave the pool's average unseeded
+        asyncio.run(threaded_pool.render(*_job_objects()))
+        stats = threaded_pool.stats()
+        assert (stats["rendered"], stats["rendered_inline"], stats["render_time_avg_ms"]) == (1, 1, 200.0)
+
+    def test_cancelled_download_keeps_slot(self, threaded_pool):
+        """Test a cancelled caller leaves the slot taken and the render shared until the worker finishes"""
+        async def cancel_first():
+            first = asyncio.ensure_future(threaded_pool.render(*_job_objects(), key="1-weasyprint-a"))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            await asyncio.sleep(0)
+            busy = threaded_pool.stats()["running"]
+            second = await threaded_pool.render(*_job_objects(), key="1-weasyprint-a")
+            return busy, second
+
+        busy, pdf = asyncio.run(cancel_first())
+
+        assert (busy, pdf) == (1, b"%PDF-slow")
+        stats = threaded_pool.stats()
+        assert (stats["rendered"], stats["coalesced"], stats["running"]) == (1, 1, 0)
+
+    def test_background_render_waits_for_idle_worker(self, threaded_pool):
+        """Test background renders start only once no download is using the worker"""
+        async def download_then_background():
+            download = asyncio.ensure_future(threaded_pool.render(*_job_objects()))
+            await asyncio.sleep(0.05)
+            background = asyncio.ensure_future(threaded_pool.render_when_idle(certificate_job(*_job_objects())))
+            await asyncio.sleep(0.05)
+            waiting = threaded_pool.stats()["queued"] == 0 and not background.done()
+            return waiting, await download, await background
+
+        waiting, *pdfs = asyncio.run(download_then_background())
+
+        assert waiting
+        assert pdfs == [b"%PDF-slow", b"%PDF-slow"]
+
+    def test_retry_after_follows_render_time(self):
+        """Test the Retry-After estimate scales with queue depth and render time"""
+        pool = CertificateRenderPool(processes=2, max_queue=4, warm=False)
+        assert pool.retry_after() == 1
+
+        pool.render_time_avg = 3.0
+        pool._in_flight = 6
+        assert pool.retry_after() == 8
+
+    def test_download_returns_503_when_full(self, client, shareholder_token, db_session, monkeypatch):
+        """Test a certificate download gets 503 with Retry-After while the pool is saturated"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        issuance = ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=10,
+            price_per_share=1.0,
+            total_value=10.0,
+            certificate_number="CERT-20240101-BUSY0001"
+        )
+        db_session.add(issuance)
+        db_session.commit()
+        monkeypatch.setattr(certificate_render_pool, "_in_flight", certificate_render_pool.processes + certificate_render_pool.max_queue)
+
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.get(f"/api/issuances/{issuance.id}/certificate/my/?backend=weasyprint", headers=headers)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert int(response.headers["Retry-After"]) >= 1
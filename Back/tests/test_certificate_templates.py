@@ -0,0 +1,63 @@
+from datetime import datetime
+from types import SimpleNamespace
+from fastapi import status
+from app.certificate_templates import available_themes, get_template
+from app.models import ShareIssuance, ShareholderProfile
+from app.pdf_generator import PDFCertificateGenerator
+
+
+def _certificate(theme=None, first_name="Ada"):
+    issuance = SimpleNamespace(
+        id=7,
+        certificate_number="CERT-20240101-THEME001",
+        number_of_shares=1500,
+        price_per_share=2.5,
+        total_value=3750.0,
+        issuance_date=datetime(2024, 1, 1),
+        created_at=datetime(2024, 1, 1, 9, 30),
+        certificate_theme=theme
+    )
+    return issuance, SimpleNamespace(id=1, first_name=first_name, last_name="Lovelace")
+
+
+class TestCertificateTemplates:
+    def test_themes(self):
+        """Test the shipped themes are discovered and compiled once per process"""
+        assert {"classic", "minimal"} <= set(available_themes())
+        assert get_template("minimal") is get_template("minimal")
+        assert get_template("classic").version != get_template("minimal").version
+
+    def test_render_html(self):
+        """Test values are formatted and escaped, and the stylesheet is only inlined on request"""
+        generator = PDFCertificateGenerator()
+        issuance, shareholder = _certificate(first_name="<Ada & Co>")
+        template = generator.template_for(issuance)
+        fields = generator.certificate_fields(issuance, shareholder)
+
+        markup = template.render_html(fields)
+        assert "&lt;Ada &amp; Co&gt; Lovelace" in markup
+        assert "1,500" in markup and "$2.50" in markup and "January 01, 2024" in markup
+        assert "<style>" not in markup
+        assert "<style>" in generator.generate_certificate_html(issuance, shareholder)
+
+    def test_theme_changes_cache_key(self):
+        """Test certificates rendered with different themes are cached separately"""
+        generator = PDFCertificateGenerator()
+        default_key = generator.cache_key(*_certificate())
+
+        assert generator.cache_key(*_certificate("classic")) == default_key
+        assert generator.cache_key(*_certificate("minimal")) != default_key
+
+    def test_create_issuance_with_theme(self, client, admin_token, shareholder_user, db_session):
+        """Test an issuance stores its chosen theme and rejects unknown ones"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        shareholder = db_session.query(ShareholderProfile).first()
+        payload = {"shareholder_id": shareholder.id, "number_of_shares": 10, "price_per_share": 1.0}
+
+        response = client.post("/api/issuances/", json={**payload, "certificate_theme": "minimal"}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["certificate_theme"] == "minimal"
+        assert db_session.get(ShareIssuance, response.json()["id"]).certificate_theme == "minimal"
+
+        response = client.post("/api/issuances/", json={**payload, "certificate_theme": "gothic"}, headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
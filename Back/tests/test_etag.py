@@ -0,0 +1,89 @@
+from fastapi import status
+from starlette.requests import Request
+from app.certificate_cache import certificate_cache
+from app.etag import make_etag, etag_matches
+from app.models import ShareIssuance, ShareholderProfile
+
+
+def _request(if_none_match: str) -> Request:
+    return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+
+class TestETagMatching:
+    def test_make_etag(self):
+        """Test ETags are quoted, stable and change with any version"""
+        etag = make_etag("issuances", 1, 7)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag("issuances", 1, 7)
+        assert etag != make_etag("issuances", 1, 8)
+
+    def test_if_none_match_forms(self):
+        """Test lists, weak validators and * all match"""
+        etag = make_etag("profile", 1)
+
+        assert etag_matches(_request(f'"other", {etag}'), etag)
+        assert etag_matches(_request(f"W/{etag}"), etag)
+        assert etag_matches(_request("*"), etag)
+        assert not etag_matches(_request('"other"'), etag)
+
+
+class TestConditionalGet:
+    def test_my_issuances(self, client, admin_token, shareholder_token, shareholder_user, db_session):
+        """Test an unchanged issuance listing answers 304 and a new issuance changes its ETag"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        client.post("/api/issuances/", json={
+            "shareholder_id": shareholder.id, "number_of_shares": 100, "price_per_share": 1.0
+        }, headers=admin_headers)
+
+        first = client.get("/api/issuances/my", headers=headers)
+        etag = first.headers["ETag"]
+        repeat = client.get("/api/issuances/my", headers={**headers, "If-None-Match": etag})
+
+        assert first.status_code == status.HTTP_200_OK
+        assert repeat.status_code == status.HTTP_304_NOT_MODIFIED
+        assert repeat.content == b""
+        assert repeat.headers["ETag"] == etag
+
+        client.post("/api/issuances/", json={
+            "shareholder_id": shareholder.id, "number_of_shares": 200, "price_per_share": 1.0
+        }, headers=admin_headers)
+        changed = client.get("/api/issuances/my", headers={**headers, "If-None-Match": etag})
+
+        assert changed.status_code == status.HTTP_200_OK
+        assert len(changed.json()) == 2
+        assert changed.headers["ETag"] != etag
+
+    def test_my_profile(self, client, shareholder_token):
+        """Test an unchanged profile answers 304"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        etag = client.get("/api/shareholders/me", headers=headers).headers["ETag"]
+
+        response = client.get("/api/shareholders/me", headers={**headers, "If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_certificate_is_not_read_again(self, client, shareholder_token, db_session):
+        """Test a matching certificate ETag answers 304 without touching the cache"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        issuance = ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=10,
+            price_per_share=1.0,
+            total_value=10.0,
+            certificate_number="CERT-20240101-ETAG0001"
+        )
+        db_session.add(issuance)
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        url = f"/api/issuances/{issuance.id}/certificate/my/"
+        etag = client.get(url, headers=headers).headers["ETag"]
+        before = certificate_cache.stats()
+
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "X-Certificate-Cache" not in response.headers
+        assert certificate_cache.stats()["hits"] == before["hits"]
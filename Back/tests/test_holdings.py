@@ -0,0 +1,74 @@
+import pytest
+from fastapi import status
+from app.models import ShareIssuance, ShareholderProfile, ShareholderHolding, CompanyTotals
+from app.services import HoldingsService
+
+
+class TestHoldingsMaintenance:
+    def test_issuance_updates_holdings(self, client, admin_token, shareholder_user, db_session):
+        """Test issuances are reflected in holdings and company totals"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        for shares in (1000, 500):
+            response = client.post("/api/issuances/", json={
+                "shareholder_id": shareholder.id,
+                "number_of_shares": shares,
+                "price_per_share": 2.0
+            }, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+        
+        db_session.expire_all()
+        holding = db_session.get(ShareholderHolding, shareholder.id)
+        assert holding.total_shares == 1500
+        assert holding.total_value == 3000.0
+        assert holding.issuance_count == 2
+        
+        totals = db_session.get(CompanyTotals, HoldingsService.COMPANY_TOTALS_ID)
+        assert totals.total_shares == 1500
+        assert totals.total_shareholders == 1
+        assert HoldingsService.find_drift(db_session) == []
+    
+    def test_dashboard_reads_holdings(self, client, admin_token, shareholder_user, db_session):
+        """Test dashboard endpoints report maintained totals"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.post("/api/issuances/", json={
+            "shareholder_id": shareholder.id,
+            "number_of_shares": 400,
+            "price_per_share": 1.5
+        }, headers=headers)
+        
+        stats = client.get("/api/dashboard/stats", headers=headers).json()
+        assert stats["total_shares_issued"] == 400
+        assert stats["total_value"] == 600.0
+        
+        distribution = client.get("/api/dashboard/ownership-distribution", headers=headers).json()
+        assert len(distribution) == 1
+        assert distribution[0]["percentage"] == 100.0
+        
+        shareholders = client.get("/api/shareholders/", headers=headers).json()
+        assert shareholders[0]["total_shares"] == 400
+
+
+class TestHoldingsRebuild:
+    def test_rebuild_repairs_drift(self, db_session, shareholder_user):
+        """Test drift against raw issuances is reported and repaired"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        db_session.add(ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=250,
+            price_per_share=4.0,
+            total_value=1000.0,
+            certificate_number="CERT-20240101-DRIFT001"
+        ))
+        db_session.commit()
+        
+        drift = HoldingsService.find_drift(db_session)
+        assert {entry["field"] for entry in drift} >= {"total_shares", "total_value"}
+        
+        written, deleted = HoldingsService.rebuild(db_session)
+        assert written == 1
+        assert deleted == 0
+        assert HoldingsService.find_drift(db_session) == []
+        assert db_session.get(ShareholderHolding, shareholder.id).total_shares == 250
@@ -1,4 +1,6 @@
+import json
 import pytest
+from datetime import datetime
 from fastapi import status
 from app.models import ShareIssuance, ShareholderProfile
 
@@ -189,4 +191,97 @@ class TestCertificateGeneration:
         
         # This should work if it's the same shareholder, but let's test the logic
         # by creating a different shareholder and trying to access the first one's certificate
-        pass  # This test would need more complex setup 
\ No newline at end of file
+        pass  # This test would need more complex setup 
+
+def _seed_issuances(db_session, shareholder_id, count):
+    for i in range(count):
+        db_session.add(ShareIssuance(
+            shareholder_id=shareholder_id,
+            number_of_shares=100 * (i + 1),
+            price_per_share=1.0,
+            total_value=100.0 * (i + 1),
+            issuance_date=datetime(2024, 1, i + 1),
+            certificate_number=f"CERT-LIST-{i:04d}"
+        ))
+    db_session.commit()
+
+
+class TestIssuanceListing:
+    def test_cursor_pagination(self, client, admin_token, shareholder_user, db_session):
+        """Test following X-Next-Cursor returns every issuance once, newest first"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        _seed_issuances(db_session, shareholder.id, 5)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/api/issuances/", params=params, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [issuance["certificate_number"] for issuance in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+        
+        assert seen == [f"CERT-LIST-{i:04d}" for i in reversed(range(5))]
+    
+    def test_filters_and_sort(self, client, admin_token, shareholder_user, db_session):
+        """Test size, date and certificate prefix filters with an ascending sort"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        _seed_issuances(db_session, shareholder.id, 5)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        response = client.get("/api/issuances/", params={
+            "sort": "number_of_shares",
+            "min_shares": 200,
+            "until": "2024-01-05T00:00:00",
+            "certificate_prefix": "CERT-LIST-",
+            "shareholder_id": shareholder.id
+        }, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [issuance["number_of_shares"] for issuance in response.json()] == [200, 300, 400]
+    
+    def test_cursor_rejected_for_other_sort(self, client, admin_token, shareholder_user, db_session):
+        """Test a cursor cannot be replayed against a different sort order"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        _seed_issuances(db_session, shareholder.id, 3)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        response = client.get("/api/issuances/", params={"limit": 1}, headers=headers)
+        cursor = response.headers["X-Next-Cursor"]
+        response = client.get("/api/issuances/", params={"limit": 1, "cursor": cursor, "sort": "id"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_my_issuances_paginated(self, client, shareholder_token, shareholder_user, db_session):
+        """Test shareholders page through only their own issuances"""
+        shareholder = db_session.query(ShareholderProfile).filter(ShareholderProfile.user_id == shareholder_user.id).first()
+        _seed_issuances(db_session, shareholder.id, 3)
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        
+        response = client.get("/api/issuances/my", params={"limit": 2, "sort": "-number_of_shares"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [issuance["number_of_shares"] for issuance in response.json()] == [300, 200]
+        assert "X-Next-Cursor" in response.headers
+    
+    def test_stream_ndjson(self, client, admin_token, shareholder_user, db_session):
+        """Test the Accept header streams every matching issuance as NDJSON"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        _seed_issuances(db_session, shareholder.id, 3)
+        headers = {"Authorization": f"Bearer {admin_token}", "Accept": "application/x-ndjson"}
+        
+        response = client.get("/api/issuances/", params={"limit": 1, "sort": "id"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["certificate_number"] for row in rows] == [f"CERT-LIST-{i:04d}" for i in range(3)]
+    
+    def test_stream_rejects_bad_cursor(self, client, admin_token):
+        """Test streaming validates the cursor before sending anything"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/issuances/", params={"stream": "true", "cursor": "bogus"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,97 @@
+import re
+import zlib
+from fastapi import status
+from app import native_pdf
+from app.models import ShareIssuance, ShareholderProfile
+from app.pdf_generator import PDFCertificateGenerator
+
+
+FIELDS = {
+    "company_name": "Cap Table (Test) Inc.",
+    "company_address": "1 Main Street",
+    "company_email": "info@example.com",
+    "company_website": "example.com",
+    "certificate_number": "CERT-20240101-NATIVE01",
+    "shareholder_name": "Ada Lovelace",
+    "number_of_shares": "1,000",
+    "price_per_share": "10.50",
+    "total_value": "10,500.00",
+    "issuance_date": "January 01, 2024",
+    "generated_label": "Recorded on",
+    "generated_at": "January 01, 2024 at 09:30 AM",
+}
+
+
+def _page_text(pdf: bytes) -> bytes:
+    streams = re.findall(rb"stream\n(.*?)\nendstream", pdf, re.S)
+    return b"".join(zlib.decompress(stream) for stream in streams)
+
+
+class TestNativePDF:
+    def test_document_structure(self):
+        """Test the output is a complete PDF whose xref offsets point at its objects"""
+        pdf = native_pdf.certificate_pdf([(FIELDS, "classic")])
+
+        assert pdf.startswith(b"%PDF-1.4")
+        assert pdf.endswith(b"%%EOF\n")
+        xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        assert pdf[xref:].startswith(b"xref")
+        offsets = re.findall(rb"(\d{10}) 00000 n", pdf)
+        for number, offset in enumerate(offsets, start=1):
+            assert pdf[int(offset):].startswith(b"%d 0 obj" % number)
+
+    def test_text_is_escaped(self):
+        """Test parentheses in printed values are escaped in the content stream"""
+        text = _page_text(native_pdf.certificate_pdf([(FIELDS, "minimal")]))
+
+        assert b"Cap Table \\(Test\\) Inc." in text
+        assert b"CERT-20240101-NATIVE01" in text
+
+    def test_wrap_respects_width(self):
+        """Test wrapped lines fit the width and keep every word"""
+        text = "This certifies that the holder is the registered owner of fully paid shares"
+        lines = native_pdf.wrap(text, "Helvetica", 12, 150)
+
+        assert len(lines) > 1
+        assert all(native_pdf.text_width(line, "Helvetica", 12) <= 150 for line in lines)
+        assert " ".join(lines) == text
+
+    def test_multiple_pages(self):
+        """Test merged certificates get one page each and identical input gives identical output"""
+        pages = [(FIELDS, "classic"), (dict(FIELDS, shareholder_name="Grace Hopper"), "minimal")]
+        pdf = native_pdf.certificate_pdf(pages)
+
+        assert b"/Count 2" in pdf
+        assert b"Grace Hopper" in _page_text(pdf)
+        assert native_pdf.certificate_pdf(pages) == pdf
+
+
+class TestNativeBackend:
+    def test_download_with_native_backend(self, client, shareholder_token, db_session):
+        """Test ?backend=native serves a native PDF cached separately from the default backend"""
+        shareholder = db_session.query(ShareholderProfile).first()
+        issuance = ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=1000,
+            price_per_share=10.50,
+            total_value=10500.0,
+            certificate_number="CERT-20240101-NATIVE02"
+        )
+        db_session.add(issuance)
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+
+        response = client.get(f"/api/issuances/{issuance.id}/certificate/my/?backend=native", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content.startswith(b"%PDF-1.4")
+        assert b"CERT-20240101-NATIVE02" in _page_text(response.content)
+        assert PDFCertificateGenerator("native").cache_key(issuance, shareholder) != \
+            PDFCertificateGenerator("weasyprint").cache_key(issuance, shareholder)
+
+    def test_unknown_backend(self, client, admin_token):
+        """Test an unknown backend is rejected"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/issuances/1/certificate/?backend=reportlab", headers=headers)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
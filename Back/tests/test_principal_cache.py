@@ -0,0 +1,95 @@
+import time
+from fastapi import status
+from app.auth import PrincipalCache, principal_cache
+from app.models import UserRole
+from app.schemas import Principal
+
+
+def _principal(user_id: int) -> Principal:
+    return Principal(id=user_id, email=f"user{user_id}@example.com", role=UserRole.SHAREHOLDER, is_active=True)
+
+
+class TestPrincipalCache:
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are treated as misses"""
+        cache = PrincipalCache(ttl=0.01, max_size=10)
+        cache.put("user1@example.com", _principal(1))
+
+        assert cache.get("user1@example.com").id == 1
+        time.sleep(0.02)
+        assert cache.get("user1@example.com") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within its size bound"""
+        cache = PrincipalCache(ttl=60, max_size=2)
+        cache.put("user1@example.com", _principal(1))
+        cache.put("user2@example.com", _principal(2))
+        cache.get("user1@example.com")
+        cache.put("user3@example.com", _principal(3))
+
+        assert cache.get("user2@example.com") is None
+        assert cache.get("user1@example.com") is not None
+        assert cache.stats()["entries"] == 2
+
+    def test_invalidate_user(self):
+        """Test entries are dropped by user ID"""
+        cache = PrincipalCache(ttl=60, max_size=10)
+        cache.put("user1@example.com", _principal(1))
+        cache.invalidate_user(1)
+
+        assert cache.get("user1@example.com") is None
+
+
+class TestPrincipalCacheEndpoints:
+    def test_repeat_requests_hit_cache(self, client, admin_token):
+        """Test the principal is resolved from the database once per token"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.get("/api/shareholders/", headers=headers)
+        client.get("/api/shareholders/", headers=headers)
+
+        response = client.get("/api/metrics/principal-cache", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["entries"] == 1
+        assert data["misses"] == 1
+        assert data["hits"] == 2
+
+    def test_deactivation_invalidates_cache(self, client, db_session, shareholder_user, shareholder_token):
+        """Test updating a user drops their cached principal"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        response = client.get("/api/shareholders/me", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        shareholder_user.is_active = False
+        db_session.commit()
+
+        response = client.get("/api/shareholders/me", headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert principal_cache.stats()["hits"] == 0
+
+    def test_invalidated_on_commit_not_flush(self, client, db_session, shareholder_user, shareholder_token):
+        """Test a cached principal survives a flush and is dropped once the write commits"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        client.get("/api/shareholders/me", headers=headers)
+
+        shareholder_user.is_active = False
+        db_session.flush()
+        assert principal_cache.stats()["entries"] == 1
+
+        db_session.commit()
+        assert principal_cache.stats()["entries"] == 0
+
+    def test_rollback_keeps_cached_principal(self, client, db_session, shareholder_user, shareholder_token):
+        """Test a rolled back write leaves the cached principal alone"""
+        headers = {"Authorization": f"Bearer {shareholder_token}"}
+        client.get("/api/shareholders/me", headers=headers)
+
+        shareholder_user.is_active = False
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert principal_cache.stats()["entries"] == 1
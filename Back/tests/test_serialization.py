@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from app.config import settings
+from app.models import CertificateStatus, ShareIssuance, ShareholderProfile
+from app.schemas import ShareIssuanceResponse
+from app.serialization import encode_json, plain_rows
+
+
+def _issuance_row(**overrides):
+    row = {
+        "id": 1, "shareholder_id": 2, "number_of_shares": 1000, "price_per_share": 10.5, "total_value": 10500.0,
+        "notes": None, "certificate_theme": None, "issuance_date": datetime(2024, 1, 1, 9, 30),
+        "certificate_number": "CERT-20240101-FAST0001", "certificate_status": CertificateStatus.READY,
+        "created_at": datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc), "updated_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def _create_issuances(db_session, count):
+    shareholder = db_session.query(ShareholderProfile).first()
+    for number in range(count):
+        db_session.add(ShareIssuance(
+            shareholder_id=shareholder.id,
+            number_of_shares=100 + number,
+            price_per_share=1.5,
+            total_value=1.5 * (100 + number),
+            issuance_date=datetime(2024, 1, 1 + number),
+            certificate_number=f"CERT-20240101-FAST{number:04d}"
+        ))
+    db_session.commit()
+
+
+class TestFastEncoding:
+    def test_matches_schema_output(self):
+        """Test rows encode to the same JSON the response schema produces"""
+        row = _issuance_row()
+        expected = json.loads(ShareIssuanceResponse.model_validate(row).model_dump_json())
+
+        assert json.loads(encode_json(plain_rows([row], ShareIssuanceResponse))) == [expected]
+
+    def test_reads_objects_and_mappings(self):
+        """Test ORM-style objects and mappings give the same records, limited to schema fields"""
+        row = _issuance_row()
+
+        from_object = plain_rows([SimpleNamespace(**row, extra="hidden")], ShareIssuanceResponse)
+        from_mapping = plain_rows([dict(row, extra="hidden")], ShareIssuanceResponse)
+
+        assert from_object == from_mapping
+        assert "extra" not in from_object[0]
+
+
+class TestFastResponses:
+    def test_issuance_page_matches_schema_path(self, client, admin_token, shareholder_user, db_session, monkeypatch):
+        """Test FAST_SERIALIZATION returns the same page and paging headers as the schema path"""
+        _create_issuances(db_session, 3)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        regular = client.get("/api/issuances/?limit=2", headers=headers)
+
+        monkeypatch.setattr(settings, "fast_serialization", True)
+        fast = client.get("/api/issuances/?limit=2", headers=headers)
+
+        assert fast.status_code == status.HTTP_200_OK
+        assert fast.json() == regular.json()
+        assert fast.headers["X-Next-Cursor"] == regular.headers["X-Next-Cursor"]
+        assert fast.headers["ETag"] != regular.headers["ETag"]
+
+    def test_msgpack_negotiation(self, client, admin_token, shareholder_user, db_session):
+        """Test Accept: application/msgpack gets the same records as MessagePack"""
+        msgpack = pytest.importorskip("msgpack")
+        _create_issuances(db_session, 2)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        regular = client.get("/api/issuances/", headers=headers)
+
+        response = client.get("/api/issuances/", headers={**headers, "Accept": "application/msgpack"})
+
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == regular.json()
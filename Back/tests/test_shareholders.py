@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi import status
 
@@ -12,6 +13,18 @@ class TestShareholderEndpoints:
         data = response.json()
         assert isinstance(data, list)
     
+    def test_get_all_shareholders_stream(self, client, admin_token, shareholder_user):
+        """Test shareholders can be streamed as NDJSON with the same fields"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        listed = client.get("/api/shareholders/", headers=headers).json()
+        response = client.get("/api/shareholders/", params={"stream": "true"}, headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in streamed] == [row["id"] for row in listed]
+        assert streamed[0].keys() == listed[0].keys()
+    
     def test_get_all_shareholders_unauthorized(self, client):
         """Test unauthorized access to shareholders list"""
         response = client.get("/api/shareholders/")